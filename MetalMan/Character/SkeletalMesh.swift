@@ -348,6 +348,12 @@ final class SkeletalMeshLoader {
     /// Whether to flip UV V-coordinate during loading (set per-model)
     private var shouldFlipUV: Bool = true
     
+    /// Whether a clip sidecar has been checked against its USDZ extraction yet
+    private var sidecarVerified: Bool = false
+    
+    /// Largest matrix element difference accepted between a sidecar and its USDZ
+    private let sidecarTolerance: Float = 1e-3
+    
     init(device: MTLDevice) {
         self.device = device
         self.textureLoader = MTKTextureLoader(device: device)
@@ -1688,12 +1694,13 @@ final class SkeletalMeshLoader {
     }
     
     /// Load animation from a JSON file URL
-    func loadAnimationFromJSON(url: URL, bones: [Bone], boneNameToIndex: [String: Int]) -> AnimationClip? {
+    /// - Parameter requireAllBones: Fail instead of leaving skeleton bones missing from the JSON at identity
+    func loadAnimationFromJSON(url: URL, bones: [Bone], boneNameToIndex: [String: Int], requireAllBones: Bool = false) -> AnimationClip? {
         debugLog("[SkeletalLoader] Loading animation from JSON: \(url.lastPathComponent)")
         
         do {
             let data = try Data(contentsOf: url)
-            return parseAnimationJSON(data: data, bones: bones, boneNameToIndex: boneNameToIndex)
+            return parseAnimationJSON(data: data, bones: bones, boneNameToIndex: boneNameToIndex, requireAllBones: requireAllBones)
         } catch {
             debugLog("[SkeletalLoader] Failed to read JSON file: \(error)")
             return nil
@@ -1701,7 +1708,7 @@ final class SkeletalMeshLoader {
     }
     
     /// Parse animation JSON data
-    private func parseAnimationJSON(data: Data, bones: [Bone], boneNameToIndex: [String: Int]) -> AnimationClip? {
+    private func parseAnimationJSON(data: Data, bones: [Bone], boneNameToIndex: [String: Int], requireAllBones: Bool = false) -> AnimationClip? {
         do {
             guard let json = try JSONSerialization.jsonObject(with: data) as? [String: Any] else {
                 debugLog("[SkeletalLoader] Invalid JSON format")
@@ -1740,6 +1747,15 @@ final class SkeletalMeshLoader {
             
             debugLog("[SkeletalLoader] Mapped \(jsonBoneToOurBone.count)/\(jsonBones.count) bones from JSON to skeleton")
             
+            if requireAllBones {
+                let mappedBones = Set(jsonBoneToOurBone.values)
+                let unmapped = bones.filter { !mappedBones.contains($0.index) }.map { $0.name }
+                if !unmapped.isEmpty {
+                    debugLog("[SkeletalLoader] ⚠️ \(unmapped.count) skeleton bones not in JSON: \(unmapped.prefix(5).joined(separator: ", "))")
+                    return nil
+                }
+            }
+            
             // Parse keyframes
             var keyframes: [AnimationKeyframe] = []
             
@@ -1848,6 +1864,14 @@ final class SkeletalMeshLoader {
         debugLog("[SkeletalLoader] Loading animation '\(name)' from: \(url.lastPathComponent)")
         debugLog("[SkeletalLoader] Full path: \(url.path)")
         
+        // Prefer the baked -clip.json sidecar written by the exporters, which skips
+        // loading the asset and sampling its joint animation
+        if let clip = loadClipSidecar(for: url, mesh: mesh) {
+            mesh.animations[name] = AnimationClip(name: name, duration: clip.duration, keyframes: clip.keyframes)
+            debugLog("[SkeletalLoader] ✅ Added animation '\(name)' from sidecar (\(clip.keyframes.count) keyframes, \(clip.duration)s)")
+            return true
+        }
+        
         // Create a FRESH allocator for each animation to avoid caching issues
         let allocator = MTKMeshBufferAllocator(device: device)
         
@@ -1894,6 +1918,78 @@ final class SkeletalMeshLoader {
         return false
     }
     
+    /// Load the baked clip sidecar (<name>-clip.json) exported next to an animation USDZ
+    /// - Returns: The clip, or nil if there is no sidecar, it is older than the USDZ,
+    ///   it does not cover every skeleton bone, or it cannot be parsed
+    func loadClipSidecar(for url: URL, mesh: SkeletalMesh) -> AnimationClip? {
+        let baseName = url.deletingPathExtension().lastPathComponent
+        let sidecarURL = url.deletingLastPathComponent().appendingPathComponent("\(baseName)-clip.json")
+        guard FileManager.default.fileExists(atPath: sidecarURL.path) else {
+            return nil
+        }
+        
+        // A sidecar left behind by an earlier export no longer matches the USDZ
+        if let sidecarDate = modificationDate(of: sidecarURL),
+           let usdzDate = modificationDate(of: url),
+           sidecarDate < usdzDate {
+            debugLog("[SkeletalLoader] ⚠️ Sidecar \(sidecarURL.lastPathComponent) is older than the USDZ, ignoring it")
+            return nil
+        }
+        
+        guard let clip = loadAnimationFromJSON(url: sidecarURL, bones: mesh.bones, boneNameToIndex: mesh.boneNameToIndex, requireAllBones: true) else {
+            return nil
+        }
+        
+        // Check the first sidecar against the ModelIO extraction once, so an exporter
+        // and loader that disagree on bone order or space fall back to the USDZ path
+        if !sidecarVerified {
+            sidecarVerified = true
+            if let difference = sidecarDifference(clip, usdzURL: url), difference > sidecarTolerance {
+                debugLog("[SkeletalLoader] ⚠️ Sidecar \(sidecarURL.lastPathComponent) differs from the USDZ by \(difference), using the USDZ")
+                sidecarVerified = false
+                return nil
+            }
+        }
+        
+        return clip
+    }
+    
+    /// Modification date of a file, or nil if it cannot be read
+    private func modificationDate(of url: URL) -> Date? {
+        let attributes = try? FileManager.default.attributesOfItem(atPath: url.path)
+        return attributes?[.modificationDate] as? Date
+    }
+    
+    /// Largest bone transform element difference between a sidecar clip and the
+    /// ModelIO extraction of its USDZ, over the keyframes sampled at the same time
+    /// - Returns: The difference, or nil if the USDZ has no animation to compare against
+    private func sidecarDifference(_ clip: AnimationClip, usdzURL: URL) -> Float? {
+        let allocator = MTKMeshBufferAllocator(device: device)
+        let asset = MDLAsset(url: usdzURL, vertexDescriptor: nil, bufferAllocator: allocator)
+        guard let extracted = ModelIOAnimationExtractor.extractFromMDLAsset(asset, device: device).first else {
+            return nil
+        }
+        
+        var maxDifference: Float = 0
+        var compared = 0
+        for (keyframe, extractedKF) in zip(clip.keyframes, extracted.keyframes) {
+            guard abs(keyframe.time - extractedKF.time) < 1e-3,
+                  keyframe.boneTransforms.count == extractedKF.localTransforms.count else {
+                continue
+            }
+            for (a, b) in zip(keyframe.boneTransforms, extractedKF.localTransforms) {
+                let d = a - b
+                let columnMax = simd_max(simd_max(simd_abs(d.columns.0), simd_abs(d.columns.1)),
+                                         simd_max(simd_abs(d.columns.2), simd_abs(d.columns.3)))
+                maxDifference = max(maxDifference, simd_reduce_max(columnMax))
+            }
+            compared += 1
+        }
+        
+        debugLog("[SkeletalLoader] Sidecar vs USDZ: max difference \(maxDifference) over \(compared) keyframes")
+        return compared > 0 ? maxDifference : .infinity
+    }
+    
     /// Load multiple animations from USDZ files in a directory
     /// - Parameters:
     ///   - directory: URL of the directory containing animation USDZ files
@@ -258,29 +258,31 @@ fragment float4 fragment_lit(LitVertexOut in [[stage_in]],
     float3 B = cross(N, T);
     float3x3 TBN = float3x3(T, B, N);
     
-    // Sample normal map based on material
-    float3 sampledNormal = float3(0.0, 0.0, 1.0); // Default: straight up in tangent space
+    // Sample normal map based on material (two-channel BC5: only X and Y are stored)
+    float2 sampledXY = float2(0.5, 0.5); // Default: straight up in tangent space
     switch (in.materialIndex) {
         case 0: // Ground
-            sampledNormal = groundNormalMap.sample(texSampler, in.texCoord).rgb;
+            sampledXY = groundNormalMap.sample(texSampler, in.texCoord).rg;
             break;
         case 1: // Tree trunk
-            sampledNormal = trunkNormalMap.sample(texSampler, in.texCoord).rgb;
+            sampledXY = trunkNormalMap.sample(texSampler, in.texCoord).rg;
             break;
         case 3: // Rock
-            sampledNormal = rockNormalMap.sample(texSampler, in.texCoord).rgb;
+            sampledXY = rockNormalMap.sample(texSampler, in.texCoord).rg;
             break;
         case 6: // Path
-            sampledNormal = pathNormalMap.sample(texSampler, in.texCoord).rgb;
+            sampledXY = pathNormalMap.sample(texSampler, in.texCoord).rg;
             break;
         default:
             // Use flat normal for materials without normal maps
-            sampledNormal = float3(0.5, 0.5, 1.0);
+            sampledXY = float2(0.5, 0.5);
             break;
     }
     
-    // Convert from [0,1] to [-1,1] range
-    sampledNormal = sampledNormal * 2.0 - 1.0;
+    // Convert from [0,1] to [-1,1] range and rebuild Z from the unit length
+    float3 sampledNormal;
+    sampledNormal.xy = sampledXY * 2.0 - 1.0;
+    sampledNormal.z = sqrt(saturate(1.0 - dot(sampledNormal.xy, sampledNormal.xy)));
     
     // Transform normal from tangent space to world space
     float3 normal = normalize(TBN * sampledNormal);
@@ -23,6 +23,11 @@ class TextureGenerator {
     
     /// Load a texture from the textures folder
     func loadTexture(named filename: String) -> MTLTexture? {
+        // Prefer the pre-baked container (no decode, mips already built)
+        if let texture = loadBakedTexture(named: filename) {
+            return texture
+        }
+        
         // Try multiple locations to find the texture
         let possiblePaths = [
             // Absolute path for development (most reliable)
@@ -148,8 +153,183 @@ class TextureGenerator {
         return texture
     }
     
+    // MARK: - Baked Texture Containers
+    
+    /// Path of the KTX2 container Scripts/bake_textures.py writes for a source image,
+    /// relative to its folder: the source file name, extension included, plus .ktx2
+    private func bakedContainerName(for filename: String) -> String {
+        return "baked/" + filename + ".ktx2"
+    }
+    
+    /// Load a KTX2 container written by Scripts/bake_textures.py from textures/baked.
+    /// The file is memory-mapped and each mip level is copied directly into the texture.
+    func loadBakedTexture(named filename: String) -> MTLTexture? {
+        let bakedName = bakedContainerName(for: filename)
+        let possiblePaths = [
+            "/Users/maxdavis/Projects/MetalMan/textures/" + bakedName,
+            Bundle.main.bundlePath + "/../../../textures/" + bakedName,
+            Bundle.main.bundlePath + "/../../../../../../../../textures/" + bakedName,
+            Bundle.main.bundlePath + "/Contents/Resources/textures/" + bakedName
+        ]
+        
+        guard let path = possiblePaths.first(where: { FileManager.default.isReadableFile(atPath: $0) }),
+              let data = try? Data(contentsOf: URL(fileURLWithPath: path), options: .alwaysMapped) else {
+            return nil
+        }
+        
+        let texture = data.withUnsafeBytes { createTextureFromKTX2($0, filename: filename) }
+        if texture != nil {
+            debugLog("[TextureGen] Loaded baked texture: \(path)")
+        }
+        return texture
+    }
+    
+    /// Load a KTX2 container written by Scripts/bake_textures.py from LandscapeModels/textures/baked.
+    func loadBakedLandscapeTexture(named filename: String) -> MTLTexture? {
+        let bakedName = bakedContainerName(for: filename)
+        let possiblePaths = [
+            Bundle.main.bundlePath + "/Contents/Resources/LandscapeModels/textures/" + bakedName,
+            "/Users/maxdavis/Projects/MetalMan/MetalMan/LandscapeModels/textures/" + bakedName,
+            Bundle.main.bundlePath + "/../../../MetalMan/LandscapeModels/textures/" + bakedName
+        ]
+        
+        guard let path = possiblePaths.first(where: { FileManager.default.isReadableFile(atPath: $0) }),
+              let data = try? Data(contentsOf: URL(fileURLWithPath: path), options: .alwaysMapped) else {
+            return nil
+        }
+        
+        let texture = data.withUnsafeBytes { createTextureFromKTX2($0, filename: filename) }
+        if texture != nil {
+            debugLog("[TextureGen] Loaded baked texture: \(path)")
+        }
+        return texture
+    }
+    
+    /// Create a texture (or 2D array texture) from the bytes of a KTX2 file
+    /// holding plain texels or BC1/BC3/BC5 blocks
+    private func createTextureFromKTX2(_ bytes: UnsafeRawBufferPointer, filename: String) -> MTLTexture? {
+        let identifier: [UInt8] = [0xAB, 0x4B, 0x54, 0x58, 0x20, 0x32, 0x30, 0xBB, 0x0D, 0x0A, 0x1A, 0x0A]
+        let headerSize = 80
+        guard bytes.count >= headerSize, Array(bytes[0..<12]) == identifier else {
+            debugLog("[TextureGen] Not a KTX2 file: \(filename)")
+            return nil
+        }
+        
+        func readUInt32(_ offset: Int) -> Int {
+            Int(UInt32(littleEndian: bytes.loadUnaligned(fromByteOffset: offset, as: UInt32.self)))
+        }
+        func readUInt64(_ offset: Int) -> Int {
+            Int(UInt64(littleEndian: bytes.loadUnaligned(fromByteOffset: offset, as: UInt64.self)))
+        }
+        
+        let vkFormat = readUInt32(12)
+        let width = readUInt32(20)
+        let height = readUInt32(24)
+        let layerCount = readUInt32(32)  // 0 = plain 2D texture, otherwise a 2D array
+        let levelCount = max(readUInt32(40), 1)
+        let supercompression = readUInt32(44)
+        
+        // Diffuse maps are stored sRGB-encoded with gamma-correct mips; they are
+        // sampled as unorm formats to match the JPEG path the shaders were tuned for.
+        // Block formats store 4x4 texel blocks of bytesPerPixel bytes each.
+        let pixelFormat: MTLPixelFormat
+        let bytesPerPixel: Int
+        var blockSize = 1
+        switch vkFormat {
+        case 37, 43:  // VK_FORMAT_R8G8B8A8_UNORM / _SRGB
+            pixelFormat = .rgba8Unorm
+            bytesPerPixel = 4
+        case 16:      // VK_FORMAT_R8G8_UNORM
+            pixelFormat = .rg8Unorm
+            bytesPerPixel = 2
+        case 9:       // VK_FORMAT_R8_UNORM
+            pixelFormat = .r8Unorm
+            bytesPerPixel = 1
+        case 97:      // VK_FORMAT_R16G16B16A16_SFLOAT (bone-matrix animation textures)
+            pixelFormat = .rgba16Float
+            bytesPerPixel = 8
+        case 133, 134:  // VK_FORMAT_BC1_RGBA_UNORM_BLOCK / _SRGB_BLOCK
+            pixelFormat = .bc1_rgba
+            bytesPerPixel = 8
+            blockSize = 4
+        case 137, 138:  // VK_FORMAT_BC3_UNORM_BLOCK / _SRGB_BLOCK
+            pixelFormat = .bc3_rgba
+            bytesPerPixel = 16
+            blockSize = 4
+        case 141:       // VK_FORMAT_BC5_UNORM_BLOCK (two-channel normals)
+            pixelFormat = .bc5_rgUnorm
+            bytesPerPixel = 16
+            blockSize = 4
+        default:
+            debugLog("[TextureGen] Unsupported KTX2 format \(vkFormat) in: \(filename)")
+            return nil
+        }
+        
+        guard supercompression == 0, bytes.count >= headerSize + levelCount * 24 else {
+            return nil
+        }
+        
+        // Fall back to the decoded source image on GPUs without BC support
+        if blockSize > 1, !device.supportsBCTextureCompression {
+            debugLog("[TextureGen] BC textures not supported, skipping: \(filename)")
+            return nil
+        }
+        
+        let descriptor = MTLTextureDescriptor.texture2DDescriptor(
+            pixelFormat: pixelFormat,
+            width: width,
+            height: height,
+            mipmapped: levelCount > 1
+        )
+        descriptor.mipmapLevelCount = levelCount
+        descriptor.usage = [.shaderRead]
+        if layerCount > 0 {
+            descriptor.textureType = .type2DArray
+            descriptor.arrayLength = layerCount
+        }
+        
+        guard let texture = device.makeTexture(descriptor: descriptor),
+              let baseAddress = bytes.baseAddress else {
+            return nil
+        }
+        
+        for level in 0..<levelCount {
+            let offset = readUInt64(headerSize + level * 24)
+            let length = readUInt64(headerSize + level * 24 + 8)
+            let levelWidth = max(width >> level, 1)
+            let levelHeight = max(height >> level, 1)
+            let bytesPerRow = (levelWidth + blockSize - 1) / blockSize * bytesPerPixel
+            let bytesPerImage = bytesPerRow * ((levelHeight + blockSize - 1) / blockSize)
+            
+            // Array layers are stored one after another within each level
+            guard offset + length <= bytes.count,
+                  length >= bytesPerImage * max(layerCount, 1) else {
+                debugLog("[TextureGen] Truncated KTX2 level \(level) in: \(filename)")
+                return nil
+            }
+            
+            for slice in 0..<max(layerCount, 1) {
+                texture.replace(
+                    region: MTLRegionMake2D(0, 0, levelWidth, levelHeight),
+                    mipmapLevel: level,
+                    slice: slice,
+                    withBytes: baseAddress + offset + slice * bytesPerImage,
+                    bytesPerRow: bytesPerRow,
+                    bytesPerImage: bytesPerImage
+                )
+            }
+        }
+        
+        return texture
+    }
+    
     /// Load a texture from the LandscapeModels/textures folder
     func loadTextureFromLandscapeModels(named filename: String) -> MTLTexture? {
+        // Prefer the pre-baked container (block-compressed, mips already built)
+        if let texture = loadBakedLandscapeTexture(named: filename) {
+            return texture
+        }
+        
         // Try multiple locations to find the texture
         let possiblePaths = [
             // Bundle resources (if copied to bundle)
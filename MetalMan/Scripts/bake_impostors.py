@@ -0,0 +1,556 @@
+"""
+Blender Python Script: Bake Octahedral Impostors for Trees and Landscape Models
+
+This script renders each procedural tree type (the geometry of
+GeometryGenerator's addOakTree/addPineTree/addBirchTree/addWillowTree/
+addDeadTree, built by Scripts/bake_world.py) and each tree model in
+LandscapeModels from a grid of view directions on a (hemi-)octahedron, and
+packs the views into impostor atlases:
+- <name>-impostor-albedo.ktx2: RGBA8 sRGB, base colour and coverage
+- <name>-impostor-normal.ktx2: RGBA8, world-space normal (x, y, z * 0.5 + 0.5)
+  and coverage
+- <name>-impostor-depth.ktx2: R8, depth across the bounding sphere
+  (0 = front of the sphere, 1 = back)
+- <name>-impostor.json: frame layout, bounding sphere and file names
+
+Distant vegetation can then be drawn as one camera-facing quad that blends
+the atlas frames nearest to the view direction.
+
+Usage:
+1. Open Blender (tested with Blender 3.6+)
+2. Open the Scripting workspace
+3. Open this script in the text editor
+4. Run the script (Alt+P or click "Run Script")
+
+OR run from command line:
+    /Applications/Blender.app/Contents/MacOS/Blender --background --python bake_impostors.py
+    /Applications/Blender.app/Contents/MacOS/Blender --background --python bake_impostors.py -- oak tree1 --force
+
+Requirements:
+- Blender 3.6 - 4.x (Cycles render passes and the compositor File Output node)
+- SCRIPTS_DIR pointing at the repository's Scripts/ folder (bake_world.py and ktx2.py)
+"""
+
+import bpy
+import json
+import math
+import os
+import re
+import sys
+import tempfile
+import numpy as np
+from mathutils import Vector
+
+# ============================================================================
+# CONFIGURATION - Modify these paths as needed
+# ============================================================================
+
+# Repository root
+PROJECT_DIR = "/Users/maxdavis/Projects/MetalMan"
+
+# Folder containing bake_world.py and ktx2.py
+SCRIPTS_DIR = f"{PROJECT_DIR}/Scripts"
+
+# Directory containing the landscape models
+MODELS_DIR = f"{PROJECT_DIR}/MetalMan/LandscapeModels"
+
+# Output directory for the impostor atlases and metadata
+OUTPUT_DIR = f"{MODELS_DIR}/impostors"
+
+# Landscape models to bake (file name patterns in MODELS_DIR; Renderer.loadTreeModels)
+MODEL_PATTERNS = [r'^tree\d+\.usdc$']
+
+# Procedural tree types to bake: name -> (height, radius, seed) passed to the
+# bake_world.py port of the GeometryGenerator tree function
+TREE_SPECIMENS = {
+    "oak": (6.0, 2.0, 1),
+    "pine": (7.0, 2.0, 1),
+    "birch": (6.0, 1.8, 1),
+    "willow": (6.0, 2.2, 1),
+    "dead": (6.0, 1.5, 1),
+}
+
+# Textures for the procedural trees' materials (TextureGenerator.createTrunkTexture /
+# createFoliageTexture load these first)
+TRUNK_TEXTURE = f"{PROJECT_DIR}/textures/tree_01_diffuse.jpg"
+FOLIAGE_TEXTURE = f"{PROJECT_DIR}/textures/leaves_01_diffuse.jpg"
+
+# Views per atlas side (FRAMES x FRAMES views)
+FRAMES = 8
+
+# Only views from the upper hemisphere (trees are never seen from below)
+HEMISPHERE = True
+
+# Resolution of one view in texels (a power of two, so mips stay inside their frame)
+FRAME_SIZE = 256
+
+# Smallest frame size a mip level is generated down to
+MIN_MIP_FRAME_SIZE = 16
+
+# Cycles samples per view (the albedo/normal/depth passes converge quickly)
+RENDER_SAMPLES = 16
+
+# Texels the albedo and normal are extended past the silhouette, so filtering
+# and mips do not pull in the background
+DILATE_PIXELS = 4
+
+# Whether to skip sources whose metadata file already exists
+SKIP_EXISTING = True
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def clear_scene():
+    """Remove all objects from the scene"""
+    bpy.ops.object.select_all(action='SELECT')
+    bpy.ops.object.delete(use_global=False)
+    
+    # Clear orphan data of every type, recursively, so node groups, collections and the
+    # data they use don't pile up between sources
+    bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+
+
+def script_args():
+    """Arguments after '--' on the Blender command line"""
+    return sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+
+def import_usd(filepath):
+    """Import a USD/USDZ file"""
+    bpy.ops.wm.usd_import(filepath=filepath)
+
+
+def get_mesh_objects():
+    """Get all mesh objects in the scene"""
+    return [obj for obj in bpy.context.scene.objects if obj.type == 'MESH']
+
+
+def game_to_blender(points):
+    """Game space (Y up) to Blender space (Z up), as the USD importer converts"""
+    points = np.asarray(points, dtype=np.float64)
+    return np.stack([points[..., 0], -points[..., 2], points[..., 1]], axis=-1)
+
+
+def blender_to_game(points):
+    """Blender space (Z up) to game space (Y up)"""
+    points = np.asarray(points, dtype=np.float64)
+    return np.stack([points[..., 0], points[..., 2], -points[..., 1]], axis=-1)
+
+
+def image_material(name, image_path):
+    """Principled material with an image texture as base colour (plain grey if the image is missing)"""
+    material = bpy.data.materials.new(name)
+    material.use_nodes = True
+    bsdf = material.node_tree.nodes.get("Principled BSDF")
+    if os.path.exists(image_path):
+        texture = material.node_tree.nodes.new('ShaderNodeTexImage')
+        texture.image = bpy.data.images.load(image_path, check_existing=True)
+        material.node_tree.links.new(texture.outputs['Color'], bsdf.inputs['Base Color'])
+    else:
+        print(f"    WARNING: Texture not found: {image_path}")
+    return material
+
+
+def build_procedural_tree(tree_type, height, radius, seed):
+    """
+    Create a mesh object from the bake_world.py port of a GeometryGenerator tree.
+    
+    The vertex buffer is a plain triangle list, so each triangle becomes a
+    face and the generator's normals are set as custom split normals.
+    """
+    sys.path.insert(0, SCRIPTS_DIR)
+    import bake_world
+    
+    builders = {
+        "oak": bake_world.add_oak_tree,
+        "pine": bake_world.add_pine_tree,
+        "birch": bake_world.add_birch_tree,
+        "willow": bake_world.add_willow_tree,
+    }
+    builder = bake_world.MeshBuilder()
+    origin = bake_world.vec(0, 0, 0)
+    F = bake_world.F
+    if tree_type == "dead":
+        bake_world.add_dead_tree(builder, origin, F(height), seed)
+    else:
+        builders[tree_type](builder, origin, F(height), F(radius), seed)
+    vertices = builder.vertices()
+    
+    count = len(vertices)
+    positions = game_to_blender(vertices['position'])
+    mesh = bpy.data.meshes.new(f"{tree_type}_impostor_source")
+    mesh.from_pydata(positions.tolist(), [], np.arange(count).reshape(-1, 3).tolist())
+    
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    # from_pydata keeps the loop order of the faces, which is the vertex order here
+    uv_layer.data.foreach_set('uv', (vertices['texCoord'] * (1, -1) + (0, 1)).astype(np.float32).ravel())
+    
+    mesh.materials.append(image_material("Trunk", TRUNK_TEXTURE))
+    mesh.materials.append(image_material("Foliage", FOLIAGE_TEXTURE))
+    foliage = vertices['materialIndex'][::3] == bake_world.MATERIAL_FOLIAGE
+    mesh.polygons.foreach_set('material_index', foliage.astype(np.int32))
+    
+    if hasattr(mesh, 'use_auto_smooth'):
+        mesh.use_auto_smooth = True  # Required for custom normals before Blender 4.1
+    mesh.normals_split_custom_set(game_to_blender(vertices['normal']).tolist())
+    
+    obj = bpy.data.objects.new(tree_type, mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+# ============================================================================
+# OCTAHEDRAL VIEWS
+# ============================================================================
+
+def octahedral_direction(u, v, hemisphere=HEMISPHERE):
+    """
+    Unit view direction (game space, Y up) of an atlas position u, v in [0, 1].
+    
+    Full octahedron: (x, z) = (2u - 1, 2v - 1), y = 1 - |x| - |z| with the
+    lower half folded out to the corners. Hemi-octahedron: the diamond is
+    rotated 45 degrees to fill the square, x = u + v - 1, z = u - v.
+    """
+    fx, fy = u * 2 - 1, v * 2 - 1
+    if hemisphere:
+        x, z = (fx + fy) / 2, (fx - fy) / 2
+    else:
+        x, z = fx, fy
+    y = 1 - abs(x) - abs(z)
+    if y < 0:
+        x, z = (1 - abs(z)) * math.copysign(1, x), (1 - abs(x)) * math.copysign(1, z)
+    length = math.sqrt(x * x + y * y + z * z)
+    return (x / length, y / length, z / length)
+
+
+def frame_directions(frames=FRAMES, hemisphere=HEMISPHERE):
+    """View direction of every frame, row by row: frame (x, y) sees from octahedral_direction(x/(frames-1), y/(frames-1))"""
+    return [[octahedral_direction(x / (frames - 1), y / (frames - 1), hemisphere) for x in range(frames)]
+            for y in range(frames)]
+
+
+def bounding_sphere(meshes):
+    """Centre and radius (Blender space) of the evaluated meshes' vertices"""
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    points = []
+    for obj in meshes:
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = evaluated.to_mesh()
+        coords = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+        mesh.vertices.foreach_get('co', coords)
+        evaluated.to_mesh_clear()
+        matrix = np.array(obj.matrix_world)
+        coords = coords.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+        points.append(coords)
+    points = np.concatenate(points)
+    center = (points.min(axis=0) + points.max(axis=0)) / 2
+    radius = float(np.sqrt(((points - center) ** 2).sum(axis=1).max()))
+    return center, radius
+
+# ============================================================================
+# RENDERING
+# ============================================================================
+
+PASSES = ("albedo", "alpha", "normal", "depth")
+
+
+def setup_render(output_dir):
+    """Cycles with the diffuse colour, normal and depth passes written as EXR by a File Output node"""
+    scene = bpy.context.scene
+    scene.render.engine = 'CYCLES'
+    scene.cycles.samples = RENDER_SAMPLES
+    scene.cycles.device = 'CPU'
+    scene.render.resolution_x = FRAME_SIZE
+    scene.render.resolution_y = FRAME_SIZE
+    scene.render.resolution_percentage = 100
+    scene.render.film_transparent = True
+    
+    view_layer = bpy.context.view_layer
+    view_layer.use_pass_diffuse_color = True
+    view_layer.use_pass_normal = True
+    view_layer.use_pass_z = True
+    
+    scene.use_nodes = True
+    tree = scene.node_tree
+    tree.nodes.clear()
+    layers = tree.nodes.new('CompositorNodeRLayers')
+    output = tree.nodes.new('CompositorNodeOutputFile')
+    output.base_path = output_dir
+    output.format.file_format = 'OPEN_EXR'
+    output.format.color_depth = '32'
+    output.format.color_mode = 'RGBA'
+    output.file_slots.clear()
+    for name, socket in zip(PASSES, ('DiffCol', 'Alpha', 'Normal', 'Depth')):
+        output.file_slots.new(name)
+        tree.links.new(layers.outputs[socket], output.inputs[name])
+    composite = tree.nodes.new('CompositorNodeComposite')
+    tree.links.new(layers.outputs['Image'], composite.inputs['Image'])
+
+
+def setup_camera(center, radius):
+    """Orthographic camera framing the bounding sphere"""
+    camera_data = bpy.data.cameras.new("ImpostorCamera")
+    camera_data.type = 'ORTHO'
+    camera_data.ortho_scale = radius * 2
+    camera_data.clip_start = radius * 0.5
+    camera_data.clip_end = radius * 3.5
+    camera = bpy.data.objects.new("ImpostorCamera", camera_data)
+    bpy.context.scene.collection.objects.link(camera)
+    bpy.context.scene.camera = camera
+    return camera
+
+
+def read_exr(path):
+    """(FRAME_SIZE, FRAME_SIZE, 4) float32 pixels of an EXR, top row first"""
+    image = bpy.data.images.load(path)
+    pixels = np.empty(FRAME_SIZE * FRAME_SIZE * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    bpy.data.images.remove(image)
+    os.remove(path)
+    return pixels.reshape(FRAME_SIZE, FRAME_SIZE, 4)[::-1]
+
+
+def render_view(camera, center, radius, direction, output_dir):
+    """Render one view; returns (albedo RGBA linear, normal xyz game space, depth 0-1)"""
+    view = Vector(game_to_blender(direction).tolist())
+    camera.location = Vector(center.tolist()) + view * (radius * 2)
+    camera.rotation_euler = (-view).to_track_quat('-Z', 'Y' if abs(view.z) > 0.999 else 'Z').to_euler()
+    
+    bpy.ops.render.render(write_still=False)
+    frame = bpy.context.scene.frame_current
+    layers = {name: read_exr(os.path.join(output_dir, f"{name}{frame:04d}.exr")) for name in PASSES}
+    
+    alpha = layers["alpha"][..., 0]
+    albedo = np.concatenate([layers["albedo"][..., :3], alpha[..., None]], axis=-1)
+    normal = blender_to_game(layers["normal"][..., :3])
+    # Depth is along the view axis from the camera, which sits 2 * radius from the centre
+    depth = np.clip((layers["depth"][..., 0] - radius) / (radius * 2), 0, 1)
+    depth[alpha <= 0] = 1
+    return albedo, normal, depth
+
+
+def dilate(values, covered, iterations=DILATE_PIXELS):
+    """Extend values into uncovered texels by averaging covered neighbours"""
+    values = values.copy()
+    covered = covered.copy()
+    for _ in range(iterations):
+        total = np.zeros_like(values)
+        count = np.zeros(covered.shape, dtype=np.float32)
+        for dy, dx in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            shifted = np.roll(covered, (dy, dx), axis=(0, 1))
+            total += np.roll(values, (dy, dx), axis=(0, 1)) * shifted[..., None]
+            count += shifted
+        grow = ~covered & (count > 0)
+        values[grow] = total[grow] / count[grow][:, None]
+        covered |= grow
+    return values
+
+
+def linear_to_srgb(values):
+    values = np.clip(values, 0, 1)
+    return np.where(values <= 0.0031308, values * 12.92, 1.055 * np.power(values, 1 / 2.4) - 0.055)
+
+
+def downsample(values):
+    """2x2 box filter (frames are power-of-two aligned, so views never mix)"""
+    return (values[0::2, 0::2] + values[1::2, 0::2] + values[0::2, 1::2] + values[1::2, 1::2]) / 4
+
+
+def mip_chain(values, normalize=False):
+    """Level 0 and the box-filtered levels down to MIN_MIP_FRAME_SIZE texels per frame"""
+    levels = [values]
+    frame_size = FRAME_SIZE
+    while frame_size > MIN_MIP_FRAME_SIZE:
+        level = downsample(levels[-1])
+        if normalize:
+            xyz = level[..., :3]
+            level[..., :3] = xyz / np.maximum(np.linalg.norm(xyz, axis=-1, keepdims=True), 1e-6)
+        levels.append(level)
+        frame_size //= 2
+    return levels
+
+
+def to_unorm8(values):
+    return (np.clip(values, 0, 1) * 255 + 0.5).astype(np.uint8)
+
+
+def bake_impostor(name, source, output_dir):
+    """
+    Render the meshes in the scene into impostor atlases and metadata.
+    
+    Returns the metadata dict.
+    """
+    sys.path.insert(0, SCRIPTS_DIR)
+    from ktx2 import VK_FORMAT_R8_UNORM, VK_FORMAT_R8G8B8A8_SRGB, VK_FORMAT_R8G8B8A8_UNORM, uncompressed_dfd, write_ktx2
+    
+    center, radius = bounding_sphere(get_mesh_objects())
+    camera = setup_camera(center, radius)
+    size = FRAMES * FRAME_SIZE
+    albedo = np.zeros((size, size, 4), dtype=np.float32)
+    normal = np.zeros((size, size, 4), dtype=np.float32)
+    depth = np.ones((size, size), dtype=np.float32)
+    
+    with tempfile.TemporaryDirectory() as render_dir:
+        setup_render(render_dir)
+        for y, row in enumerate(frame_directions()):
+            for x, direction in enumerate(row):
+                view_albedo, view_normal, view_depth = render_view(camera, center, radius, direction, render_dir)
+                covered = view_albedo[..., 3] > 0
+                rows = slice(y * FRAME_SIZE, (y + 1) * FRAME_SIZE)
+                columns = slice(x * FRAME_SIZE, (x + 1) * FRAME_SIZE)
+                albedo[rows, columns, :3] = dilate(view_albedo[..., :3], covered)
+                albedo[rows, columns, 3] = view_albedo[..., 3]
+                normal[rows, columns, :3] = dilate(view_normal, covered)
+                normal[rows, columns, 3] = view_albedo[..., 3]
+                depth[rows, columns] = view_depth
+            print(f"    Rendered row {y + 1}/{FRAMES}")
+    
+    # Uncovered texels far from the silhouette face up
+    normal[..., :3][np.linalg.norm(normal[..., :3], axis=-1) < 1e-6] = (0, 1, 0)
+    
+    files = {kind: f"{name}-impostor-{kind}.ktx2" for kind in ("albedo", "normal", "depth")}
+    key_values = {"KTXwriter": "MetalMan bake_impostors"}
+    albedo_levels = []
+    for level in mip_chain(albedo):
+        level = level.copy()
+        level[..., :3] = linear_to_srgb(level[..., :3])
+        albedo_levels.append(to_unorm8(level).tobytes())
+    write_ktx2(os.path.join(output_dir, files["albedo"]), VK_FORMAT_R8G8B8A8_SRGB, size, size,
+               albedo_levels, uncompressed_dfd(4, srgb=True), 4, key_values=key_values)
+    
+    normal_levels = []
+    for level in mip_chain(normal, normalize=True):
+        level = level.copy()
+        level[..., :3] = level[..., :3] * 0.5 + 0.5
+        normal_levels.append(to_unorm8(level).tobytes())
+    write_ktx2(os.path.join(output_dir, files["normal"]), VK_FORMAT_R8G8B8A8_UNORM, size, size,
+               normal_levels, uncompressed_dfd(4), 4, key_values=key_values)
+    
+    write_ktx2(os.path.join(output_dir, files["depth"]), VK_FORMAT_R8_UNORM, size, size,
+               [to_unorm8(level).tobytes() for level in mip_chain(depth)], uncompressed_dfd(1), 1,
+               key_values=key_values)
+    
+    bpy.data.objects.remove(camera, do_unlink=True)
+    metadata = {
+        "name": name,
+        "source": source,
+        "frames": FRAMES,
+        "hemisphere": HEMISPHERE,
+        "frameSize": FRAME_SIZE,
+        "atlasSize": size,
+        "mipLevels": len(albedo_levels),
+        "center": [round(value, 5) for value in blender_to_game(center).tolist()],
+        "radius": round(radius, 5),
+        "depthRange": round(radius * 2, 5),
+        "textures": files,
+    }
+    with open(os.path.join(output_dir, f"{name}-impostor.json"), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    return metadata
+
+
+def find_sources():
+    """(name, source description, loader) for every tree type and matching landscape model"""
+    sources = []
+    for tree_type, (height, radius, seed) in TREE_SPECIMENS.items():
+        sources.append((tree_type, f"GeometryGenerator {tree_type} tree (height {height}, radius {radius}, seed {seed})",
+                        lambda t=tree_type, h=height, r=radius, s=seed: build_procedural_tree(t, h, r, s)))
+    if os.path.exists(MODELS_DIR):
+        for filename in sorted(os.listdir(MODELS_DIR)):
+            if any(re.match(pattern, filename) for pattern in MODEL_PATTERNS):
+                path = os.path.join(MODELS_DIR, filename)
+                sources.append((os.path.splitext(filename)[0], filename, lambda p=path: import_usd(p)))
+    return sources
+
+
+def process_source(name, source, load, skip_existing=True):
+    """
+    Bake one impostor:
+    1. Clear scene
+    2. Build or import the source
+    3. Render the views and write the atlases and metadata
+    
+    Returns: True if baked, False if failed, None if skipped
+    """
+    metadata_path = os.path.join(OUTPUT_DIR, f"{name}-impostor.json")
+    if skip_existing and os.path.exists(metadata_path):
+        print(f"  SKIPPED: {os.path.basename(metadata_path)} already exists")
+        return None
+    
+    print(f"\n{'='*60}")
+    print(f"Processing: {name} ({source})")
+    print(f"{'='*60}")
+    
+    clear_scene()
+    load()
+    meshes = get_mesh_objects()
+    if not meshes:
+        print(f"  WARNING: No meshes found for {name}")
+        return False
+    print(f"  Meshes: {[m.name for m in meshes]}")
+    
+    try:
+        metadata = bake_impostor(name, source, OUTPUT_DIR)
+        print(f"  SUCCESS: {FRAMES}x{FRAMES} views, {metadata['atlasSize']}px atlases, "
+              f"radius {metadata['radius']}")
+        return True
+    except Exception as e:
+        print(f"  ERROR during impostor bake: {e}")
+        return False
+
+
+def main():
+    """Main function to bake every impostor source"""
+    print("\n" + "="*60)
+    print("MetalMan Impostor Baking Script")
+    print("="*60)
+    
+    args = script_args()
+    force = "--force" in args
+    names = [arg for arg in args if not arg.startswith("--")]
+    
+    sources = find_sources()
+    if names:
+        unknown = sorted(set(names) - {name for name, _, _ in sources})
+        if unknown:
+            print(f"ERROR: Unknown impostor sources: {', '.join(unknown)}")
+            return
+        sources = [source for source in sources if source[0] in names]
+    
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    print(f"\nFound {len(sources)} sources:")
+    for name, source, _ in sources:
+        print(f"  - {name}: {source}")
+    print(f"Views: {FRAMES}x{FRAMES} {'hemi-octahedral' if HEMISPHERE else 'octahedral'}, {FRAME_SIZE}px each")
+    
+    success_count = 0
+    skip_count = 0
+    fail_count = 0
+    
+    for name, source, load in sources:
+        try:
+            result = process_source(name, source, load, SKIP_EXISTING and not force)
+            if result is True:
+                success_count += 1
+            elif result is None:
+                skip_count += 1
+            else:
+                fail_count += 1
+        except Exception as e:
+            print(f"ERROR processing {name}: {e}")
+            import traceback
+            traceback.print_exc()
+            fail_count += 1
+    
+    # Summary
+    print("\n" + "="*60)
+    print("IMPOSTOR BAKING COMPLETE")
+    print("="*60)
+    print(f"Successful impostors: {success_count}")
+    print(f"Skipped (already exist): {skip_count}")
+    print(f"Failed impostors: {fail_count}")
+    print(f"Output directory: {OUTPUT_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Blender Python Script: Bake Ambient Occlusion for Landscape Models
+
+This script imports each static model in LandscapeModels (the treasure chest,
+tree/plant models), bakes per-vertex ambient occlusion with Cycles on the CPU
+and exports a copy of the model with the occlusion stored as a vertex color,
+so contact shadowing comes with the asset instead of a screen-space pass.
+
+The occlusion is written to its own "ambientOcclusion" color attribute
+(point domain), which the USD exporter writes as primvars:ambientOcclusion,
+so a model's own displayColor is kept. A ground plane is added under the
+model while baking so the base picks up the contact shadow of the terrain.
+
+The game does not use the baked copies yet: USDModelLoader still loads the
+original models, and its vertex descriptor has no color attribute. The
+copies are therefore written to OUTPUT_DIR, outside the MetalMan/ folder
+Xcode bundles, so they are not shipped unused. Loading them and reading the
+attribute is a follow-up.
+
+Usage:
+1. Open Blender (tested with Blender 3.6+)
+2. Open the Scripting workspace
+3. Open this script in the text editor
+4. Run the script (Alt+P or click "Run Script")
+
+OR run from command line:
+    /Applications/Blender.app/Contents/MacOS/Blender --background --python bake_landscape_ao.py
+
+Requirements:
+- Blender 3.6+ (for USD import/export support and color attribute baking)
+"""
+
+import bpy
+import os
+import re
+import numpy as np
+from mathutils import Vector
+
+# ============================================================================
+# CONFIGURATION - Modify these paths as needed
+# ============================================================================
+
+# Directory containing the landscape models
+MODELS_DIR = "/Users/maxdavis/Projects/MetalMan/MetalMan/LandscapeModels"
+
+# Directory the baked copies are written to. Keep it outside MetalMan/: that folder is synchronized
+# with the app target, so anything written there is copied into the bundle
+OUTPUT_DIR = "/Users/maxdavis/Projects/MetalMan/landscape_ao"
+
+# Whether to skip models whose baked copy already exists
+SKIP_EXISTING = True
+
+# Suffix added to the file name of the baked copy (<name>-ao.usdz)
+AO_SUFFIX = "-ao"
+
+# Color attribute the occlusion is written to (USD primvars:ambientOcclusion)
+AO_ATTRIBUTE = "ambientOcclusion"
+
+# Cycles samples per vertex
+AO_SAMPLES = 128
+
+# Distance in meters beyond which geometry no longer occludes
+AO_DISTANCE = 1.0
+
+# Add a ground plane at the model's lowest point as an occluder
+GROUND_PLANE = True
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def clear_scene():
+    """Remove all objects from the scene"""
+    bpy.ops.object.select_all(action='SELECT')
+    bpy.ops.object.delete(use_global=False)
+    
+    # Clear orphan data of every type, recursively, so node groups, collections and the
+    # data they use don't pile up between models
+    bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+
+
+def import_usd(filepath):
+    """Import a USD/USDZ file"""
+    bpy.ops.wm.usd_import(filepath=filepath)
+
+
+def get_mesh_objects():
+    """Get all mesh objects in the scene"""
+    return [obj for obj in bpy.context.scene.objects if obj.type == 'MESH']
+
+
+def export_usd(output_path):
+    """Export the current scene as USD with color attributes (format follows the file extension)"""
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    
+    bpy.ops.object.select_all(action='SELECT')
+    
+    try:
+        bpy.ops.wm.usd_export(
+            filepath=output_path,
+            selected_objects_only=False,
+            export_animation=False,
+            export_uvmaps=True,
+            export_normals=True,
+            export_materials=True,
+            export_mesh_colors=True,
+            evaluation_mode='RENDER',
+            generate_preview_surface=True
+        )
+    except TypeError as e:
+        # Blender versions without export_mesh_colors always write color attributes
+        print(f"    Trying minimal export parameters due to: {e}")
+        bpy.ops.wm.usd_export(filepath=output_path)
+
+
+def baked_path(model_path):
+    """<name>-ao<ext> in OUTPUT_DIR for a model"""
+    base_name, extension = os.path.splitext(os.path.basename(model_path))
+    return os.path.join(OUTPUT_DIR, f"{base_name}{AO_SUFFIX}{extension}")
+
+
+def add_ground_plane(meshes):
+    """Plane under the lowest point of the meshes, large enough to catch their contact shadow"""
+    corners = np.array([obj.matrix_world @ Vector(corner) for obj in meshes for corner in obj.bound_box])
+    low, high = corners.min(axis=0), corners.max(axis=0)
+    size = float(max(high[0] - low[0], high[1] - low[1])) + AO_DISTANCE * 4
+    bpy.ops.mesh.primitive_plane_add(size=size, location=((low[0] + high[0]) / 2, (low[1] + high[1]) / 2, low[2]))
+    return bpy.context.active_object
+
+
+def setup_bake():
+    """Cycles on the CPU with the configured occlusion samples and distance"""
+    scene = bpy.context.scene
+    scene.render.engine = 'CYCLES'
+    scene.cycles.device = 'CPU'
+    scene.cycles.samples = AO_SAMPLES
+    if scene.world is None:
+        scene.world = bpy.data.worlds.new("World")
+    scene.world.light_settings.distance = AO_DISTANCE
+    scene.render.bake.target = 'VERTEX_COLORS'
+    scene.render.bake.use_clear = True
+
+
+def bake_ambient_occlusion(meshes):
+    """
+    Bake occlusion into AO_ATTRIBUTE on every mesh.
+    
+    Returns: mean occlusion over all vertices (1 = unoccluded)
+    """
+    for obj in meshes:
+        mesh = obj.data
+        existing = mesh.color_attributes.get(AO_ATTRIBUTE)
+        if existing is not None:
+            print(f"    WARNING: {obj.name} already has a '{AO_ATTRIBUTE}' color attribute, replacing it")
+            mesh.color_attributes.remove(existing)
+        mesh.color_attributes.new(name=AO_ATTRIBUTE, type='FLOAT_COLOR', domain='POINT')
+        mesh.color_attributes.active_color = mesh.color_attributes[AO_ATTRIBUTE]
+    
+    bpy.ops.object.select_all(action='DESELECT')
+    for obj in meshes:
+        obj.select_set(True)
+    bpy.context.view_layer.objects.active = meshes[0]
+    bpy.ops.object.bake(type='AO', target='VERTEX_COLORS')
+    
+    values = []
+    for obj in meshes:
+        colors = np.empty(len(obj.data.vertices) * 4, dtype=np.float32)
+        obj.data.color_attributes[AO_ATTRIBUTE].data.foreach_get('color', colors)
+        values.append(colors[0::4])
+    return float(np.concatenate(values).mean())
+
+
+def process_model(model_path, skip_existing=True):
+    """
+    Process a single landscape model:
+    1. Clear scene
+    2. Import the model
+    3. Bake per-vertex ambient occlusion and export the baked copy
+    
+    Returns: True if exported, False if failed, None if skipped
+    """
+    model_name = os.path.basename(model_path)
+    output_path = baked_path(model_path)
+    
+    if skip_existing and os.path.exists(output_path):
+        print(f"  SKIPPED: {os.path.basename(output_path)} already exists")
+        return None
+    
+    print(f"\n{'='*60}")
+    print(f"Processing: {model_name}")
+    print(f"{'='*60}")
+    
+    clear_scene()
+    
+    print(f"  Importing: {model_path}")
+    import_usd(model_path)
+    
+    meshes = get_mesh_objects()
+    if not meshes:
+        print(f"  WARNING: No meshes found in {model_name}")
+        return False
+    print(f"  Meshes: {[m.name for m in meshes]}")
+    
+    try:
+        setup_bake()
+        ground = add_ground_plane(meshes) if GROUND_PLANE else None
+        print(f"  Baking ambient occlusion ({AO_SAMPLES} samples, distance {AO_DISTANCE})")
+        mean_occlusion = bake_ambient_occlusion(meshes)
+        if ground is not None:
+            bpy.data.objects.remove(ground, do_unlink=True)
+        
+        print(f"  Exporting to: {output_path}")
+        export_usd(output_path)
+        print(f"  SUCCESS: Baked {model_name} (mean occlusion {mean_occlusion:.3f})")
+        return True
+    except Exception as e:
+        print(f"  ERROR during ambient occlusion bake: {e}")
+        return False
+
+
+def main():
+    """Main function to process all landscape models"""
+    print("\n" + "="*60)
+    print("MetalMan Landscape Ambient Occlusion Script")
+    print("="*60)
+    
+    if not os.path.exists(MODELS_DIR):
+        print(f"ERROR: Models directory not found: {MODELS_DIR}")
+        return
+    
+    # Find all base models (skip generated LOD and baked files)
+    model_files = []
+    for filename in os.listdir(MODELS_DIR):
+        name, extension = os.path.splitext(filename)
+        if extension.lower() in ('.usdz', '.usdc') and not re.search(rf'(-lod\d+|{AO_SUFFIX})$', name):
+            model_files.append(os.path.join(MODELS_DIR, filename))
+    
+    model_files.sort()
+    
+    print(f"\nFound {len(model_files)} models:")
+    for f in model_files:
+        print(f"  - {os.path.basename(f)}")
+    print(f"Samples: {AO_SAMPLES}, distance: {AO_DISTANCE}, ground plane: {GROUND_PLANE}")
+    print(f"Output directory: {OUTPUT_DIR}")
+    print(f"Skip existing: {SKIP_EXISTING}")
+    
+    success_count = 0
+    skip_count = 0
+    fail_count = 0
+    
+    for model_file in model_files:
+        try:
+            result = process_model(model_file, SKIP_EXISTING)
+            if result is True:
+                success_count += 1
+            elif result is None:
+                skip_count += 1
+            else:
+                fail_count += 1
+        except Exception as e:
+            print(f"ERROR processing {model_file}: {e}")
+            import traceback
+            traceback.print_exc()
+            fail_count += 1
+    
+    # Summary
+    print("\n" + "="*60)
+    print("AMBIENT OCCLUSION BAKING COMPLETE")
+    print("="*60)
+    print(f"Successful models: {success_count}")
+    print(f"Skipped (already exist): {skip_count}")
+    print(f"Failed models: {fail_count}")
+    print(f"Output directory: {OUTPUT_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,7 @@ Requirements:
 import bpy
 import os
 import re
+import sys
 from pathlib import Path
 
 # ============================================================================
@@ -37,6 +38,68 @@ CHARACTER_MESH_FILE = "Paladin WProp J Nordstrom.fbx"
 # Whether to strip root motion (horizontal movement) from animations
 STRIP_ROOT_MOTION = True
 
+# Whether to export decimated LOD meshes alongside the base model clip
+GENERATE_LODS = True
+
+# Clips whose mesh the renderer uses as the model (see Renderer.loadPlayerModel)
+LOD_SOURCE_CLIPS = ["sword-and-shield-idle"]
+
+# Reduced LOD levels: (decimation ratio, screen size)
+# Screen size is the fraction of viewport height below which the level is used
+LOD_LEVELS = [
+    (0.5, 0.25),   # LOD1
+    (0.25, 0.12),  # LOD2
+    (0.1, 0.05),   # LOD3
+]
+
+# Whether to write a foot-contact/swing event track next to each export (detection
+# settings are in Scripts/event_tracks.py)
+EXPORT_EVENT_TRACKS = True
+
+# Whether to write per-frame animated bounds of the skinned meshes next to each export
+EXPORT_CLIP_BOUNDS = True
+
+# Whether to write <name>-colliders.json (body circle and per-bone hit capsules) for
+# the LOD source clips
+EXPORT_COLLISION_PROXIES = True
+
+# Height the Renderer scales this character to (its targetHeight)
+PROXY_TARGET_HEIGHT = 2.0
+
+# Repository Scripts/ folder, which holds the modules shared by the exporters
+SCRIPTS_DIR = "/Users/maxdavis/Projects/MetalMan/Scripts"
+
+# Whether to write a -clip.json sidecar (Scripts/export_animation.py format) for each
+# clip, loaded by the game instead of extracting keyframes from the USDZ
+EXPORT_BONE_CLIPS = True
+
+# FBX importer settings (part of the rig cache key, so changing them re-imports the character)
+FBX_IMPORT_SETTINGS = {
+    "use_anim": True,
+    "ignore_leaf_bones": False,
+    "automatic_bone_orientation": False,
+    "use_prepost_rot": True,
+    "use_custom_props": True,
+}
+
+# Whether to keep the imported character as a .blend library and append it from there on
+# later runs instead of parsing the FBX for every clip
+USE_RIG_CACHE = True
+
+# Folder of cached character rigs (Scripts/rig_cache.py), one .blend per character, Blender
+# version, source hash and importer settings
+RIG_CACHE_DIR = "/Users/maxdavis/Projects/MetalMan/animation_source/.rig_cache"
+
+# ============================================================================
+# SHARED MODULES (repository Scripts/ folder)
+# ============================================================================
+
+sys.path.insert(0, SCRIPTS_DIR)
+from clip_metadata import export_clip_metadata, get_skinned_meshes
+from export_worker import is_worker, serve_worker
+from lod_generation import export_lods
+from rig_cache import import_character
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -79,37 +142,14 @@ def clear_scene():
     bpy.ops.object.select_all(action='SELECT')
     bpy.ops.object.delete(use_global=False)
     
-    # Clear orphan data
-    for block in bpy.data.meshes:
-        if block.users == 0:
-            bpy.data.meshes.remove(block)
-    for block in bpy.data.armatures:
-        if block.users == 0:
-            bpy.data.armatures.remove(block)
-    for block in bpy.data.materials:
-        if block.users == 0:
-            bpy.data.materials.remove(block)
-    for block in bpy.data.textures:
-        if block.users == 0:
-            bpy.data.textures.remove(block)
-    for block in bpy.data.images:
-        if block.users == 0:
-            bpy.data.images.remove(block)
-    for block in bpy.data.actions:
-        if block.users == 0:
-            bpy.data.actions.remove(block)
+    # Clear orphan data of every type (not just meshes, materials and actions), recursively,
+    # so node groups, collections and the data they use don't pile up over long batches
+    bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
 
 
 def import_fbx(filepath):
     """Import an FBX file"""
-    bpy.ops.import_scene.fbx(
-        filepath=filepath,
-        use_anim=True,
-        ignore_leaf_bones=False,
-        automatic_bone_orientation=False,
-        use_prepost_rot=True,
-        use_custom_props=True
-    )
+    bpy.ops.import_scene.fbx(filepath=filepath, **FBX_IMPORT_SETTINGS)
 
 
 def get_armature():
@@ -230,14 +270,24 @@ def export_usdz(output_path):
         )
 
 
-def process_animation(anim_file, character_file, output_dir, strip_root=True):
+def export_collision_proxies(armature, output_path):
+    """Write <name>-colliders.json with Scripts/collision_proxies.py, scaled to PROXY_TARGET_HEIGHT"""
+    sys.path.insert(0, SCRIPTS_DIR)
+    import collision_proxies
+    
+    collision_proxies.export_collision_proxies(armature, get_skinned_meshes(armature), output_path,
+                                               PROXY_TARGET_HEIGHT)
+
+
+def process_animation(anim_file, character_file, output_dir, strip_root=True, lod_clips=None):
     """
     Process a single animation file:
     1. Clear scene
     2. Import character mesh
     3. Import animation (to get the action)
     4. Apply animation to character armature
-    5. Export as USDZ
+    5. Export as USDZ (plus LODs if the clip is in lod_clips, collision proxies for the
+       LOD source clips, and the clip sidecars)
     """
     anim_name = os.path.basename(anim_file)
     clean_name = clean_filename(anim_name)
@@ -260,7 +310,7 @@ def process_animation(anim_file, character_file, output_dir, strip_root=True):
     
     # Import the character mesh first
     print(f"  Importing character mesh: {character_file}")
-    import_fbx(character_file)
+    import_character(character_file, FBX_IMPORT_SETTINGS, RIG_CACHE_DIR if USE_RIG_CACHE else None)
     
     # Get the character's armature
     char_armature = get_armature()
@@ -372,12 +422,42 @@ def process_animation(anim_file, character_file, output_dir, strip_root=True):
     try:
         export_usdz(output_path)
         print(f"  SUCCESS: Exported {clean_name}.usdz")
+        if lod_clips and clean_name in lod_clips:
+            export_lods(output_path, LOD_LEVELS, export_usdz)
+        if EXPORT_COLLISION_PROXIES and clean_name in LOD_SOURCE_CLIPS and get_armature():
+            export_collision_proxies(get_armature(), output_path)
+        if EXPORT_EVENT_TRACKS or EXPORT_CLIP_BOUNDS or EXPORT_BONE_CLIPS:
+            clip_armature = get_armature()
+            if clip_armature:
+                export_clip_metadata(clip_armature, output_path, EXPORT_EVENT_TRACKS, EXPORT_CLIP_BOUNDS,
+                                     EXPORT_BONE_CLIPS)
         return True
     except Exception as e:
         print(f"  ERROR during export: {e}")
         return False
 
 
+def find_animation_files():
+    """All animation FBX files in SOURCE_DIR (excluding the character mesh), sorted"""
+    return sorted(
+        os.path.join(SOURCE_DIR, filename) for filename in os.listdir(SOURCE_DIR)
+        if filename.endswith('.fbx') and filename != CHARACTER_MESH_FILE
+    )
+
+
+def run_worker():
+    """Worker mode for export_supervisor.py (protocol in Scripts/export_worker.py)"""
+    character_path = os.path.join(SOURCE_DIR, CHARACTER_MESH_FILE)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    lod_clips = LOD_SOURCE_CLIPS if GENERATE_LODS else None
+    
+    serve_worker(
+        lambda: (find_animation_files(), [character_path]),
+        lambda path, force: process_animation(path, character_path, OUTPUT_DIR, STRIP_ROOT_MOTION,
+                                              lod_clips=lod_clips)
+    )
+
+
 def main():
     """Main function to process all animations"""
     print("\n" + "="*60)
@@ -398,17 +478,19 @@ def main():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     
     # Find all animation FBX files (excluding the character mesh)
-    animation_files = []
-    for filename in os.listdir(SOURCE_DIR):
-        if filename.endswith('.fbx') and filename != CHARACTER_MESH_FILE:
-            animation_files.append(os.path.join(SOURCE_DIR, filename))
-    
-    animation_files.sort()
+    animation_files = find_animation_files()
     
     print(f"\nFound {len(animation_files)} animation files")
     print(f"Character mesh: {CHARACTER_MESH_FILE}")
     print(f"Output directory: {OUTPUT_DIR}")
     print(f"Strip root motion: {STRIP_ROOT_MOTION}")
+    print(f"Generate LODs: {GENERATE_LODS} {LOD_SOURCE_CLIPS if GENERATE_LODS else ''}")
+    print(f"Export event tracks: {EXPORT_EVENT_TRACKS}")
+    print(f"Export clip bounds: {EXPORT_CLIP_BOUNDS}")
+    print(f"Export bone clips: {EXPORT_BONE_CLIPS}")
+    print(f"Rig cache: {RIG_CACHE_DIR if USE_RIG_CACHE else 'off'}")
+    
+    lod_clips = LOD_SOURCE_CLIPS if GENERATE_LODS else None
     
     # Process each animation
     success_count = 0
@@ -416,7 +498,7 @@ def main():
     
     for anim_file in animation_files:
         try:
-            if process_animation(anim_file, character_path, OUTPUT_DIR, STRIP_ROOT_MOTION):
+            if process_animation(anim_file, character_path, OUTPUT_DIR, STRIP_ROOT_MOTION, lod_clips=lod_clips):
                 success_count += 1
             else:
                 fail_count += 1
@@ -442,5 +524,8 @@ def main():
 
 # Run the script
 if __name__ == "__main__":
-    main()
+    if is_worker():
+        run_worker()
+    else:
+        main()
 
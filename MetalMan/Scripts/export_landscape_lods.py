@@ -0,0 +1,205 @@
+"""
+Blender Python Script: Generate LOD Meshes for Landscape Models
+
+This script imports each static model in LandscapeModels (the treasure chest,
+tree/plant models) and exports decimated LOD variants next to it, along with
+a manifest of screen-size switch thresholds for the renderer.
+
+Usage:
+1. Open Blender (tested with Blender 3.6+)
+2. Open the Scripting workspace
+3. Open this script in the text editor
+4. Run the script (Alt+P or click "Run Script")
+
+OR run from command line:
+    /Applications/Blender.app/Contents/MacOS/Blender --background --python export_landscape_lods.py
+
+Requirements:
+- Blender 3.6+ (for USD import/export support)
+"""
+
+import bpy
+import os
+import re
+import sys
+
+# ============================================================================
+# CONFIGURATION - Modify these paths as needed
+# ============================================================================
+
+# Directory containing the landscape models (LODs are written alongside)
+MODELS_DIR = "/Users/maxdavis/Projects/MetalMan/MetalMan/LandscapeModels"
+
+# Whether to skip models whose LOD manifest already exists
+SKIP_EXISTING = True
+
+# Reduced LOD levels: (decimation ratio, screen size)
+# Screen size is the fraction of viewport height below which the level is used
+LOD_LEVELS = [
+    (0.5, 0.25),   # LOD1
+    (0.25, 0.12),  # LOD2
+    (0.1, 0.05),   # LOD3
+]
+
+# Repository Scripts/ folder, which holds lod_generation.py (shared with the character exporters)
+SCRIPTS_DIR = "/Users/maxdavis/Projects/MetalMan/Scripts"
+
+# ============================================================================
+# SHARED MODULES (repository Scripts/ folder)
+# ============================================================================
+
+sys.path.insert(0, SCRIPTS_DIR)
+from lod_generation import export_lods
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def clear_scene():
+    """Remove all objects from the scene"""
+    bpy.ops.object.select_all(action='SELECT')
+    bpy.ops.object.delete(use_global=False)
+    
+    # Clear orphan data
+    for block in bpy.data.meshes:
+        if block.users == 0:
+            bpy.data.meshes.remove(block)
+    for block in bpy.data.materials:
+        if block.users == 0:
+            bpy.data.materials.remove(block)
+    for block in bpy.data.textures:
+        if block.users == 0:
+            bpy.data.textures.remove(block)
+    for block in bpy.data.images:
+        if block.users == 0:
+            bpy.data.images.remove(block)
+
+
+def import_usd(filepath):
+    """Import a USD/USDZ file"""
+    bpy.ops.wm.usd_import(filepath=filepath)
+
+
+def get_mesh_objects():
+    """Get all mesh objects in the scene"""
+    return [obj for obj in bpy.context.scene.objects if obj.type == 'MESH']
+
+
+def export_usd(output_path):
+    """Export the current scene as USD (format follows the file extension)"""
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    
+    bpy.ops.object.select_all(action='SELECT')
+    
+    try:
+        bpy.ops.wm.usd_export(
+            filepath=output_path,
+            selected_objects_only=False,
+            export_animation=False,
+            export_uvmaps=True,
+            export_normals=True,
+            export_materials=True,
+            evaluation_mode='RENDER',
+            generate_preview_surface=True
+        )
+    except TypeError as e:
+        print(f"    Trying minimal export parameters due to: {e}")
+        bpy.ops.wm.usd_export(filepath=output_path)
+
+
+def process_model(model_path, skip_existing=True):
+    """
+    Process a single landscape model:
+    1. Clear scene
+    2. Import the model
+    3. Export decimated LODs and the LOD manifest
+    
+    Returns: True if exported, False if failed, None if skipped
+    """
+    model_name = os.path.basename(model_path)
+    manifest_path = f"{os.path.splitext(model_path)[0]}-lods.json"
+    
+    if skip_existing and os.path.exists(manifest_path):
+        print(f"  SKIPPED: {os.path.basename(manifest_path)} already exists")
+        return None
+    
+    print(f"\n{'='*60}")
+    print(f"Processing: {model_name}")
+    print(f"{'='*60}")
+    
+    clear_scene()
+    
+    print(f"  Importing: {model_path}")
+    import_usd(model_path)
+    
+    meshes = get_mesh_objects()
+    if not meshes:
+        print(f"  WARNING: No meshes found in {model_name}")
+        return False
+    print(f"  Meshes: {[m.name for m in meshes]}")
+    
+    try:
+        export_lods(model_path, LOD_LEVELS, export_usd)
+        print(f"  SUCCESS: Generated {len(LOD_LEVELS)} LODs for {model_name}")
+        return True
+    except Exception as e:
+        print(f"  ERROR during LOD export: {e}")
+        return False
+
+
+def main():
+    """Main function to process all landscape models"""
+    print("\n" + "="*60)
+    print("MetalMan Landscape LOD Generation Script")
+    print("="*60)
+    
+    if not os.path.exists(MODELS_DIR):
+        print(f"ERROR: Models directory not found: {MODELS_DIR}")
+        return
+    
+    # Find all base models (skip previously generated LOD and baked AO files)
+    model_files = []
+    for filename in os.listdir(MODELS_DIR):
+        name, extension = os.path.splitext(filename)
+        if extension.lower() in ('.usdz', '.usdc') and not re.search(r'-(lod\d+|ao)$', name):
+            model_files.append(os.path.join(MODELS_DIR, filename))
+    
+    model_files.sort()
+    
+    print(f"\nFound {len(model_files)} models:")
+    for f in model_files:
+        print(f"  - {os.path.basename(f)}")
+    print(f"LOD levels: {LOD_LEVELS}")
+    print(f"Skip existing: {SKIP_EXISTING}")
+    
+    success_count = 0
+    skip_count = 0
+    fail_count = 0
+    
+    for model_file in model_files:
+        try:
+            result = process_model(model_file, SKIP_EXISTING)
+            if result is True:
+                success_count += 1
+            elif result is None:
+                skip_count += 1
+            else:
+                fail_count += 1
+        except Exception as e:
+            print(f"ERROR processing {model_file}: {e}")
+            import traceback
+            traceback.print_exc()
+            fail_count += 1
+    
+    # Summary
+    print("\n" + "="*60)
+    print("LOD GENERATION COMPLETE")
+    print("="*60)
+    print(f"Successful models: {success_count}")
+    print(f"Skipped (already exist): {skip_count}")
+    print(f"Failed models: {fail_count}")
+    print(f"Output directory: {MODELS_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+Export Supervisor: run the USDZ exporters in crash-isolated Blender workers
+
+Runs export_animations_to_usdz.py, export_enemy_animations.py or
+export_vendor_animations.py in a child Blender process (worker mode) and
+feeds it one source file at a time:
+
+- a file that takes longer than the timeout gets its worker killed, is
+  recorded as a timeout and the batch continues in a fresh worker
+- a worker crash only loses the file it was exporting
+- every result is appended to a journal, so an interrupted run resumes
+  where it stopped (files exported or skipped since their last change are
+  not sent again)
+- workers are recycled after a number of files or when their resident
+  memory grows past a threshold
+
+Usage (plain Python 3, not inside Blender):
+    python export_supervisor.py enemy
+    python export_supervisor.py player --timeout 300 --recycle-files 10
+    python export_supervisor.py vendor --skip-failed
+    python export_supervisor.py enemy --fresh        # ignore the journal
+
+Requirements:
+- Python 3.8+
+- Blender 3.6+ at BLENDER_PATH
+"""
+
+import argparse
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+
+# ============================================================================
+# CONFIGURATION - Modify these paths as needed
+# ============================================================================
+
+# Blender executable
+BLENDER_PATH = "/Applications/Blender.app/Contents/MacOS/Blender"
+
+# Folder with the exporter scripts
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Repository Scripts/ folder, which holds export_worker.py (the worker protocol shared with the
+# exporters)
+SHARED_SCRIPTS_DIR = os.path.normpath(os.path.join(SCRIPTS_DIR, "..", "..", "Scripts"))
+
+# Exporters the supervisor can run
+EXPORTERS = {
+    "player": "export_animations_to_usdz.py",
+    "enemy": "export_enemy_animations.py",
+    "vendor": "export_vendor_animations.py",
+}
+
+# Folder of the append-only journals, one <exporter>.jsonl per exporter
+JOURNAL_DIR = os.path.join(SCRIPTS_DIR, "export_journals")
+
+# Seconds a single file may take before its worker is killed
+FILE_TIMEOUT = 600
+
+# Seconds a worker may take to start and list its files
+STARTUP_TIMEOUT = 180
+
+# Restart the worker after this many files...
+RECYCLE_AFTER_FILES = 25
+
+# ...or when its resident memory exceeds this many megabytes
+RECYCLE_RSS_MB = 6000
+
+# Journal statuses that mean a file does not need exporting again
+DONE_STATUSES = ("exported", "skipped")
+
+# ============================================================================
+# SHARED MODULES (repository Scripts/ folder)
+# ============================================================================
+
+sys.path.insert(0, SHARED_SCRIPTS_DIR)
+from export_worker import WORKER_FLAG, parse_reply
+
+# ============================================================================
+# WORKER
+# ============================================================================
+
+class Worker:
+    """A background Blender running an exporter in worker mode"""
+
+    def __init__(self, script):
+        self.process = subprocess.Popen(
+            [BLENDER_PATH, "--background", "--factory-startup", "--python", script, "--", WORKER_FLAG],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, bufsize=1
+        )
+        self.files_done = 0
+        self.replies = queue.Queue()
+        threading.Thread(target=self._read_output, daemon=True).start()
+
+    def _read_output(self):
+        """Forward Blender's output and queue reply lines (None once the worker exits)"""
+        for line in self.process.stdout:
+            reply = parse_reply(line)
+            if reply is not None:
+                self.replies.put(reply)
+            else:
+                sys.stdout.write(f"    | {line}")
+        self.replies.put(None)
+
+    def request(self, command, timeout):
+        """
+        Send a command and wait for its reply.
+        Returns the reply, "timeout" or "crashed".
+        """
+        try:
+            self.process.stdin.write(json.dumps(command) + "\n")
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError):
+            return "crashed"
+        try:
+            reply = self.replies.get(timeout=timeout)
+        except queue.Empty:
+            return "timeout"
+        return reply if reply is not None else "crashed"
+
+    def rss_mb(self):
+        """Resident memory of the worker in megabytes (0 if unknown)"""
+        try:
+            output = subprocess.run(["ps", "-o", "rss=", "-p", str(self.process.pid)],
+                                    capture_output=True, text=True).stdout
+            return int(output.strip()) / 1024
+        except (OSError, ValueError):
+            return 0
+
+    def stop(self):
+        """Let the worker finish by closing its input, killing it if it does not exit"""
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.kill()
+
+    def kill(self):
+        self.process.kill()
+        self.process.wait()
+
+# ============================================================================
+# JOURNAL
+# ============================================================================
+
+def source_mtime(path):
+    """Modification time of a source file (None if it is missing)"""
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def read_journal(journal_path):
+    """Last journal entry per file"""
+    entries = {}
+    if os.path.exists(journal_path):
+        with open(journal_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line cut off by an interrupted run
+                    continue
+                entries[entry["file"]] = entry
+    return entries
+
+
+def append_journal(journal_path, entry):
+    """Append one entry and flush it to disk straight away"""
+    with open(journal_path, 'a') as f:
+        f.write(json.dumps(entry) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def pending_files(files, entries, skip_failed=False):
+    """Files without an up-to-date done entry (and, with skip_failed, without any entry)"""
+    pending = []
+    for path in files:
+        entry = entries.get(path)
+        if entry and entry["mtime"] == source_mtime(path):
+            if entry["status"] in DONE_STATUSES or skip_failed:
+                continue
+        pending.append(path)
+    return pending
+
+# ============================================================================
+# SUPERVISOR
+# ============================================================================
+
+def start_worker(script):
+    """
+    Start a worker and wait until it has loaded the exporter and listed its files.
+    Returns (worker, listing), or (None, None) if it does not start.
+    """
+    worker = Worker(script)
+    listing = worker.request({"command": "list"}, STARTUP_TIMEOUT)
+    if not isinstance(listing, dict):
+        worker.kill()
+        print(f"ERROR: worker did not start ({listing})")
+        return None, None
+    return worker, listing
+
+
+def supervise(exporter, timeout=FILE_TIMEOUT, recycle_files=RECYCLE_AFTER_FILES,
+              recycle_rss_mb=RECYCLE_RSS_MB, skip_failed=False, fresh=False):
+    """Export every pending file of an exporter; returns the status counts (None if no worker starts)"""
+    script = os.path.join(SCRIPTS_DIR, EXPORTERS[exporter])
+    os.makedirs(JOURNAL_DIR, exist_ok=True)
+    journal_path = os.path.join(JOURNAL_DIR, f"{exporter}.jsonl")
+    if fresh and os.path.exists(journal_path):
+        os.remove(journal_path)
+
+    if not os.path.exists(BLENDER_PATH):
+        print(f"ERROR: Blender not found: {BLENDER_PATH}")
+        return None
+
+    worker, listing = start_worker(script)
+    if worker is None:
+        return None
+
+    files = listing["files"]
+    pending = pending_files(files, read_journal(journal_path), skip_failed)
+    print(f"\n{len(files)} files, {len(files) - len(pending)} already done, {len(pending)} to export")
+    print(f"Journal: {journal_path}")
+
+    counts = {}
+    for number, path in enumerate(pending, 1):
+        if worker is None:
+            # Wait for the new worker to start, so its startup does not count against the file timeout
+            worker, _ = start_worker(script)
+            if worker is None:
+                print("Stopping; the remaining files stay pending in the journal")
+                break
+
+        print(f"\n[{number}/{len(pending)}] {os.path.basename(path)}")
+        started = time.time()
+        reply = worker.request({"command": "export", "file": path}, timeout)
+        status = reply["status"] if isinstance(reply, dict) else reply
+        seconds = round(time.time() - started, 1)
+
+        append_journal(journal_path, {
+            "file": path,
+            "mtime": source_mtime(path),
+            "status": status,
+            "seconds": seconds,
+            "time": datetime.now().isoformat(timespec="seconds"),
+        })
+        counts[status] = counts.get(status, 0) + 1
+        print(f"  -> {status} ({seconds}s)")
+
+        if status in ("timeout", "crashed"):
+            worker.kill()
+            worker = None
+            continue
+
+        worker.files_done += 1
+        rss = worker.rss_mb()
+        if worker.files_done >= recycle_files or rss > recycle_rss_mb:
+            print(f"  Recycling worker after {worker.files_done} files ({rss:.0f} MB)")
+            worker.stop()
+            worker = None
+
+    if worker is not None:
+        worker.stop()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a USDZ exporter in crash-isolated Blender workers")
+    parser.add_argument("exporter", choices=sorted(EXPORTERS))
+    parser.add_argument("--timeout", type=float, default=FILE_TIMEOUT, help="seconds allowed per file")
+    parser.add_argument("--recycle-files", type=int, default=RECYCLE_AFTER_FILES,
+                        help="restart the worker after this many files")
+    parser.add_argument("--recycle-rss", type=float, default=RECYCLE_RSS_MB,
+                        help="restart the worker above this resident memory (MB)")
+    parser.add_argument("--skip-failed", action="store_true",
+                        help="do not retry files that failed, timed out or crashed in an earlier run")
+    parser.add_argument("--fresh", action="store_true", help="discard the journal and export everything")
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print(f"MetalMan Export Supervisor: {EXPORTERS[args.exporter]}")
+    print("="*60)
+
+    counts = supervise(args.exporter, args.timeout, args.recycle_files, args.recycle_rss,
+                       args.skip_failed, args.fresh)
+    if counts is None:
+        sys.exit(1)
+
+    print("\n" + "="*60)
+    print("SUPERVISED EXPORT COMPLETE")
+    print("="*60)
+    for status, count in sorted(counts.items()):
+        print(f"{status}: {count}")
+
+    failed = sum(count for status, count in counts.items() if status not in DONE_STATUSES)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
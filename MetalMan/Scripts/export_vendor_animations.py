@@ -19,8 +19,11 @@ Requirements:
 """
 
 import bpy
+import json
+import numpy as np
 import os
 import re
+import sys
 from pathlib import Path
 
 # ============================================================================
@@ -36,6 +39,54 @@ OUTPUT_DIR = "/Users/maxdavis/Projects/MetalMan/MetalMan/NPCAnimations"
 # Whether to skip files that already exist in output
 SKIP_EXISTING = True
 
+# Whether to export decimated LOD meshes alongside the base model clip
+GENERATE_LODS = True
+
+# Clips whose mesh the renderer uses as the model (see Renderer.loadNPCModel)
+LOD_SOURCE_CLIPS = ["vendor-happy-idle"]
+
+# Reduced LOD levels: (decimation ratio, screen size)
+# Screen size is the fraction of viewport height below which the level is used
+LOD_LEVELS = [
+    (0.5, 0.25),   # LOD1
+    (0.25, 0.12),  # LOD2
+    (0.1, 0.05),   # LOD3
+]
+
+# Whether to write a foot-contact/swing event track next to each export (detection
+# settings are in Scripts/event_tracks.py)
+EXPORT_EVENT_TRACKS = True
+
+# Whether to write per-frame animated bounds of the skinned meshes next to each export
+EXPORT_CLIP_BOUNDS = True
+
+# Whether to write <name>-colliders.json (body circle and per-bone hit capsules) for
+# the LOD source clips
+EXPORT_COLLISION_PROXIES = True
+
+# Height the Renderer scales this character to (its targetHeight)
+PROXY_TARGET_HEIGHT = 1.8
+
+# Whether to bake vertex animation textures and a static base mesh for each clip,
+# so NPCs can be played back without a skeleton
+BAKE_VERTEX_ANIMATION = False
+
+# Widest VAT row; meshes with more vertices wrap onto several rows per frame
+VAT_MAX_WIDTH = 4096
+
+# Repository Scripts/ folder, which holds the modules shared by the exporters
+# (and ktx2.py, the KTX2 writer shared with the texture bakers)
+SCRIPTS_DIR = "/Users/maxdavis/Projects/MetalMan/Scripts"
+
+# ============================================================================
+# SHARED MODULES (repository Scripts/ folder)
+# ============================================================================
+
+sys.path.insert(0, SCRIPTS_DIR)
+from clip_metadata import export_clip_metadata, get_skinned_meshes
+from export_worker import is_worker, serve_worker
+from lod_generation import export_lods, lods_missing
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -78,25 +129,9 @@ def clear_scene():
     bpy.ops.object.select_all(action='SELECT')
     bpy.ops.object.delete(use_global=False)
     
-    # Clear orphan data
-    for block in bpy.data.meshes:
-        if block.users == 0:
-            bpy.data.meshes.remove(block)
-    for block in bpy.data.armatures:
-        if block.users == 0:
-            bpy.data.armatures.remove(block)
-    for block in bpy.data.materials:
-        if block.users == 0:
-            bpy.data.materials.remove(block)
-    for block in bpy.data.textures:
-        if block.users == 0:
-            bpy.data.textures.remove(block)
-    for block in bpy.data.images:
-        if block.users == 0:
-            bpy.data.images.remove(block)
-    for block in bpy.data.actions:
-        if block.users == 0:
-            bpy.data.actions.remove(block)
+    # Clear orphan data of every type (not just meshes, materials and actions), recursively,
+    # so node groups, collections and the data they use don't pile up over long batches
+    bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
 
 
 def import_fbx(filepath):
@@ -168,13 +203,148 @@ def export_usdz(output_path):
         )
 
 
-def process_vendor_fbx(fbx_file, output_dir, skip_existing=True):
+def export_collision_proxies(armature, output_path):
+    """Write <name>-colliders.json with Scripts/collision_proxies.py, scaled to PROXY_TARGET_HEIGHT"""
+    sys.path.insert(0, SCRIPTS_DIR)
+    import collision_proxies
+    
+    collision_proxies.export_collision_proxies(armature, get_skinned_meshes(armature), output_path,
+                                               PROXY_TARGET_HEIGHT)
+
+
+def read_vertex_data(mesh):
+    """Object-space vertex positions and normals of a mesh as (N, 3) float32 arrays"""
+    count = len(mesh.vertices)
+    positions = np.empty(count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', positions)
+    normals = np.empty(count * 3, dtype=np.float32)
+    if hasattr(mesh, 'vertex_normals'):
+        mesh.vertex_normals.foreach_get('vector', normals)  # Blender 4.1+
+    else:
+        mesh.vertices.foreach_get('normal', normals)
+    return positions.reshape(-1, 3), normals.reshape(-1, 3)
+
+
+def vat_layout(vertex_count, max_width=VAT_MAX_WIDTH):
+    """Texture width and rows per frame for a VAT (vertices wrap across rows)"""
+    width = min(vertex_count, max_width)
+    return width, -(-vertex_count // width)
+
+
+def add_vat_uvs(meshes, width):
+    """
+    Add a 'VAT' UV map pointing every face corner at its vertex's texel:
+    u = texel column centre (0-1), v = row within a frame (integer).
+    The shader adds frame * rowsPerFrame to v, so the lookup survives any
+    vertex re-indexing done by the USD export or the runtime loader.
+    """
+    offset = 0
+    for obj in meshes:
+        mesh = obj.data
+        loop_vertices = np.empty(len(mesh.loops), dtype=np.int64)
+        mesh.loops.foreach_get('vertex_index', loop_vertices)
+        vertex_ids = loop_vertices + offset
+        uvs = np.empty((len(vertex_ids), 2), dtype=np.float32)
+        uvs[:, 0] = (vertex_ids % width + 0.5) / width
+        uvs[:, 1] = vertex_ids // width
+        mesh.uv_layers.new(name="VAT").data.foreach_set('uv', uvs.ravel())
+        offset += len(mesh.vertices)
+
+
+def export_vertex_animation(armature, output_path):
+    """
+    Bake the clip into vertex animation textures plus a static base mesh.
+    
+    Writes next to the exported USDZ:
+    - <name>-vat-position.ktx2 / <name>-vat-normal.ktx2: RGBA16F, one texel per
+      vertex per frame (object-space position / normal of the skinned meshes)
+    - <name>-vat-base.usdz: the meshes posed at the first frame, without the
+      armature, with a 'VAT' UV map addressing each vertex's texels
+    - <name>-vat.json: layout (width, rows per frame, frame count, fps)
+    
+    This is destructive (the armature is removed), so it runs last.
+    """
+    sys.path.insert(0, SCRIPTS_DIR)
+    from ktx2 import VK_FORMAT_R16G16B16A16_SFLOAT, uncompressed_dfd, write_ktx2
+    
+    scene = bpy.context.scene
+    fps = scene.render.fps
+    base_path = os.path.splitext(output_path)[0]
+    meshes = get_skinned_meshes(armature)
+    if not meshes:
+        print("  WARNING: No skinned meshes, skipping vertex animation")
+        return
+    
+    vertex_count = sum(len(obj.data.vertices) for obj in meshes)
+    width, rows_per_frame = vat_layout(vertex_count)
+    frames = list(range(scene.frame_start, scene.frame_end + 1))
+    
+    positions = np.zeros((len(frames), rows_per_frame * width, 4), dtype=np.float32)
+    normals = np.zeros_like(positions)
+    for index, frame in enumerate(frames):
+        scene.frame_set(frame)
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        start = 0
+        for obj in meshes:
+            evaluated = obj.evaluated_get(depsgraph)
+            mesh = evaluated.to_mesh()
+            frame_positions, frame_normals = read_vertex_data(mesh)
+            end = start + len(frame_positions)
+            positions[index, start:end, :3] = frame_positions
+            positions[index, start:end, 3] = 1.0
+            normals[index, start:end, :3] = frame_normals
+            evaluated.to_mesh_clear()
+            start = end
+    
+    height = len(frames) * rows_per_frame
+    for kind, data in (("position", positions), ("normal", normals)):
+        write_ktx2(
+            f"{base_path}-vat-{kind}.ktx2", VK_FORMAT_R16G16B16A16_SFLOAT, width, height,
+            [data.astype(np.float16).tobytes()], uncompressed_dfd(4, half_float=True), 8,
+            key_values={"KTXwriter": "MetalMan export_vendor_animations"}
+        )
+    
+    # Static base mesh: first-frame pose baked in, skeleton and animation removed
+    scene.frame_set(scene.frame_start)
+    for obj in meshes:
+        with bpy.context.temp_override(object=obj, active_object=obj):
+            for modifier in [m for m in obj.modifiers if m.type == 'ARMATURE']:
+                bpy.ops.object.modifier_apply(modifier=modifier.name)
+        world = obj.matrix_world.copy()
+        obj.parent = None
+        obj.matrix_world = world
+    bpy.data.objects.remove(armature, do_unlink=True)
+    add_vat_uvs(meshes, width)
+    export_usdz(f"{base_path}-vat-base.usdz")
+    
+    name = os.path.basename(base_path)
+    with open(f"{base_path}-vat.json", 'w') as f:
+        json.dump({
+            "name": name,
+            "vertexCount": vertex_count,
+            "width": width,
+            "height": height,
+            "rowsPerFrame": rows_per_frame,
+            "frameCount": len(frames),
+            "fps": fps,
+            "duration": (scene.frame_end - scene.frame_start) / fps,
+            "positionTexture": f"{name}-vat-position.ktx2",
+            "normalTexture": f"{name}-vat-normal.ktx2",
+            "baseMesh": f"{name}-vat-base.usdz"
+        }, f, indent=2)
+    print(f"  Baked vertex animation: {vertex_count} vertices x {len(frames)} frames "
+          f"({width}x{height} texels)")
+
+
+def process_vendor_fbx(fbx_file, output_dir, skip_existing=True, lod_clips=None):
     """
     Process a single vendor FBX file:
     1. Clear scene
     2. Import the FBX (contains model + animation)
     3. Set up frame range from the action
-    4. Export as USDZ
+    4. Export as USDZ (plus LODs if the clip is in lod_clips, collision proxies for the
+       LOD source clips, and the clip sidecars)
+    5. Bake vertex animation textures (if BAKE_VERTEX_ANIMATION)
     
     Returns: True if exported, False if failed, None if skipped
     """
@@ -182,10 +352,14 @@ def process_vendor_fbx(fbx_file, output_dir, skip_existing=True):
     clean_name = clean_filename(fbx_name)
     output_path = os.path.join(output_dir, f"{clean_name}.usdz")
     
-    # Skip if output already exists
+    # Skip if output already exists, unless it is a LOD source whose LODs are missing
+    lods_only = False
     if skip_existing and os.path.exists(output_path):
-        print(f"  SKIPPED: {clean_name}.usdz already exists")
-        return None
+        if not (lod_clips and clean_name in lod_clips and lods_missing(output_path, LOD_LEVELS)):
+            print(f"  SKIPPED: {clean_name}.usdz already exists")
+            return None
+        print(f"  {clean_name}.usdz already exists, generating its missing LODs")
+        lods_only = True
     
     print(f"\n{'='*60}")
     print(f"Processing: {fbx_name}")
@@ -249,14 +423,47 @@ def process_vendor_fbx(fbx_file, output_dir, skip_existing=True):
     # Export to USDZ
     print(f"  Exporting to: {output_path}")
     try:
+        if lods_only:
+            export_lods(output_path, LOD_LEVELS, export_usdz)
+            return True
         export_usdz(output_path)
         print(f"  SUCCESS: Exported {clean_name}.usdz")
+        if lod_clips and clean_name in lod_clips:
+            export_lods(output_path, LOD_LEVELS, export_usdz)
+        if EXPORT_COLLISION_PROXIES and clean_name in LOD_SOURCE_CLIPS and get_armature():
+            export_collision_proxies(get_armature(), output_path)
+        clip_armature = get_armature()
+        if clip_armature and (EXPORT_EVENT_TRACKS or EXPORT_CLIP_BOUNDS):
+            export_clip_metadata(clip_armature, output_path, EXPORT_EVENT_TRACKS, EXPORT_CLIP_BOUNDS,
+                                     bone_clips=False)
+        if clip_armature and BAKE_VERTEX_ANIMATION:
+            export_vertex_animation(clip_armature, output_path)
         return True
     except Exception as e:
         print(f"  ERROR during export: {e}")
         return False
 
 
+def find_fbx_files():
+    """All vendor FBX files in SOURCE_DIR, sorted"""
+    return sorted(
+        os.path.join(SOURCE_DIR, filename) for filename in os.listdir(SOURCE_DIR)
+        if filename.lower().endswith('.fbx')
+    )
+
+
+def run_worker():
+    """Worker mode for export_supervisor.py (protocol in Scripts/export_worker.py)"""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    lod_clips = LOD_SOURCE_CLIPS if GENERATE_LODS else None
+    
+    serve_worker(
+        lambda: (find_fbx_files(), []),
+        lambda path, force: process_vendor_fbx(path, OUTPUT_DIR, SKIP_EXISTING and not force,
+                                               lod_clips=lod_clips)
+    )
+
+
 def main():
     """Main function to process all vendor FBX files"""
     print("\n" + "="*60)
@@ -272,18 +479,17 @@ def main():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     
     # Find all FBX files
-    fbx_files = []
-    for filename in os.listdir(SOURCE_DIR):
-        if filename.lower().endswith('.fbx'):
-            fbx_files.append(os.path.join(SOURCE_DIR, filename))
-    
-    fbx_files.sort()
+    fbx_files = find_fbx_files()
     
     print(f"\nFound {len(fbx_files)} FBX files:")
     for f in fbx_files:
         print(f"  - {os.path.basename(f)}")
     print(f"\nOutput directory: {OUTPUT_DIR}")
     print(f"Skip existing: {SKIP_EXISTING}")
+    print(f"Generate LODs: {GENERATE_LODS} {LOD_SOURCE_CLIPS if GENERATE_LODS else ''}")
+    print(f"Export event tracks: {EXPORT_EVENT_TRACKS}")
+    print(f"Export clip bounds: {EXPORT_CLIP_BOUNDS}")
+    print(f"Bake vertex animation: {BAKE_VERTEX_ANIMATION}")
     
     # Process each FBX file
     success_count = 0
@@ -292,7 +498,8 @@ def main():
     
     for fbx_file in fbx_files:
         try:
-            result = process_vendor_fbx(fbx_file, OUTPUT_DIR, SKIP_EXISTING)
+            result = process_vendor_fbx(fbx_file, OUTPUT_DIR, SKIP_EXISTING,
+                                        lod_clips=LOD_SOURCE_CLIPS if GENERATE_LODS else None)
             if result is True:
                 success_count += 1
             elif result is None:
@@ -324,5 +531,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if is_worker():
+        run_worker()
+    else:
+        main()
 
@@ -0,0 +1,213 @@
+"""
+Export Watch: re-export animation FBX files as they change
+
+Keeps a warm Blender worker per exporter (the same worker mode that
+export_supervisor.py drives) and polls animation_source/ and its
+subfolders for changed FBX files. Once a file has stopped changing for
+DEBOUNCE_SECONDS it is sent to the exporter that owns it, so an edited clip
+is re-exported in seconds without starting Blender or touching the other
+clips. Editing a character mesh FBX re-exports every clip of that exporter.
+
+Results are appended to the supervisor's journal, so a later
+export_supervisor.py run does not export the same files again.
+
+Usage (plain Python 3, not inside Blender):
+    python export_watch.py                  # player, enemy and vendor exporters
+    python export_watch.py enemy            # only the enemy exporter
+    python export_watch.py player --interval 0.5 --debounce 1
+
+Stop with Ctrl+C.
+
+Requirements:
+- Python 3.8+
+- Blender 3.6+ at BLENDER_PATH in export_supervisor.py
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+from export_supervisor import (
+    BLENDER_PATH, EXPORTERS, FILE_TIMEOUT, JOURNAL_DIR, RECYCLE_RSS_MB, STARTUP_TIMEOUT,
+    Worker, append_journal, source_mtime
+)
+
+# ============================================================================
+# CONFIGURATION - Modify these paths as needed
+# ============================================================================
+
+# Folders watched for changed FBX files (recursively)
+WATCH_DIRS = ["/Users/maxdavis/Projects/MetalMan/animation_source"]
+
+# Seconds between scans of the watched folders
+POLL_INTERVAL = 1.0
+
+# Seconds a file has to stay unchanged before it is exported
+# (editors and copies write large FBX files in several steps)
+DEBOUNCE_SECONDS = 2.0
+
+# ============================================================================
+# WATCHING
+# ============================================================================
+
+def scan(directories):
+    """(mtime, size) of every FBX file under the directories"""
+    files = {}
+    for directory in directories:
+        for root, _, filenames in os.walk(directory):
+            for filename in filenames:
+                if filename.lower().endswith('.fbx'):
+                    path = os.path.join(root, filename)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files[path] = (stat.st_mtime, stat.st_size)
+    return files
+
+
+class WarmExporter:
+    """An exporter's worker kept running between exports, plus the files it owns"""
+
+    def __init__(self, name, script):
+        self.name = name
+        self.script = script
+        self.worker = None
+        self.files = set()
+        self.dependencies = set()
+
+    def start(self):
+        """Start the worker (if needed) and refresh the files it exports"""
+        if self.worker is None:
+            print(f"[{self.name}] Starting worker...")
+            self.worker = Worker(self.script)
+        listing = self.worker.request({"command": "list"}, STARTUP_TIMEOUT)
+        if not isinstance(listing, dict):
+            print(f"[{self.name}] ERROR: worker did not start ({listing})")
+            self.stop(kill=True)
+            return False
+        self.files = set(listing["files"])
+        self.dependencies = set(listing.get("dependencies", []))
+        print(f"[{self.name}] Ready ({len(self.files)} files)")
+        return True
+
+    def export(self, path, timeout):
+        """Force-export one file; returns its status"""
+        if self.worker is None and not self.start():
+            return "crashed"
+        reply = self.worker.request({"command": "export", "file": path, "force": True}, timeout)
+        if not isinstance(reply, dict):
+            # Timed out or crashed: the next export gets a fresh worker
+            self.stop(kill=True)
+            return reply
+        if self.worker.rss_mb() > RECYCLE_RSS_MB:
+            print(f"[{self.name}] Recycling worker (memory)")
+            self.stop()
+        return reply["status"]
+
+    def stop(self, kill=False):
+        if self.worker is not None:
+            if kill:
+                self.worker.kill()
+            else:
+                self.worker.stop()
+            self.worker = None
+
+
+def affected(exporters, path):
+    """(exporter, file) pairs to re-export after a change to path"""
+    jobs = []
+    for exporter in exporters:
+        if path in exporter.dependencies:
+            jobs.extend((exporter, file) for file in sorted(exporter.files))
+        elif path in exporter.files:
+            jobs.append((exporter, path))
+    return jobs
+
+
+def watch(names, interval=POLL_INTERVAL, debounce=DEBOUNCE_SECONDS, timeout=FILE_TIMEOUT):
+    """Watch WATCH_DIRS and re-export changed files until interrupted"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    exporters = [WarmExporter(name, os.path.join(script_dir, EXPORTERS[name])) for name in names]
+    for exporter in exporters:
+        exporter.start()
+    os.makedirs(JOURNAL_DIR, exist_ok=True)
+
+    known = scan(WATCH_DIRS)
+    changed = {}
+    print(f"\nWatching {len(known)} FBX files in {', '.join(WATCH_DIRS)} (Ctrl+C to stop)")
+
+    try:
+        while True:
+            time.sleep(interval)
+            current = scan(WATCH_DIRS)
+            now = time.time()
+            for path, state in current.items():
+                if known.get(path) != state:
+                    changed[path] = now
+            known = current
+
+            ready = sorted(path for path, when in changed.items() if now - when >= debounce)
+            if not ready:
+                continue
+            for path in ready:
+                del changed[path]
+
+            # New files are not in any listing yet
+            if any(not affected(exporters, path) for path in ready):
+                for exporter in exporters:
+                    exporter.start()
+
+            jobs = []
+            for path in ready:
+                jobs.extend(job for job in affected(exporters, path) if job not in jobs)
+            for exporter, path in jobs:
+                if path not in known:
+                    continue
+                print(f"\n[{exporter.name}] {os.path.basename(path)} changed, exporting...")
+                started = time.time()
+                status = exporter.export(path, timeout)
+                seconds = round(time.time() - started, 1)
+                append_journal(os.path.join(JOURNAL_DIR, f"{exporter.name}.jsonl"), {
+                    "file": path,
+                    "mtime": source_mtime(path),
+                    "status": status,
+                    "seconds": seconds,
+                    "time": datetime.now().isoformat(timespec="seconds"),
+                })
+                print(f"[{exporter.name}] -> {status} ({seconds}s)")
+    except KeyboardInterrupt:
+        print("\nStopping workers...")
+    finally:
+        for exporter in exporters:
+            exporter.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-export animation FBX files as they change")
+    parser.add_argument("exporters", nargs="*", metavar="exporter",
+                        help=f"exporters to watch for ({', '.join(sorted(EXPORTERS))}; default all)")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL, help="seconds between scans")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_SECONDS,
+                        help="seconds a file must stay unchanged before it is exported")
+    parser.add_argument("--timeout", type=float, default=FILE_TIMEOUT, help="seconds allowed per file")
+    args = parser.parse_args()
+    unknown = [name for name in args.exporters if name not in EXPORTERS]
+    if unknown:
+        parser.error(f"unknown exporter: {', '.join(unknown)}")
+
+    if not os.path.exists(BLENDER_PATH):
+        print(f"ERROR: Blender not found: {BLENDER_PATH}")
+        sys.exit(1)
+    missing = [directory for directory in WATCH_DIRS if not os.path.isdir(directory)]
+    if missing:
+        print(f"ERROR: Watch folder not found: {', '.join(missing)}")
+        sys.exit(1)
+
+    watch(args.exporters or sorted(EXPORTERS), args.interval, args.debounce, args.timeout)
+
+
+if __name__ == "__main__":
+    main()
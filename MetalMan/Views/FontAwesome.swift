@@ -24,8 +24,11 @@ class FontAwesomeLoader {
     private var isLoaded = false
     private var loadedFontName: String?
     
-    /// Font file names to try loading (without extension)
+    /// Font file names to try loading (without extension).
+    /// The subset face, written into the bundle by the "Subset Fonts" build phase
+    /// (Scripts/subset_fonts.py), only holds the FAIcon glyphs.
     private let fontFileNames = [
+        "Font Awesome 7 Free-Solid-900-subset",
         "Font Awesome 7 Free-Solid-900",
         "Font Awesome 6 Free-Solid-900",
         "FontAwesome",
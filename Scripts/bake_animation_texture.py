@@ -0,0 +1,216 @@
+"""
+Animation Texture Baker for MetalMan
+====================================
+Bakes skeletal clips into one half-float bone-matrix texture, so crowds of
+enemies can be skinned on the GPU from a clip row range and frame index
+instead of every AnimatedEnemy interpolating its clip on the CPU and
+uploading a palette each frame.
+
+Texture layout (RGBA16F):
+- one row per frame, clips stacked top to bottom, sampled at a fixed FPS
+- three texels per bone holding the top three rows of its model-space
+  (armature-space) matrix: texel 3 * bone + r = (m[r][0], m[r][1], m[r][2], m[r][3])
+The shader rebuilds the affine matrix and applies the skeleton's inverse
+bind matrices as the CPU skinning path does.
+
+Input is JSON clips in the export_animation.py format: clips exported with
+Scripts/export_animation.py, or the `-clip.json` sidecars that
+export_enemy_animations.py writes next to each enemy USDZ when
+EXPORT_BONE_CLIPS is enabled. All clips in one texture must share a skeleton.
+
+Outputs:
+- <name>.ktx2 - the bone-matrix texture (width 3 x bones, height = total frames)
+- <name>.json - manifest with the bone names, FPS and each clip's row range
+
+Usage:
+    python bake_animation_texture.py ../MetalMan/EnemyAnimations --name enemy_bones
+    python bake_animation_texture.py ../MetalMan/Animations/Walking_animation.json --fps 30
+
+Requirements:
+- Python 3.9+ with NumPy (pip install numpy)
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from ktx2 import VK_FORMAT_R16G16B16A16_SFLOAT, uncompressed_dfd, write_ktx2
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+OUTPUT_DIR = os.path.join(PROJECT_DIR, "MetalMan", "EnemyAnimations")
+OUTPUT_NAME = "enemy_bone_texture"
+
+# Rows per second of animation
+BAKE_FPS = 30
+
+# Filename suffixes of JSON clips picked up when scanning a folder
+# (the suffix is dropped from the clip name in the manifest)
+CLIP_SUFFIXES = ("-clip.json", "_animation.json")
+
+# Largest finite half-float value
+HALF_MAX = 65504.0
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def find_clips(paths):
+    """Expand files and folders into a sorted list of JSON clip paths"""
+    clips = []
+    for path in paths:
+        if os.path.isdir(path):
+            clips.extend(
+                os.path.join(path, filename) for filename in os.listdir(path)
+                if filename.endswith(CLIP_SUFFIXES)
+            )
+        else:
+            clips.append(path)
+    return sorted(clips)
+
+
+def clip_name(path):
+    """Manifest name of a clip file (filename without the clip suffix)"""
+    filename = os.path.basename(path)
+    for suffix in CLIP_SUFFIXES:
+        if filename.endswith(suffix):
+            return filename[:-len(suffix)]
+    return os.path.splitext(filename)[0]
+
+
+def load_clip(path):
+    """
+    Load a JSON clip.
+
+    Returns (bones, times, local, duration) where bones is the bone list from
+    the file, times is (K,) and local is (K, B, 4, 4) row-major local matrices.
+    """
+    with open(path) as f:
+        clip = json.load(f)
+
+    times = np.array([keyframe["time"] for keyframe in clip["keyframes"]], dtype=np.float64)
+    # boneTransforms are column-major; reshape gives [column][row], so transpose
+    local = np.array([keyframe["boneTransforms"] for keyframe in clip["keyframes"]], dtype=np.float64)
+    local = local.reshape(len(times), -1, 4, 4).transpose(0, 1, 3, 2)
+    return clip["bones"], times, local, clip["duration"]
+
+
+def resample(times, local, duration, fps):
+    """
+    Sample local matrices at a fixed rate, blending neighbouring keyframes
+    component-wise like lerpMatrix in the runtime.
+
+    Returns (F, B, 4, 4) for frames 0, 1/fps, ... up to the clip duration.
+    """
+    frame_count = max(int(round(duration * fps)) + 1, 1)
+    if len(times) == 1:
+        return np.repeat(local, frame_count, axis=0)
+    sample_times = np.minimum(np.arange(frame_count) / fps, times[-1])
+
+    next_index = np.clip(np.searchsorted(times, sample_times, side='right'), 1, len(times) - 1)
+    prev_index = next_index - 1
+    span = times[next_index] - times[prev_index]
+    t = np.where(span > 1e-6, (sample_times - times[prev_index]) / np.maximum(span, 1e-6), 0.0)
+    t = np.clip(t, 0.0, 1.0)[:, None, None, None]
+    return local[prev_index] * (1.0 - t) + local[next_index] * t
+
+
+def model_space(local, parents):
+    """Compose local matrices down the hierarchy (parents precede children)"""
+    world = np.empty_like(local)
+    for bone, parent in enumerate(parents):
+        if parent < 0:
+            world[:, bone] = local[:, bone]
+        else:
+            world[:, bone] = world[:, parent] @ local[:, bone]
+    return world
+
+# ============================================================================
+# BAKING
+# ============================================================================
+
+def bake_animation_texture(clip_paths, output_dir=OUTPUT_DIR, name=OUTPUT_NAME, fps=BAKE_FPS):
+    """Bake clips into <name>.ktx2 and write the <name>.json row manifest"""
+    if not clip_paths:
+        raise ValueError("No clips to bake")
+
+    bone_names = None
+    parents = None
+    rows = []
+    clips = {}
+    row = 0
+
+    for path in clip_paths:
+        bones, times, local, duration = load_clip(path)
+        names = [bone["name"] for bone in bones]
+        if bone_names is None:
+            bone_names = names
+            parents = [bone["parentIndex"] for bone in bones]
+        elif names != bone_names:
+            raise ValueError(f"{path} uses a different skeleton than {clip_paths[0]}")
+
+        frames = model_space(resample(times, local, duration, fps), parents)
+        # Top three rows of each matrix: (F, B, 3, 4) -> (F, 3B, 4) texels
+        rows.append(frames[:, :, :3, :].reshape(len(frames), -1, 4))
+
+        name_key = clip_name(path)
+        clips[name_key] = {"firstRow": row, "frameCount": len(frames), "duration": duration}
+        row += len(frames)
+        print(f"  {name_key}: {len(times)} keys -> {len(frames)} rows")
+
+    data = np.concatenate(rows, axis=0)
+    largest = float(np.abs(data).max())
+    if largest > HALF_MAX:
+        raise ValueError(f"Bone matrix value {largest:.1f} does not fit a half float")
+    texels = data.astype(np.float16)
+    error = float(np.abs(texels.astype(np.float64) - data).max())
+
+    height, width = texels.shape[:2]
+    os.makedirs(output_dir, exist_ok=True)
+    texture_file = f"{name}.ktx2"
+    write_ktx2(
+        os.path.join(output_dir, texture_file), VK_FORMAT_R16G16B16A16_SFLOAT, width, height,
+        [texels.tobytes()], uncompressed_dfd(4, half_float=True), 8,
+        key_values={"KTXwriter": "MetalMan bake_animation_texture"}
+    )
+
+    manifest = {
+        "texture": texture_file,
+        "width": width,
+        "height": height,
+        "fps": fps,
+        "texelsPerBone": 3,
+        "boneCount": len(bone_names),
+        "bones": bone_names,
+        "clips": clips,
+    }
+    manifest_path = os.path.join(output_dir, f"{name}.json")
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"\nBaked {len(clips)} clips into {width}x{height} RGBA16F "
+          f"({texels.nbytes / 1024:.0f} KB), max half-float error {error:.4f}")
+    print(f"Texture: {os.path.join(output_dir, texture_file)}")
+    print(f"Manifest: {manifest_path}")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake JSON skeletal clips into a bone-matrix texture")
+    parser.add_argument("clips", nargs="+", help="JSON clip files or folders of -clip.json sidecars")
+    parser.add_argument("--output", default=OUTPUT_DIR, help="output folder")
+    parser.add_argument("--name", default=OUTPUT_NAME, help="base name of the texture and manifest")
+    parser.add_argument("--fps", type=int, default=BAKE_FPS, help="rows per second of animation")
+    args = parser.parse_args()
+
+    bake_animation_texture(find_clips(args.clips), args.output, args.name, args.fps)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Terrain Material Baker for MetalMan
+===================================
+Channel-packs the ground material sets in textures/ (rock_01-13,
+needles_01-04, dirt, gravel, grass, ...) and bundles them into texture arrays,
+so the terrain pass binds two array textures instead of three textures and
+samplers per material.
+
+For every material with a `_diffuse` and `_normal` map:
+- albedo RGB + `_height` in alpha -> one RGBA8 sRGB slice (alpha stays linear)
+- normal XY -> one RG8 slice (the shader reconstructs Z)
+
+Materials of the same size are grouped into one pair of KTX2 array
+textures, and terrain_materials.json maps each material to its array and
+slice index.
+
+Usage:
+    python bake_terrain_materials.py
+    python bake_terrain_materials.py --max-size 2048
+
+Requirements:
+- Python 3.9+ with NumPy and Pillow (pip install numpy pillow)
+"""
+
+import argparse
+import json
+import os
+
+from bake_textures import (
+    BAKER_VERSION,
+    build_mip_chain,
+    load_image,
+    nearest_power_of_two,
+    resize,
+)
+from ktx2 import VK_FORMAT_R8G8_UNORM, VK_FORMAT_R8G8B8A8_SRGB, uncompressed_dfd, write_ktx2
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SOURCE_DIR = os.path.join(PROJECT_DIR, "textures")
+OUTPUT_DIR = os.path.join(PROJECT_DIR, "textures", "baked")
+
+# Largest slice dimension (array textures hold every material at once)
+MAX_SIZE = 1024
+
+# Height stored for materials without a height map (mid-level)
+DEFAULT_HEIGHT = 0.5
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def find_material_sets(source_dir):
+    """
+    Group source maps by material name.
+
+    Returns {name: {"diffuse": path, "normal": path, "height": path or None}}
+    for every material that has both a diffuse and a normal map.
+    """
+    maps = {}
+    for filename in sorted(os.listdir(source_dir)):
+        stem, extension = os.path.splitext(filename)
+        if extension.lower() not in ('.jpg', '.jpeg', '.png'):
+            continue
+        name, _, suffix = stem.rpartition('_')
+        if suffix.lower() in ('diffuse', 'normal', 'height'):
+            maps.setdefault(name, {})[suffix.lower()] = os.path.join(source_dir, filename)
+
+    return {
+        name: {"diffuse": found["diffuse"], "normal": found["normal"], "height": found.get("height")}
+        for name, found in maps.items()
+        if "diffuse" in found and "normal" in found
+    }
+
+
+def load_material(paths, max_size):
+    """
+    Load one material set at a common power-of-two size.
+
+    Returns (albedo_height, normal) float working images: linear RGB with
+    height in alpha, and unit normal vectors.
+    """
+    albedo = load_image(paths["diffuse"], 'diffuse')
+    height, width = albedo.shape[:2]
+    size = (nearest_power_of_two(width, max_size), nearest_power_of_two(height, max_size))
+
+    albedo = resize(albedo, *size)
+    if paths["height"]:
+        albedo[:, :, 3] = resize(load_image(paths["height"], 'height'), *size)[:, :, 0]
+    else:
+        albedo[:, :, 3] = DEFAULT_HEIGHT
+
+    normal = resize(load_image(paths["normal"], 'normal'), *size)
+    return albedo, normal
+
+
+def write_array(path, vk_format, channels, srgb, size, slices):
+    """Write per-material mip chains as one KTX2 array texture (layers per level)"""
+    level_count = len(slices[0])
+    levels = [b''.join(chain[level] for chain in slices) for level in range(level_count)]
+    write_ktx2(
+        path, vk_format, size[0], size[1], levels,
+        uncompressed_dfd(channels, srgb), channels,
+        layer_count=len(slices),
+        key_values={"KTXwriter": f"MetalMan bake_terrain_materials v{BAKER_VERSION}"}
+    )
+
+# ============================================================================
+# BAKING
+# ============================================================================
+
+def bake_terrain_materials(source_dir=SOURCE_DIR, output_dir=OUTPUT_DIR, max_size=MAX_SIZE):
+    """Pack every material set and write the array textures and index manifest"""
+    materials = find_material_sets(source_dir)
+    print(f"Found {len(materials)} material sets in {source_dir}")
+
+    # Group materials by slice size
+    groups = {}
+    for name, paths in materials.items():
+        albedo, normal = load_material(paths, max_size)
+        size = (albedo.shape[1], albedo.shape[0])
+        group = groups.setdefault(size, {"names": [], "albedo": [], "normal": []})
+        group["names"].append(name)
+        group["albedo"].append(build_mip_chain(albedo, 'diffuse'))
+        group["normal"].append(build_mip_chain(normal, 'normal_xy'))
+        print(f"  {name}: {size[0]}x{size[1]}{'' if paths['height'] else ' (no height map)'}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = {"bakerVersion": BAKER_VERSION, "groups": [], "materials": {}}
+
+    for group_index, (size, group) in enumerate(sorted(groups.items(), reverse=True)):
+        albedo_file = f"terrain_albedo_height_{size[0]}x{size[1]}.ktx2"
+        normal_file = f"terrain_normal_{size[0]}x{size[1]}.ktx2"
+        write_array(os.path.join(output_dir, albedo_file), VK_FORMAT_R8G8B8A8_SRGB, 4, True,
+                    size, group["albedo"])
+        write_array(os.path.join(output_dir, normal_file), VK_FORMAT_R8G8_UNORM, 2, False,
+                    size, group["normal"])
+
+        manifest["groups"].append({
+            "width": size[0],
+            "height": size[1],
+            "albedoHeight": albedo_file,
+            "normal": normal_file,
+            "slices": group["names"],
+        })
+        for slice_index, name in enumerate(group["names"]):
+            manifest["materials"][name] = {
+                "group": group_index,
+                "slice": slice_index,
+                "hasHeight": materials[name]["height"] is not None,
+            }
+        print(f"Group {group_index}: {len(group['names'])} slices -> {albedo_file}, {normal_file}")
+
+    manifest_path = os.path.join(output_dir, "terrain_materials.json")
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"\n{len(materials)} materials in {len(groups)} array group(s)")
+    print(f"Manifest: {manifest_path}")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack terrain material sets into texture arrays")
+    parser.add_argument("--source", default=SOURCE_DIR, help="directory of source material maps")
+    parser.add_argument("--output", default=OUTPUT_DIR, help="output directory")
+    parser.add_argument("--max-size", type=int, default=MAX_SIZE, help="largest slice dimension")
+    args = parser.parse_args()
+
+    bake_terrain_materials(args.source, args.output, args.max_size)
+
+
+if __name__ == "__main__":
+    main()
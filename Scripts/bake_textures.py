@@ -0,0 +1,432 @@
+"""
+Texture Baker for MetalMan
+==========================
+Decodes each source image in textures/ once and writes a KTX2 container
+with a pre-built mip chain, so TextureGenerator can copy the levels straight
+into a MTLTexture at startup instead of decoding JPEGs and generating mips.
+
+- Sizes are rounded to the nearest power of two (capped at MAX_SIZE)
+- `_diffuse` maps are filtered in linear light and stored sRGB-encoded:
+  BC1 when opaque, BC3 when they have alpha (the foliage PNGs)
+- `_normal` maps are filtered as vectors and renormalized per mip, then
+  stored as two-channel BC5 (the shader reconstructs z)
+- `_height` maps and `_opacity`/`_mask` maps are stored single channel
+  (R8), filtered as linear data
+- With --uncompressed, diffuse and normal maps are stored RGBA8 instead
+
+Block compression uses bc_encoder.py; every mip level is decoded again to
+report its PSNR against the uncompressed level. Textures are baked in a
+process pool, one texture per worker.
+
+Each container is named after its source file including the extension
+(<name>.jpg -> baked/<name>.jpg.ktx2), so sources that differ only in their
+extension do not overwrite each other. A manifest.json next to the
+containers lists every texture with its format, size, mip count, PSNR and
+source hash. Unchanged sources are skipped on later runs.
+
+Usage:
+    python bake_textures.py                 # textures/ and LandscapeModels/textures/
+    python bake_textures.py --source ../MetalMan/LandscapeModels/textures --output ../MetalMan/LandscapeModels/textures/baked
+    python bake_textures.py --force --jobs 4
+    python bake_textures.py --uncompressed
+
+Requirements:
+- Python 3.9+ with NumPy and Pillow (pip install numpy pillow)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+import bc_encoder
+from ktx2 import (
+    VK_FORMAT_BC1_RGBA_SRGB_BLOCK,
+    VK_FORMAT_BC3_SRGB_BLOCK,
+    VK_FORMAT_BC5_UNORM_BLOCK,
+    VK_FORMAT_R8_UNORM,
+    VK_FORMAT_R8G8B8A8_SRGB,
+    VK_FORMAT_R8G8B8A8_UNORM,
+    block_compressed_dfd,
+    uncompressed_dfd,
+    write_ktx2,
+)
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Source images and output directory for the baked containers
+SOURCE_DIR = os.path.join(PROJECT_DIR, "textures")
+OUTPUT_DIR = os.path.join(PROJECT_DIR, "textures", "baked")
+LANDSCAPE_SOURCE_DIR = os.path.join(PROJECT_DIR, "MetalMan", "LandscapeModels", "textures")
+LANDSCAPE_OUTPUT_DIR = os.path.join(LANDSCAPE_SOURCE_DIR, "baked")
+
+# (source, output) folders baked when no --source is given
+BAKE_DIRS = [
+    (SOURCE_DIR, OUTPUT_DIR),
+    (LANDSCAPE_SOURCE_DIR, LANDSCAPE_OUTPUT_DIR),
+]
+
+# Largest dimension a baked texture may have
+MAX_SIZE = 2048
+
+# Block-compress diffuse (BC1/BC3) and normal (BC5) maps
+COMPRESS = True
+
+# Diffuse maps with any alpha below this are stored BC3 instead of BC1
+OPAQUE_ALPHA = 254.5 / 255.0
+
+# Worker processes for baking (None = one per CPU)
+JOBS = None
+
+# Bump when the baking output changes so existing containers are rebuilt
+BAKER_VERSION = 3
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+# ============================================================================
+# COLOR AND MIP HELPERS
+# ============================================================================
+
+def texture_kind(filename):
+    """Classify a texture as 'normal', 'height', 'mask' or 'diffuse' from its filename"""
+    name = os.path.splitext(filename)[0].lower()
+    if name.endswith('_normal'):
+        return 'normal'
+    if name.endswith('_height') or name.endswith('_displacement'):
+        return 'height'
+    if name.endswith('_opacity') or name.endswith('_mask'):
+        return 'mask'
+    return 'diffuse'
+
+
+def baked_name(filename):
+    """Container file name of a source image (the source name, extension included, plus .ktx2)"""
+    return filename + ".ktx2"
+
+
+def srgb_to_linear(values):
+    """Convert sRGB-encoded values in [0, 1] to linear light"""
+    return np.where(values <= 0.04045, values / 12.92, ((values + 0.055) / 1.055) ** 2.4)
+
+
+def linear_to_srgb(values):
+    """Convert linear light values in [0, 1] to sRGB encoding"""
+    values = np.clip(values, 0.0, 1.0)
+    return np.where(values <= 0.0031308, values * 12.92, 1.055 * values ** (1.0 / 2.4) - 0.055)
+
+
+def nearest_power_of_two(value, max_size=MAX_SIZE):
+    """Round a dimension to the nearest power of two, capped at max_size"""
+    power = 1 << max(0, round(np.log2(max(value, 1))))
+    return min(power, max_size)
+
+
+def resize(pixels, width, height):
+    """Resize a float image (H, W, C) with a Lanczos filter, channel by channel"""
+    if pixels.shape[1] == width and pixels.shape[0] == height:
+        return pixels
+    channels = [
+        np.asarray(Image.fromarray(np.ascontiguousarray(pixels[:, :, c])).resize((width, height), Image.LANCZOS))
+        for c in range(pixels.shape[2])
+    ]
+    return np.stack(channels, axis=2)
+
+
+def downsample(pixels):
+    """Halve a power-of-two float image with a 2x2 box filter"""
+    if pixels.shape[0] > 1:
+        pixels = (pixels[0::2] + pixels[1::2]) * 0.5
+    if pixels.shape[1] > 1:
+        pixels = (pixels[:, 0::2] + pixels[:, 1::2]) * 0.5
+    return pixels
+
+
+def mip_count(width, height):
+    """Number of levels in a full mip chain"""
+    return int(np.log2(max(width, height))) + 1
+
+
+def encode_unorm8(values):
+    """Quantize [0, 1] floats to uint8"""
+    return (np.clip(values, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+
+
+def load_image(path, kind):
+    """
+    Decode a source image into a float32 working array (H, W, C).
+
+    diffuse: linear-light RGB + alpha, normal: unit XYZ vectors,
+    height and mask: one linear channel.
+    """
+    image = Image.open(path)
+    if kind in ('height', 'mask'):
+        return np.asarray(image.convert('L'), dtype=np.float32)[:, :, None] / 255.0
+
+    rgba = np.asarray(image.convert('RGBA'), dtype=np.float32) / 255.0
+    if kind == 'normal':
+        return rgba[:, :, :3] * 2.0 - 1.0
+
+    rgba[:, :, :3] = srgb_to_linear(rgba[:, :, :3])
+    return rgba
+
+
+def encode_texels(pixels, kind):
+    """Encode a float working image as the uint8 texels (H, W, C) stored in the container"""
+    if kind in ('height', 'mask'):
+        return encode_unorm8(pixels)
+
+    if kind in ('normal', 'normal_xy'):
+        length = np.linalg.norm(pixels, axis=2, keepdims=True)
+        normals = pixels / np.maximum(length, 1e-8)
+        if kind == 'normal_xy':
+            # Two-channel normals; the shader reconstructs z = sqrt(1 - x^2 - y^2)
+            return encode_unorm8(normals[:, :, :2] * 0.5 + 0.5)
+        rgb = encode_unorm8(normals * 0.5 + 0.5)
+        alpha = np.full(rgb.shape[:2] + (1,), 255, dtype=np.uint8)
+        return np.concatenate([rgb, alpha], axis=2)
+
+    rgba = np.empty_like(pixels)
+    rgba[:, :, :3] = linear_to_srgb(pixels[:, :, :3])
+    rgba[:, :, 3] = pixels[:, :, 3]
+    return encode_unorm8(rgba)
+
+
+def encode_level(pixels, kind):
+    """Encode a float working image as the bytes stored in the container"""
+    return encode_texels(pixels, kind).tobytes()
+
+
+def mip_levels(pixels, kind):
+    """
+    Yield every mip level of a power-of-two working image, largest first.
+
+    Filtering happens in linear space: linear light for diffuse maps and
+    vector space for normal maps ('normal' or two-channel 'normal_xy'),
+    whose texels are renormalized per level.
+    """
+    for level in range(mip_count(pixels.shape[1], pixels.shape[0])):
+        if level > 0:
+            pixels = downsample(pixels)
+            if kind in ('normal', 'normal_xy'):
+                length = np.linalg.norm(pixels, axis=2, keepdims=True)
+                pixels = pixels / np.maximum(length, 1e-8)
+        yield pixels
+
+
+def build_mip_chain(pixels, kind):
+    """Build every mip level of a power-of-two working image; returns the encoded payloads, largest first"""
+    return [encode_level(level, kind) for level in mip_levels(pixels, kind)]
+
+
+def build_compressed_mip_chain(pixels, kind, bc_format):
+    """
+    Build every mip level and block-compress it.
+
+    Returns the level payloads (largest first) and the PSNR of each level
+    against its uncompressed texels.
+    """
+    channels = bc_encoder.FORMAT_CHANNELS[bc_format]
+    levels = []
+    psnrs = []
+    for level in mip_levels(pixels, kind):
+        texels = encode_texels(level, kind)
+        data = bc_encoder.encode(texels, bc_format)
+        decoded = bc_encoder.decode(data, texels.shape[1], texels.shape[0], bc_format)
+        levels.append(data)
+        psnrs.append(bc_encoder.psnr(texels[:, :, :channels], decoded))
+    return levels, psnrs
+
+# ============================================================================
+# BAKING
+# ============================================================================
+
+FORMATS = {
+    'diffuse': (VK_FORMAT_R8G8B8A8_SRGB, 4, True),
+    'normal': (VK_FORMAT_R8G8B8A8_UNORM, 4, False),
+    'height': (VK_FORMAT_R8_UNORM, 1, False),
+    'mask': (VK_FORMAT_R8_UNORM, 1, False),
+}
+
+# Block format -> (Vulkan format, sRGB)
+COMPRESSED_FORMATS = {
+    'bc1': (VK_FORMAT_BC1_RGBA_SRGB_BLOCK, True),
+    'bc3': (VK_FORMAT_BC3_SRGB_BLOCK, True),
+    'bc5': (VK_FORMAT_BC5_UNORM_BLOCK, False),
+}
+
+
+def block_format(kind, pixels):
+    """Block format for a texture, or None for textures stored uncompressed"""
+    if kind == 'diffuse':
+        return 'bc3' if pixels[:, :, 3].min() < OPAQUE_ALPHA else 'bc1'
+    if kind == 'normal':
+        return 'bc5'
+    return None
+
+
+def file_hash(path):
+    """SHA-1 of a file's contents"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def bake_texture(source_path, output_path, max_size=MAX_SIZE, compress=COMPRESS):
+    """
+    Bake one source image into a KTX2 container.
+
+    Returns the manifest entry describing the container.
+    """
+    filename = os.path.basename(source_path)
+    kind = texture_kind(filename)
+
+    pixels = load_image(source_path, kind)
+    height, width = pixels.shape[:2]
+    target_width = nearest_power_of_two(width, max_size)
+    target_height = nearest_power_of_two(height, max_size)
+    pixels = resize(pixels, target_width, target_height)
+
+    bc_format = block_format(kind, pixels) if compress else None
+    psnrs = []
+    if bc_format:
+        vk_format, srgb = COMPRESSED_FORMATS[bc_format]
+        # BC5 holds the x and y of the normal only
+        levels, psnrs = build_compressed_mip_chain(pixels, 'normal_xy' if kind == 'normal' else kind, bc_format)
+        dfd = block_compressed_dfd(bc_format, srgb)
+        block_bytes = bc_encoder.BLOCK_BYTES[bc_format]
+    else:
+        vk_format, channels, srgb = FORMATS[kind]
+        levels = build_mip_chain(pixels, kind)
+        dfd = uncompressed_dfd(channels, srgb)
+        block_bytes = channels
+
+    write_ktx2(
+        output_path, vk_format, target_width, target_height, levels, dfd, block_bytes,
+        key_values={"KTXwriter": f"MetalMan bake_textures v{BAKER_VERSION}"}
+    )
+
+    entry = {
+        "file": os.path.basename(output_path),
+        "kind": kind,
+        "format": bc_format or "uncompressed",
+        "vkFormat": vk_format,
+        "width": target_width,
+        "height": target_height,
+        "sourceWidth": width,
+        "sourceHeight": height,
+        "levels": len(levels),
+        "bytes": os.path.getsize(output_path),
+    }
+    if psnrs:
+        entry["psnr"] = round(psnrs[0], 2)
+        entry["minMipPsnr"] = round(min(psnrs), 2)
+    return entry
+
+
+def bake_job(job):
+    """Process pool entry point: bake one (source, output, max_size, compress) job"""
+    source_path, output_path, max_size, compress = job
+    return bake_texture(source_path, output_path, max_size, compress)
+
+
+def load_manifest(path):
+    """Load an existing manifest, or an empty one"""
+    if os.path.exists(path):
+        with open(path) as f:
+            manifest = json.load(f)
+        if manifest.get("bakerVersion") == BAKER_VERSION:
+            return manifest
+    return {"bakerVersion": BAKER_VERSION, "textures": {}}
+
+
+def bake_directory(source_dir, output_dir, max_size=MAX_SIZE, force=False, compress=COMPRESS, jobs=JOBS):
+    """Bake every image in source_dir in a process pool, skipping sources that have not changed"""
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, "manifest.json")
+    manifest = load_manifest(manifest_path)
+
+    sources = sorted(
+        f for f in os.listdir(source_dir)
+        if f.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    print(f"Found {len(sources)} source images in {source_dir}")
+
+    pending = []
+    skip_count = 0
+    for filename in sources:
+        source_path = os.path.join(source_dir, filename)
+        output_path = os.path.join(output_dir, baked_name(filename))
+        source_hash = file_hash(source_path)
+
+        entry = manifest["textures"].get(filename)
+        if (not force and entry and entry.get("sourceHash") == source_hash
+                and entry.get("maxSize") == max_size and entry.get("compressed") == compress
+                and os.path.exists(output_path)):
+            skip_count += 1
+            continue
+        pending.append((filename, source_hash, (source_path, output_path, max_size, compress)))
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = pool.map(bake_job, [job for _, _, job in pending])
+        for (filename, source_hash, _), entry in zip(pending, results):
+            entry["sourceHash"] = source_hash
+            entry["maxSize"] = max_size
+            entry["compressed"] = compress
+            manifest["textures"][filename] = entry
+            quality = f", PSNR {entry['psnr']:.1f} dB (worst mip {entry['minMipPsnr']:.1f})" if "psnr" in entry else ""
+            print(f"  {filename} -> {entry['file']} ({entry['kind']}, {entry['format']}, "
+                  f"{entry['width']}x{entry['height']}, {entry['levels']} mips, "
+                  f"{entry['bytes'] / 1024:.0f} KB{quality})")
+    baked_count = len(pending)
+
+    # Remove containers named by the old <stem>.ktx2 rule, which sources differing
+    # only in their extension shared
+    for filename in sources:
+        legacy_path = os.path.join(output_dir, os.path.splitext(filename)[0] + ".ktx2")
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
+
+    # Drop entries for sources that no longer exist
+    for filename in list(manifest["textures"]):
+        if filename not in sources:
+            del manifest["textures"][filename]
+
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    print(f"\nBaked: {baked_count}, unchanged: {skip_count}")
+    print(f"Manifest: {manifest_path}")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake source textures into mipmapped KTX2 containers")
+    parser.add_argument("--source", help="directory of source images (default: textures/ and LandscapeModels/textures/)")
+    parser.add_argument("--output", help="directory for .ktx2 files and manifest.json (default: <source>/baked)")
+    parser.add_argument("--max-size", type=int, default=MAX_SIZE, help="largest baked dimension")
+    parser.add_argument("--force", action="store_true", help="rebake every texture")
+    parser.add_argument("--uncompressed", action="store_true", help="store diffuse and normal maps as RGBA8")
+    parser.add_argument("--jobs", type=int, default=JOBS, help="worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    if args.source:
+        directories = [(args.source, args.output or os.path.join(args.source, "baked"))]
+    else:
+        directories = BAKE_DIRS
+    for source_dir, output_dir in directories:
+        bake_directory(source_dir, output_dir, args.max_size, args.force, not args.uncompressed, args.jobs)
+        print()
+
+
+if __name__ == "__main__":
+    main()
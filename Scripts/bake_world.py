@@ -0,0 +1,1386 @@
+"""
+World Geometry Baker for MetalMan
+=================================
+NumPy port of the deterministic world generation in
+World/GeometryGenerator.swift. It writes the TexturedVertex buffers and
+Collider arrays of the ground, trees, rocks and structures to one binary
+world file, so the game can memory-map the world instead of building every
+vertex on the main thread at launch.
+
+The port follows the Swift code statement by statement in float32, with
+sin/cos rounded from double precision (as Apple's libm does for Float), so
+the placement decisions and vertex counts match the Swift output. Placement
+runs in the generator's order (clearOccupiedAreas, then ground, trees,
+rocks, structures) against the same occupied-area rules; the occupied
+areas are kept in NumPy arrays, so each isPositionClear check is one
+vectorized comparison instead of a Swift loop.
+
+Output (keyed by seed and GENERATOR_VERSION):
+    world_s<seed>_v<version>.bin   the world file (see WORLD FILE below)
+    world_s<seed>_v<version>.json  section counts and hashes
+
+The world colliders and the tree camera blockers are also indexed in
+uniform XZ grids (spatial_grid.py), so collision and camera queries only
+visit nearby cells; --check compares the grids of the written file with
+brute-force queries.
+
+Each section records a SHA-1 of its bytes and a "quantized" SHA-1 of its
+values rounded to QUANTUM, which tolerates last-bit differences between
+libms when comparing against buffers dumped from the Swift generator.
+
+Seed 0 reproduces GeometryGenerator; other seeds offset the tree and rock
+placement sequences (base seeds 1 and 1000 in the Swift code).
+
+Usage:
+    python bake_world.py
+    python bake_world.py --seed 7 --output /tmp/world
+    python bake_world.py --summary        # print counts and hashes of an existing bake
+    python bake_world.py --check          # bake, then check the grids against brute force
+
+Requirements:
+- Python 3.9+ with NumPy (pip install numpy)
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+from spatial_grid import GRID_DTYPE, SpatialGrid, check_grid
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Directory for the baked world files
+OUTPUT_DIR = os.path.join(PROJECT_DIR, "MetalMan", "World", "baked")
+
+# Bump when the generation (or its port) changes so stale worlds are rejected
+GENERATOR_VERSION = 1
+
+# Rounding step for the quantized section hashes
+QUANTUM = 1e-3
+
+# Half the edge length of the ground (makeGroundMesh size); the grids cover it
+WORLD_HALF_SIZE = 100.0
+
+# Cell edge length of the collider and camera blocker grids
+GRID_CELL_SIZE = 8.0
+
+# Random queries per grid for --check
+CHECK_QUERIES = 2000
+
+# Character spawn exclusion radius (GeometryGenerator.spawnExclusionRadius)
+SPAWN_EXCLUSION_RADIUS = 8.0
+
+# MaterialIndex raw values used by the world geometry
+MATERIAL_GROUND = 0
+MATERIAL_TREE_TRUNK = 1
+MATERIAL_FOLIAGE = 2
+MATERIAL_ROCK = 3
+MATERIAL_POLE = 4
+MATERIAL_PATH = 6
+MATERIAL_STONE_WALL = 7
+MATERIAL_ROOF = 8
+MATERIAL_WOOD_PLANK = 9
+
+# ColliderType cases, in declaration order
+COLLIDER_CIRCLE = 0
+COLLIDER_BOX = 1
+COLLIDER_CLIMBABLE = 2
+
+# ============================================================================
+# RECORD LAYOUTS
+# ============================================================================
+
+# TexturedVertex as laid out by Swift/Metal: simd_float3 fields take 16 bytes
+VERTEX_DTYPE = np.dtype({
+    'names': ['position', 'normal', 'tangent', 'texCoord', 'materialIndex', 'padding'],
+    'formats': [('<f4', 3), ('<f4', 3), ('<f4', 3), ('<f4', 2), '<u4', '<u4'],
+    'offsets': [0, 16, 32, 48, 56, 60],
+    'itemsize': 64,
+})
+
+# Collider flattened to plain 32-bit fields (type is the ColliderType case index)
+COLLIDER_DTYPE = np.dtype([
+    ('type', '<u4'),
+    ('position', '<f4', 2),
+    ('radius', '<f4'),
+    ('halfExtents', '<f4', 2),
+    ('rotation', '<f4'),
+    ('height', '<f4'),
+    ('baseY', '<f4'),
+])
+
+# GeometryGenerator.CameraBlocker
+BLOCKER_DTYPE = np.dtype([
+    ('position', '<f4', 2),
+    ('radius', '<f4'),
+    ('height', '<f4'),
+])
+
+# Section name suffix -> record type
+SECTION_DTYPES = {
+    'vertices': VERTEX_DTYPE,
+    'colliders': COLLIDER_DTYPE,
+    'blockers': BLOCKER_DTYPE,
+    'params': GRID_DTYPE,
+    'cells': np.dtype('<u4'),
+    'items': np.dtype('<u4'),
+}
+
+# ============================================================================
+# FLOAT32 MATH
+# ============================================================================
+
+F = np.float32
+PI = F(np.pi)
+
+
+def sin(x):
+    """Float sin: evaluated in double precision and rounded to float32"""
+    return np.sin(np.asarray(x, dtype=np.float64)).astype(np.float32)[()]
+
+
+def cos(x):
+    """Float cos: evaluated in double precision and rounded to float32"""
+    return np.cos(np.asarray(x, dtype=np.float64)).astype(np.float32)[()]
+
+
+def vec(x, y, z):
+    """simd_float3 (or an array of them when the components are arrays)"""
+    x, y, z = np.broadcast_arrays(F(x) if np.isscalar(x) else x, F(y) if np.isscalar(y) else y,
+                                  F(z) if np.isscalar(z) else z)
+    return np.stack([x, y, z], axis=-1).astype(np.float32)
+
+
+def dot(a, b):
+    return (a * b).sum(axis=-1, dtype=np.float32)
+
+
+def length(v):
+    return np.sqrt(dot(v, v))
+
+
+def normalize(v):
+    return (v / length(v)[..., None]).astype(np.float32)
+
+
+def cross(a, b):
+    return np.stack([
+        a[..., 1] * b[..., 2] - a[..., 2] * b[..., 1],
+        a[..., 2] * b[..., 0] - a[..., 0] * b[..., 2],
+        a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0],
+    ], axis=-1).astype(np.float32)
+
+
+def seeded_random(seed):
+    """MathHelpers.seededRandom"""
+    x = sin(F(seed) * F(12.9898) + F(seed) * F(78.233)) * F(43758.5453)
+    return x - np.floor(x)
+
+# ============================================================================
+# TERRAIN AND PATHS
+# ============================================================================
+
+def terrain_height(x, z):
+    """Terrain.heightAt (scalars or arrays)"""
+    x = np.asarray(x, dtype=np.float32)
+    z = np.asarray(z, dtype=np.float32)
+    height = np.zeros(np.broadcast(x, z).shape, dtype=np.float32)
+
+    height += sin(x * F(0.02)) * cos(z * F(0.025)) * F(3.0)
+    height += sin(x * F(0.015) + F(1.0)) * sin(z * F(0.018) + F(0.5)) * F(2.0)
+    height += sin(x * F(0.05) + F(2.0)) * cos(z * F(0.06)) * F(1.0)
+    height += cos(x * F(0.07)) * sin(z * F(0.055) + F(1.5)) * F(0.8)
+    height += sin(x * F(0.15)) * cos(z * F(0.12)) * F(0.3)
+
+    dist_from_center = np.sqrt(x * x + z * z)
+    flatten_factor = np.maximum(F(0), F(1) - dist_from_center / F(15.0))
+    height *= (F(1) - flatten_factor * F(0.8))
+
+    # Flatten area for the cabin at (8, 10)
+    dx = x - F(8)
+    dz = z - F(10)
+    dist_from_cabin = np.sqrt(dx * dx + dz * dz)
+    cabin_flatten_factor = F(1.0) - (dist_from_cabin / F(12.0))
+    height = np.where(dist_from_cabin < F(12.0), height * (F(1) - cabin_flatten_factor), height)
+    return height.astype(np.float32)[()]
+
+
+def terrain_normal(x, z):
+    """Terrain.normalAt (scalars or arrays)"""
+    eps = F(0.5)
+    h_l = terrain_height(x - eps, z)
+    h_r = terrain_height(x + eps, z)
+    h_d = terrain_height(x, z - eps)
+    h_u = terrain_height(x, z + eps)
+    return normalize(vec(h_l - h_r, F(2.0) * eps, h_d - h_u))
+
+
+def is_on_path(x, z):
+    """GeometryGenerator.isOnPath (scalars or arrays)"""
+    x = np.asarray(x, dtype=np.float32)
+    z = np.asarray(z, dtype=np.float32)
+    path_width = F(2.5)
+
+    on_path = (np.abs(x) < path_width) & (np.abs(z) < F(60))
+    on_path |= (np.abs(z) < path_width) & (np.abs(x) < F(60))
+
+    diagonal = np.abs(x - z) / np.sqrt(F(2.0))
+    on_path |= (diagonal < path_width) & (x > F(-50)) & (x < F(50)) & (z > F(-50)) & (z < F(50))
+
+    winding = sin(z * F(0.08)) * F(15) + F(40)
+    on_path |= (np.abs(x - winding) < path_width) & (z > F(-40)) & (z < F(60))
+
+    dist = np.sqrt(x * x + z * z)
+    on_path |= np.abs(dist - F(35)) < path_width
+    return on_path[()]
+
+# ============================================================================
+# PLACEMENT
+# ============================================================================
+
+class Occupancy:
+    """GeometryGenerator's occupied areas, kept in arrays for vectorized checks"""
+
+    def __init__(self):
+        self.areas = np.zeros((0, 3), dtype=np.float32)
+
+    def is_clear(self, x, z, radius):
+        """isPositionClear: outside the spawn exclusion and every occupied area"""
+        if np.sqrt(x * x + z * z) < F(SPAWN_EXCLUSION_RADIUS) + radius:
+            return False
+        dx = self.areas[:, 0] - x
+        dz = self.areas[:, 1] - z
+        return not np.any(np.sqrt(dx * dx + dz * dz) < self.areas[:, 2] + radius)
+
+    def mark(self, x, z, radius):
+        self.areas = np.vstack([self.areas, np.array([[x, z, radius]], dtype=np.float32)])
+
+# ============================================================================
+# MESH BUILDING
+# ============================================================================
+
+def texcoords(u, v, count):
+    """(count, 2) texture coordinates from scalar or per-segment u and v"""
+    u, v = np.broadcast_arrays(np.asarray(u, dtype=np.float32), np.asarray(v, dtype=np.float32))
+    return np.broadcast_to(np.stack([u, v], axis=-1), (count, 2))
+
+
+class MeshBuilder:
+    """Accumulates TexturedVertex data; tangents are derived from normals when built"""
+
+    def __init__(self):
+        self.positions = []
+        self.normals = []
+        self.texcoords = []
+        self.materials = []
+        self.colliders = []
+        self.blockers = []
+
+    def add(self, positions, normals, uvs, material):
+        """
+        Append triangles given per-corner arrays.
+
+        positions/normals: list of (S, 3) arrays (one per emitted corner, in
+        emission order); uvs: list of (S, 2) arrays. Corners of a segment are
+        interleaved so the output order matches the Swift appends.
+        """
+        count = np.broadcast(*[p[..., 0] for p in positions]).shape
+        segments = int(np.prod(count)) if count else 1
+        position_array = np.stack([np.broadcast_to(p, count + (3,)).reshape(segments, 3) for p in positions], axis=1)
+        normal_array = np.stack([np.broadcast_to(n, count + (3,)).reshape(segments, 3) for n in normals], axis=1)
+        uv_array = np.stack([np.broadcast_to(np.reshape(t, (-1, 2)), (segments, 2)) for t in uvs], axis=1)
+        self.positions.append(position_array.reshape(-1, 3))
+        self.normals.append(normal_array.reshape(-1, 3))
+        self.texcoords.append(uv_array.reshape(-1, 2))
+        self.materials.append(np.full(segments * len(positions), material, dtype=np.uint32))
+
+    def collider(self, kind, x, z, radius=0, half_extents=(0, 0), rotation=0, height=0, base_y=0):
+        self.colliders.append((kind, (x, z), radius, half_extents, rotation, height, base_y))
+
+    def vertices(self):
+        """The accumulated vertices as a VERTEX_DTYPE array"""
+        vertices = np.zeros(sum(len(p) for p in self.positions), dtype=VERTEX_DTYPE)
+        if len(vertices) == 0:
+            return vertices
+        normals = np.concatenate(self.normals)
+        vertices['position'] = np.concatenate(self.positions)
+        vertices['normal'] = normals
+        vertices['tangent'] = compute_tangents(normals)
+        vertices['texCoord'] = np.concatenate(self.texcoords)
+        vertices['materialIndex'] = np.concatenate(self.materials)
+        return vertices
+
+    def collider_array(self):
+        return np.array(self.colliders, dtype=COLLIDER_DTYPE)
+
+    def blocker_array(self):
+        return np.array(self.blockers, dtype=BLOCKER_DTYPE)
+
+
+def compute_tangents(normals):
+    """GeometryGenerator.computeTangent / TexturedVertex.init for every normal"""
+    tangents = np.zeros_like(normals)
+    use_z = np.abs(normals[:, 0]) > F(0.9)
+    tangents[~use_z, 0] = 1
+    tangents[use_z, 2] = 1
+    return normalize(tangents - dot(tangents, normals)[:, None] * normals)
+
+# ============================================================================
+# PRIMITIVES
+# ============================================================================
+
+def add_tree_cylinder(mesh, pos, radius_bottom, radius_top, height, segments, material):
+    """addTaperedCylinder(at:radiusBottom:radiusTop:...) used by the trees"""
+    angle_step = PI * F(2) / F(segments)
+    i = np.arange(segments, dtype=np.float32)
+    angle1 = i * angle_step
+    angle2 = (i + F(1)) * angle_step
+    cos1, sin1, cos2, sin2 = cos(angle1), sin(angle1), cos(angle2), sin(angle2)
+
+    b1 = pos + vec(cos1 * radius_bottom, 0, sin1 * radius_bottom)
+    b2 = pos + vec(cos2 * radius_bottom, 0, sin2 * radius_bottom)
+    t1 = pos + vec(cos1 * radius_top, height, sin1 * radius_top)
+    t2 = pos + vec(cos2 * radius_top, height, sin2 * radius_top)
+    slope = (radius_bottom - radius_top) / height
+    n1 = normalize(vec(cos1, slope, sin1))
+    n2 = normalize(vec(cos2, slope, sin2))
+    u1 = i / F(segments)
+    u2 = (i + F(1)) / F(segments)
+
+    mesh.add([b1, t1, t2, b1, t2, b2], [n1, n1, n2, n1, n2, n2],
+             [texcoords(u1, 0, segments), texcoords(u1, 1, segments), texcoords(u2, 1, segments),
+              texcoords(u1, 0, segments), texcoords(u2, 1, segments), texcoords(u2, 0, segments)],
+             material)
+
+
+def cross_section(direction):
+    """Perpendicular (right, forward) vectors around a branch or root direction"""
+    up = vec(0, 1, 0)
+    if abs(dot(direction, up)) > F(0.9):
+        up = vec(1, 0, 0)
+    right = normalize(cross(direction, up))
+    forward = normalize(cross(right, direction))
+    return right, forward
+
+
+def add_tube(mesh, start, end, offsets1, offsets2, radius_start, radius_end, material):
+    """Four-sided tube between two points with separate end radii"""
+    b1 = start + offsets1 * radius_start
+    b2 = start + offsets2 * radius_start
+    t1 = end + offsets1 * radius_end
+    t2 = end + offsets2 * radius_end
+    n1 = normalize(offsets1)
+    n2 = normalize(offsets2)
+    mesh.add([b1, t1, t2, b1, t2, b2], [n1, n1, n2, n1, n2, n2],
+             [texcoords(0, 0, 4), texcoords(0, 1, 4), texcoords(1, 1, 4),
+              texcoords(0, 0, 4), texcoords(1, 1, 4), texcoords(1, 0, 4)],
+             material)
+
+
+def add_branch(mesh, start, direction, length_, radius):
+    """addBranch: tapered four-sided tube along a direction"""
+    direction = normalize(direction)
+    end = start + direction * length_
+    right, forward = cross_section(direction)
+
+    angle_step = PI * F(2) / F(4)
+    i = np.arange(4, dtype=np.float32)
+    angle1 = i * angle_step
+    angle2 = (i + F(1)) * angle_step
+    offsets1 = right * cos(angle1)[:, None] + forward * sin(angle1)[:, None]
+    offsets2 = right * cos(angle2)[:, None] + forward * sin(angle2)[:, None]
+    # The tip radius is radius * 0.3, applied as (offset * radius) * 0.3
+    b1 = start + offsets1 * radius
+    b2 = start + offsets2 * radius
+    t1 = end + offsets1 * radius * F(0.3)
+    t2 = end + offsets2 * radius * F(0.3)
+    n1 = normalize(offsets1)
+    n2 = normalize(offsets2)
+    mesh.add([b1, t1, t2, b1, t2, b2], [n1, n1, n2, n1, n2, n2],
+             [texcoords(0, 0, 4), texcoords(0, 1, 4), texcoords(1, 1, 4),
+              texcoords(0, 0, 4), texcoords(1, 1, 4), texcoords(1, 0, 4)],
+             MATERIAL_TREE_TRUNK)
+
+
+def add_root_segment(mesh, start, end, radius1, radius2, material):
+    """addRootSegment: tapered four-sided tube between two points"""
+    direction = normalize(end - start)
+    right, forward = cross_section(direction)
+
+    i = np.arange(4, dtype=np.float32)
+    angle1 = i / F(4) * PI * F(2)
+    angle2 = (i + F(1)) / F(4) * PI * F(2)
+    offsets1 = right * cos(angle1)[:, None] + forward * sin(angle1)[:, None]
+    offsets2 = right * cos(angle2)[:, None] + forward * sin(angle2)[:, None]
+    add_tube(mesh, start, end, offsets1, offsets2, radius1, radius2, material)
+
+
+def add_tree_roots(mesh, pos, trunk_radius, root_count, seed):
+    """addTreeRoots: curved roots radiating from the trunk base"""
+    for i in range(root_count):
+        angle = F(i) / F(root_count) * PI * F(2) + seeded_random(seed + i) * F(0.5)
+        root_length = trunk_radius * (F(2.0) + seeded_random(seed + 10 + i) * F(1.5))
+        root_radius = trunk_radius * (F(0.25) + seeded_random(seed + 20 + i) * F(0.15))
+        root_height = trunk_radius * (F(0.3) + seeded_random(seed + 30 + i) * F(0.2))
+
+        start_x = cos(angle) * trunk_radius * F(0.8)
+        start_z = sin(angle) * trunk_radius * F(0.8)
+        end_x = cos(angle) * root_length
+        end_z = sin(angle) * root_length
+
+        for segment in range(3):
+            t1 = F(segment) / F(3)
+            t2 = F(segment + 1) / F(3)
+            curve1 = F(1) - t1 * t1
+            curve2 = F(1) - t2 * t2
+            p1 = pos + vec(start_x + (end_x - start_x) * t1, root_height * curve1, start_z + (end_z - start_z) * t1)
+            p2 = pos + vec(start_x + (end_x - start_x) * t2, root_height * curve2, start_z + (end_z - start_z) * t2)
+            r1 = root_radius * (F(1) - t1 * F(0.7))
+            r2 = root_radius * (F(1) - t2 * F(0.7))
+            add_root_segment(mesh, p1, p2, r1, r2, MATERIAL_TREE_TRUNK)
+
+
+def add_trunk_base(mesh, pos, radius, height):
+    """addTrunkBase: flared rings at the bottom of the trunk"""
+    i = np.arange(8, dtype=np.float32)
+    angle1 = i / F(8) * PI * F(2)
+    angle2 = (i + F(1)) / F(8) * PI * F(2)
+    n1 = normalize(vec(cos(angle1), 0.3, sin(angle1)))
+    n2 = normalize(vec(cos(angle2), 0.3, sin(angle2)))
+
+    for ring in range(3):
+        t1 = F(ring) / F(3)
+        t2 = F(ring + 1) / F(3)
+        r1 = radius * (F(1.0) - t1 * t1 * F(0.4))
+        r2 = radius * (F(1.0) - t2 * t2 * F(0.4))
+        y1 = height * t1
+        y2 = height * t2
+
+        bl = pos + vec(cos(angle1) * r1, y1, sin(angle1) * r1)
+        br = pos + vec(cos(angle2) * r1, y1, sin(angle2) * r1)
+        tl = pos + vec(cos(angle1) * r2, y2, sin(angle1) * r2)
+        tr = pos + vec(cos(angle2) * r2, y2, sin(angle2) * r2)
+        mesh.add([bl, br, tr, bl, tr, tl], [n1, n2, n2, n1, n2, n1],
+                 [texcoords(0, t1, 8), texcoords(1, t1, 8), texcoords(1, t2, 8),
+                  texcoords(0, t1, 8), texcoords(1, t2, 8), texcoords(0, t2, 8)],
+                 MATERIAL_TREE_TRUNK)
+
+
+def add_foliage_sphere(mesh, center, radius, segments):
+    """addFoliageSphere: latitude/longitude sphere"""
+    lat_segments = segments
+    lon_segments = segments * 2
+    lat = np.arange(lat_segments, dtype=np.float32)[:, None]
+    lon = np.arange(lon_segments, dtype=np.float32)[None, :]
+    theta1 = lat / F(lat_segments) * PI
+    theta2 = (lat + F(1)) / F(lat_segments) * PI
+    phi1 = lon / F(lon_segments) * PI * F(2)
+    phi2 = (lon + F(1)) / F(lon_segments) * PI * F(2)
+
+    def sphere_point(theta, phi):
+        return center + vec(radius * sin(theta) * cos(phi), radius * cos(theta), radius * sin(theta) * sin(phi))
+
+    p1 = sphere_point(theta1, phi1)
+    p2 = sphere_point(theta2, phi1)
+    p3 = sphere_point(theta2, phi2)
+    p4 = sphere_point(theta1, phi2)
+    n1, n2, n3, n4 = (normalize(p - center) for p in (p1, p2, p3, p4))
+
+    count = lat_segments * lon_segments
+    u1 = np.broadcast_to(lon / F(lon_segments), (lat_segments, lon_segments)).ravel()
+    u2 = np.broadcast_to((lon + F(1)) / F(lon_segments), (lat_segments, lon_segments)).ravel()
+    v1 = np.broadcast_to(lat / F(lat_segments), (lat_segments, lon_segments)).ravel()
+    v2 = np.broadcast_to((lat + F(1)) / F(lat_segments), (lat_segments, lon_segments)).ravel()
+    mesh.add([p1, p2, p3, p1, p3, p4], [n1, n2, n3, n1, n3, n4],
+             [texcoords(u1, v1, count), texcoords(u1, v2, count), texcoords(u2, v2, count),
+              texcoords(u1, v1, count), texcoords(u2, v2, count), texcoords(u2, v1, count)],
+             MATERIAL_FOLIAGE)
+
+
+def add_cone(mesh, pos, radius, height, segments, material):
+    """addCone: open cone with flat-shaded sides"""
+    apex = pos + vec(0, height, 0)
+    i = np.arange(segments, dtype=np.float32)
+    angle1 = i / F(segments) * F(2) * PI
+    angle2 = (i + F(1)) / F(segments) * F(2) * PI
+    p1 = pos + vec(cos(angle1) * radius, 0, sin(angle1) * radius)
+    p2 = pos + vec(cos(angle2) * radius, 0, sin(angle2) * radius)
+    normal = normalize(cross(p2 - p1, apex - p1))
+    u1 = i / F(segments)
+    u2 = (i + F(1)) / F(segments)
+    mesh.add([p1, p2, np.broadcast_to(apex, p1.shape)], [normal, normal, normal],
+             [texcoords(u1, 1, segments), texcoords(u2, 1, segments), texcoords((u1 + u2) / F(2), 0, segments)],
+             material)
+
+
+def add_cylinder(mesh, pos, radius, height, segments, material):
+    """addCylinder: open cylinder"""
+    i = np.arange(segments, dtype=np.float32)
+    angle1 = i / F(segments) * F(2) * PI
+    angle2 = (i + F(1)) / F(segments) * F(2) * PI
+    x1, z1 = cos(angle1) * radius, sin(angle1) * radius
+    x2, z2 = cos(angle2) * radius, sin(angle2) * radius
+    n1 = normalize(vec(cos(angle1), 0, sin(angle1)))
+    n2 = normalize(vec(cos(angle2), 0, sin(angle2)))
+    u1 = i / F(segments)
+    u2 = (i + F(1)) / F(segments)
+
+    bl = pos + vec(x1, 0, z1)
+    br = pos + vec(x2, 0, z2)
+    tl = pos + vec(x1, height, z1)
+    tr = pos + vec(x2, height, z2)
+    mesh.add([bl, br, tr, bl, tr, tl], [n1, n2, n2, n1, n2, n1],
+             [texcoords(u1, 1, segments), texcoords(u2, 1, segments), texcoords(u2, 0, segments),
+              texcoords(u1, 1, segments), texcoords(u2, 0, segments), texcoords(u1, 0, segments)],
+             material)
+
+
+def add_box(mesh, center, size, material):
+    """addBox: six quads with outward normals"""
+    hw, hh, hd = size[0] / F(2), size[1] / F(2), size[2] / F(2)
+
+    def corner(x, y, z):
+        return center + vec(x, y, z)
+
+    faces = [
+        (corner(-hw, -hh, hd), corner(hw, -hh, hd), corner(hw, hh, hd), corner(-hw, hh, hd), vec(0, 0, 1)),
+        (corner(hw, -hh, -hd), corner(-hw, -hh, -hd), corner(-hw, hh, -hd), corner(hw, hh, -hd), vec(0, 0, -1)),
+        (corner(-hw, -hh, -hd), corner(-hw, -hh, hd), corner(-hw, hh, hd), corner(-hw, hh, -hd), vec(-1, 0, 0)),
+        (corner(hw, -hh, hd), corner(hw, -hh, -hd), corner(hw, hh, -hd), corner(hw, hh, hd), vec(1, 0, 0)),
+        (corner(-hw, hh, hd), corner(hw, hh, hd), corner(hw, hh, -hd), corner(-hw, hh, -hd), vec(0, 1, 0)),
+        (corner(-hw, -hh, -hd), corner(hw, -hh, -hd), corner(hw, -hh, hd), corner(-hw, -hh, hd), vec(0, -1, 0)),
+    ]
+    bl, br, tr, tl, normal = (np.stack(part) for part in zip(*faces))
+    mesh.add([bl, br, tr, bl, tr, tl], [normal] * 6,
+             [texcoords(0, 1, 6), texcoords(1, 1, 6), texcoords(1, 0, 6),
+              texcoords(0, 1, 6), texcoords(1, 0, 6), texcoords(0, 0, 6)],
+             material)
+
+
+def add_triangle(mesh, p0, p1, p2, material):
+    """addTriangle: one flat-shaded triangle"""
+    normal = normalize(cross(p1 - p0, p2 - p0))
+    mesh.add([p0, p1, p2], [normal] * 3,
+             [texcoords(0, 1, 1), texcoords(1, 1, 1), texcoords(0.5, 0, 1)], material)
+
+# ============================================================================
+# GROUND
+# ============================================================================
+
+def make_ground():
+    """makeGroundMesh: 50x50 terrain cells, path cells use the path material"""
+    mesh = MeshBuilder()
+    size = F(100)
+    resolution = 50
+    cell_size = size * F(2) / F(resolution)
+
+    grid = np.arange(resolution, dtype=np.float32)
+    x0 = -size + grid[None, :] * cell_size
+    z0 = -size + grid[:, None] * cell_size
+    x1 = x0 + cell_size
+    z1 = z0 + cell_size
+    x0, z0, x1, z1 = (np.broadcast_to(a, (resolution, resolution)) for a in (x0, z0, x1, z1))
+
+    p00 = vec(x0, terrain_height(x0, z0), z0)
+    p10 = vec(x1, terrain_height(x1, z0), z0)
+    p01 = vec(x0, terrain_height(x0, z1), z1)
+    p11 = vec(x1, terrain_height(x1, z1), z1)
+    n00, n10 = terrain_normal(x0, z0), terrain_normal(x1, z0)
+    n01, n11 = terrain_normal(x0, z1), terrain_normal(x1, z1)
+
+    on_path = is_on_path((x0 + x1) / F(2), (z0 + z1) / F(2)).ravel()
+    gx = np.broadcast_to(grid[None, :], (resolution, resolution)).ravel()
+    gz = np.broadcast_to(grid[:, None], (resolution, resolution)).ravel()
+    u0, v0 = gx * F(1.0), gz * F(1.0)
+    u1, v1 = u0 + F(1.0), v0 + F(1.0)
+    count = resolution * resolution
+
+    # Ground and path cells interleave, so build both and pick per cell
+    mesh.add([p00, p10, p11, p00, p11, p01], [n00, n10, n11, n00, n11, n01],
+             [texcoords(u0, v0, count), texcoords(u1, v0, count), texcoords(u1, v1, count),
+              texcoords(u0, v0, count), texcoords(u1, v1, count), texcoords(u0, v1, count)],
+             MATERIAL_GROUND)
+    mesh.materials[-1] = np.where(np.repeat(on_path, 6), MATERIAL_PATH, MATERIAL_GROUND).astype(np.uint32)
+    return mesh
+
+# ============================================================================
+# TREES
+# ============================================================================
+
+TREE_OAK, TREE_PINE, TREE_BIRCH, TREE_WILLOW, TREE_DEAD = range(5)
+
+
+def add_oak_tree(mesh, pos, height, radius, seed):
+    trunk_height = height * F(0.4)
+    trunk_radius = radius * F(0.15)
+
+    add_tree_roots(mesh, pos, trunk_radius, 4 + int(seeded_random(seed + 100) * F(3)), seed + 200)
+    add_trunk_base(mesh, pos, trunk_radius * F(1.4), trunk_radius * F(0.6))
+    add_tree_cylinder(mesh, pos, trunk_radius, trunk_radius * F(0.7), trunk_height, 8, MATERIAL_TREE_TRUNK)
+
+    branch_count = 3 + int(seeded_random(seed + 10) * F(3))
+    for i in range(branch_count):
+        angle = F(i) / F(branch_count) * PI * F(2) + seeded_random(seed + 20 + i) * F(0.5)
+        branch_y = trunk_height * (F(0.6) + seeded_random(seed + 30 + i) * F(0.3))
+        branch_length = radius * (F(0.4) + seeded_random(seed + 40 + i) * F(0.3))
+        add_branch(mesh, pos + vec(0, branch_y, 0), vec(cos(angle), 0.4, sin(angle)), branch_length,
+                   trunk_radius * F(0.4))
+
+    canopy_center = pos + vec(0, trunk_height + radius * F(0.5), 0)
+    add_foliage_sphere(mesh, canopy_center, radius * F(0.9), 10)
+
+    cluster_count = 5 + int(seeded_random(seed + 50) * F(4))
+    for i in range(cluster_count):
+        angle = F(i) / F(cluster_count) * PI * F(2) + seeded_random(seed + 60 + i) * F(0.8)
+        dist = radius * (F(0.5) + seeded_random(seed + 70 + i) * F(0.4))
+        y_offset = (seeded_random(seed + 80 + i) - F(0.5)) * radius * F(0.6)
+        cluster_radius = radius * (F(0.4) + seeded_random(seed + 90 + i) * F(0.3))
+        cluster_pos = canopy_center + vec(cos(angle) * dist, y_offset, sin(angle) * dist)
+        add_foliage_sphere(mesh, cluster_pos, cluster_radius, 8)
+
+    mesh.collider(COLLIDER_CIRCLE, pos[0], pos[2], trunk_radius + F(0.3))
+
+
+def add_pine_tree(mesh, pos, height, radius, seed):
+    trunk_height = height * F(0.85)
+    trunk_radius = radius * F(0.1)
+    add_tree_cylinder(mesh, pos, trunk_radius * F(1.2), trunk_radius * F(0.3), trunk_height, 6, MATERIAL_TREE_TRUNK)
+
+    layer_count = 5 + int(seeded_random(seed + 10) * F(3))
+    for i in range(layer_count):
+        t = F(i) / F(layer_count - 1)
+        layer_y = height * (F(0.15) + t * F(0.8))
+        layer_radius = radius * (F(1.0) - t * F(0.7)) * (F(0.9) + seeded_random(seed + 20 + i) * F(0.2))
+        layer_height = height * F(0.25) * (F(1.0) - t * F(0.5))
+        offset_x = (seeded_random(seed + 30 + i) - F(0.5)) * radius * F(0.1)
+        offset_z = (seeded_random(seed + 40 + i) - F(0.5)) * radius * F(0.1)
+        add_cone(mesh, pos + vec(offset_x, layer_y, offset_z), layer_radius, layer_height, 8, MATERIAL_FOLIAGE)
+
+    add_cone(mesh, pos + vec(0, height * F(0.9), 0), radius * F(0.15), height * F(0.15), 6, MATERIAL_FOLIAGE)
+    mesh.collider(COLLIDER_CIRCLE, pos[0], pos[2], trunk_radius + F(0.2))
+
+
+def add_birch_tree(mesh, pos, height, radius, seed):
+    trunk_height = height * F(0.7)
+    trunk_radius = radius * F(0.08)
+    add_tree_cylinder(mesh, pos, trunk_radius * F(1.1), trunk_radius * F(0.6), trunk_height, 6, MATERIAL_TREE_TRUNK)
+
+    branch_count = 4 + int(seeded_random(seed + 10) * F(4))
+    for i in range(branch_count):
+        angle = F(i) / F(branch_count) * PI * F(2) + seeded_random(seed + 15 + i)
+        branch_y = trunk_height * (F(0.5) + seeded_random(seed + 20 + i) * F(0.4))
+        branch_length = radius * (F(0.3) + seeded_random(seed + 25 + i) * F(0.4))
+        up_angle = F(0.3) + seeded_random(seed + 30 + i) * F(0.4)
+        branch_dir = vec(cos(angle), up_angle, sin(angle))
+        add_branch(mesh, pos + vec(0, branch_y, 0), branch_dir, branch_length, trunk_radius * F(0.3))
+
+        branch_end = pos + vec(0, branch_y, 0) + normalize(branch_dir) * branch_length
+        cluster_radius = radius * (F(0.3) + seeded_random(seed + 35 + i) * F(0.2))
+        add_foliage_sphere(mesh, branch_end, cluster_radius, 6)
+
+    add_foliage_sphere(mesh, pos + vec(0, trunk_height, 0), radius * F(0.5), 8)
+    mesh.collider(COLLIDER_CIRCLE, pos[0], pos[2], trunk_radius + F(0.2))
+
+
+def add_willow_tree(mesh, pos, height, radius, seed):
+    trunk_height = height * F(0.45)
+    trunk_radius = radius * F(0.12)
+    add_tree_cylinder(mesh, pos, trunk_radius * F(1.3), trunk_radius * F(0.8), trunk_height, 8, MATERIAL_TREE_TRUNK)
+
+    canopy_center = pos + vec(0, trunk_height + radius * F(0.3), 0)
+    add_foliage_sphere(mesh, canopy_center, radius * F(0.6), 8)
+
+    strand_count = 12 + int(seeded_random(seed + 10) * F(8))
+    for i in range(strand_count):
+        angle = F(i) / F(strand_count) * PI * F(2) + seeded_random(seed + 20 + i) * F(0.3)
+        start_radius = radius * (F(0.5) + seeded_random(seed + 30 + i) * F(0.3))
+        start_y = trunk_height + radius * (F(0.2) + seeded_random(seed + 40 + i) * F(0.3))
+        strand_start = pos + vec(cos(angle) * start_radius, start_y, sin(angle) * start_radius)
+        drop_length = radius * (F(0.8) + seeded_random(seed + 50 + i) * F(0.6))
+
+        segments = 4 + int(seeded_random(seed + 60 + i) * F(3))
+        for j in range(segments):
+            t = F(j) / F(segments)
+            drop_y = -drop_length * t * t
+            outward = radius * F(0.1) * t
+            sphere_pos = strand_start + vec(cos(angle) * outward, drop_y, sin(angle) * outward)
+            add_foliage_sphere(mesh, sphere_pos, radius * F(0.12) * (F(1.0) - t * F(0.5)), 4)
+
+    mesh.collider(COLLIDER_CIRCLE, pos[0], pos[2], trunk_radius + F(0.3))
+
+
+def add_dead_tree(mesh, pos, height, seed):
+    trunk_height = height * F(0.7)
+    trunk_radius = height * F(0.05)
+    add_tree_cylinder(mesh, pos, trunk_radius * F(1.5), trunk_radius * F(0.4), trunk_height, 6, MATERIAL_TREE_TRUNK)
+
+    branch_count = 4 + int(seeded_random(seed + 10) * F(4))
+    for i in range(branch_count):
+        angle = F(i) / F(branch_count) * PI * F(2) + seeded_random(seed + 20 + i) * F(0.8)
+        branch_y = trunk_height * (F(0.3) + seeded_random(seed + 30 + i) * F(0.6))
+        branch_length = height * (F(0.15) + seeded_random(seed + 40 + i) * F(0.2))
+        up_angle = F(-0.1) + seeded_random(seed + 50 + i) * F(0.5)
+        branch_dir = vec(cos(angle), up_angle, sin(angle))
+        add_branch(mesh, pos + vec(0, branch_y, 0), branch_dir, branch_length, trunk_radius * F(0.4))
+
+        if seeded_random(seed + 60 + i) > F(0.4):
+            sub_angle = angle + (seeded_random(seed + 70 + i) - F(0.5)) * F(1.0)
+            sub_length = branch_length * F(0.5)
+            branch_end = pos + vec(0, branch_y, 0) + normalize(branch_dir) * branch_length * F(0.7)
+            sub_dir = vec(cos(sub_angle), up_angle - F(0.2), sin(sub_angle))
+            add_branch(mesh, branch_end, sub_dir, sub_length, trunk_radius * F(0.2))
+
+    if seeded_random(seed + 80) > F(0.5):
+        top_pos = pos + vec(0, trunk_height, 0)
+        break_angle = seeded_random(seed + 90) * PI * F(2)
+        break_dir = vec(cos(break_angle), 0.3, sin(break_angle))
+        add_branch(mesh, top_pos, break_dir, height * F(0.1), trunk_radius * F(0.5))
+
+    mesh.collider(COLLIDER_CIRCLE, pos[0], pos[2], trunk_radius + F(0.2))
+
+
+def make_trees(occupancy, seed_offset=0):
+    """makeTreeMeshes: jittered 10 m grid of trees, plus camera blockers"""
+    mesh = MeshBuilder()
+    seed = 1 + seed_offset
+    for grid_x in range(-90, 91, 10):
+        for grid_z in range(-90, 91, 10):
+            if abs(grid_x) < 12 and abs(grid_z) < 12:
+                seed += 6
+                continue
+
+            x = F(grid_x) + (seeded_random(seed) - F(0.5)) * F(8)
+            z = F(grid_z) + (seeded_random(seed + 1) - F(0.5)) * F(8)
+            if is_on_path(x, z):
+                seed += 6
+                continue
+
+            height = F(4.0) + seeded_random(seed + 2) * F(4.0)
+            radius = F(1.2) + seeded_random(seed + 3) * F(1.5)
+            occupied_radius = radius * F(0.3) + F(1.0)
+            if not occupancy.is_clear(x, z, occupied_radius):
+                seed += 6
+                continue
+
+            if seeded_random(seed + 4) < F(0.75):
+                pos = vec(x, terrain_height(x, z), z)
+                type_rand = seeded_random(seed + 5)
+                if type_rand < F(0.35):
+                    tree_type = TREE_OAK
+                elif type_rand < F(0.6):
+                    tree_type = TREE_PINE
+                elif type_rand < F(0.8):
+                    tree_type = TREE_BIRCH
+                elif type_rand < F(0.95):
+                    tree_type = TREE_WILLOW
+                else:
+                    tree_type = TREE_DEAD
+
+                occupancy.mark(x, z, occupied_radius)
+                if tree_type == TREE_OAK:
+                    add_oak_tree(mesh, pos, height, radius, seed)
+                elif tree_type == TREE_PINE:
+                    add_pine_tree(mesh, pos, height, radius, seed)
+                elif tree_type == TREE_BIRCH:
+                    add_birch_tree(mesh, pos, height, radius, seed)
+                elif tree_type == TREE_WILLOW:
+                    add_willow_tree(mesh, pos, height, radius, seed)
+                else:
+                    add_dead_tree(mesh, pos, height, seed)
+
+                visual_radius = radius * F(0.3) if tree_type == TREE_DEAD else radius
+                mesh.blockers.append(((x, z), visual_radius, height))
+            seed += 6
+    return mesh
+
+# ============================================================================
+# ROCKS
+# ============================================================================
+
+def add_rock(mesh, pos, size):
+    """addRock: three rings of eight points and a peak, accent rocks, climbable collider"""
+    s = size
+    h = size * F(1.2)
+
+    def ring(points):
+        return pos + np.array(points, dtype=np.float32)
+
+    bottom = ring([
+        (-s * F(0.95), 0, 0), (-s * F(0.7), 0, -s * F(0.7)), (0, 0, -s * F(0.9)), (s * F(0.75), 0, -s * F(0.65)),
+        (s * F(0.85), 0, 0), (s * F(0.7), 0, s * F(0.7)), (0, 0, s * F(0.85)), (-s * F(0.65), 0, s * F(0.75)),
+    ])
+    mid_height = h * F(0.45)
+    middle = ring([
+        (-s * F(1.1), mid_height * F(0.9), 0), (-s * F(0.8), mid_height * F(1.1), -s * F(0.8)),
+        (0, mid_height, -s * F(1.05)), (s * F(0.85), mid_height * F(0.95), -s * F(0.75)),
+        (s * F(1.0), mid_height * F(1.05), 0), (s * F(0.8), mid_height * F(0.9), s * F(0.8)),
+        (0, mid_height * F(1.1), s * F(0.95)), (-s * F(0.75), mid_height, s * F(0.85)),
+    ])
+    upper_height = h * F(0.75)
+    upper = ring([
+        (-s * F(0.7), upper_height * F(0.95), 0), (-s * F(0.5), upper_height * F(1.05), -s * F(0.5)),
+        (0, upper_height, -s * F(0.65)), (s * F(0.55), upper_height * F(0.9), -s * F(0.45)),
+        (s * F(0.6), upper_height * F(1.0), 0), (s * F(0.5), upper_height * F(0.95), s * F(0.5)),
+        (0, upper_height * F(1.1), s * F(0.55)), (-s * F(0.45), upper_height, s * F(0.55)),
+    ])
+    top = pos + vec(s * F(0.1), h, -s * F(0.05))
+
+    add_rock_quads(mesh, bottom, np.roll(bottom, -1, axis=0), middle, np.roll(middle, -1, axis=0))
+    add_rock_quads(mesh, middle, np.roll(middle, -1, axis=0), upper, np.roll(upper, -1, axis=0))
+
+    upper_next = np.roll(upper, -1, axis=0)
+    normal = normalize(cross(upper_next - upper, top - upper))
+    mesh.add([upper, upper_next, np.broadcast_to(top, upper.shape)], [normal] * 3,
+             [texcoords(0, 1, 8), texcoords(1, 1, 8), texcoords(0.5, 0, 8)], MATERIAL_ROCK)
+
+    for i in range(3):
+        angle = F(i) * F(2.0) * PI / F(3) + F(0.5)
+        dist = s * F(0.9)
+        add_small_rock(mesh, pos + vec(cos(angle) * dist, 0, sin(angle) * dist), s * F(0.25))
+
+    mesh.collider(COLLIDER_CLIMBABLE, pos[0], pos[2], s * F(1.1), height=h, base_y=pos[1])
+
+
+def add_rock_quads(mesh, bl, br, tl, tr):
+    """addRockQuad for a ring of quads: two flat-shaded triangles each"""
+    normal1 = normalize(cross(br - bl, tl - bl))
+    normal2 = normalize(cross(tr - tl, br - tl))
+    count = len(bl)
+    mesh.add([bl, br, tl, tl, br, tr], [normal1, normal1, normal1, normal2, normal2, normal2],
+             [texcoords(0, 1, count), texcoords(1, 1, count), texcoords(0, 0, count),
+              texcoords(0, 0, count), texcoords(1, 1, count), texcoords(1, 0, count)],
+             MATERIAL_ROCK)
+
+
+def add_small_rock(mesh, pos, size):
+    """addSmallRock: four-sided pyramid"""
+    base = pos + np.array([
+        (-size, 0, -size * F(0.8)), (size * F(0.9), 0, -size * F(0.7)),
+        (size * F(0.8), 0, size * F(0.9)), (-size * F(0.7), 0, size * F(0.8)),
+    ], dtype=np.float32)
+    top = pos + vec(0, size * F(0.8), 0)
+    base_next = np.roll(base, -1, axis=0)
+    normal = normalize(cross(base_next - base, top - base))
+    mesh.add([base, base_next, np.broadcast_to(top, base.shape)], [normal] * 3,
+             [texcoords(0, 1, 4), texcoords(1, 1, 4), texcoords(0.5, 0, 4)], MATERIAL_ROCK)
+
+
+def make_rocks(occupancy, seed_offset=0):
+    """makeRockMeshes: jittered 18 m grid of rocks, some with a cluster rock"""
+    mesh = MeshBuilder()
+    seed = 1000 + seed_offset
+    for grid_x in range(-85, 86, 18):
+        for grid_z in range(-85, 86, 18):
+            if abs(grid_x) < 15 and abs(grid_z) < 15:
+                seed += 4
+                continue
+
+            x = F(grid_x) + (seeded_random(seed) - F(0.5)) * F(12)
+            z = F(grid_z) + (seeded_random(seed + 1) - F(0.5)) * F(12)
+            if is_on_path(x, z):
+                seed += 4
+                continue
+
+            size = F(0.6) + seeded_random(seed + 2) * F(0.8)
+            occupied_radius = size * F(1.2)
+            if not occupancy.is_clear(x, z, occupied_radius):
+                seed += 4
+                continue
+
+            chance = seeded_random(seed + 3)
+            if chance < F(0.5):
+                pos = vec(x, terrain_height(x, z), z)
+                occupancy.mark(x, z, occupied_radius)
+                add_rock(mesh, pos, size)
+
+                if chance < F(0.25):
+                    x2 = pos[0] + size * F(1.2)
+                    z2 = pos[2] + size * F(0.3)
+                    cluster_radius = size * F(0.7) * F(1.2)
+                    if occupancy.is_clear(x2, z2, cluster_radius):
+                        occupancy.mark(x2, z2, cluster_radius)
+                        add_rock(mesh, vec(x2, terrain_height(x2, z2), z2), size * F(0.7))
+            seed += 4
+    return mesh
+
+# ============================================================================
+# STRUCTURES
+# ============================================================================
+
+def add_house(mesh, pos, size, roof_height):
+    """addHouse: walls with a door and two windows, gabled roof, chimney, corner posts"""
+    base = vec(pos[0], terrain_height(pos[0], pos[2]), pos[2])
+    hw = size[0] / F(2)
+    hd = size[2] / F(2)
+    wall_height = size[1]
+    wall_thickness = F(0.15)
+    foundation = F(0.15)
+    stone, wood, rock = MATERIAL_STONE_WALL, MATERIAL_WOOD_PLANK, MATERIAL_ROCK
+
+    def box(offset, box_size, material):
+        add_box(mesh, base + vec(*offset), vec(*box_size), material)
+
+    box((0, foundation / F(2), 0), (size[0] + F(0.4), foundation, size[2] + F(0.4)), rock)
+
+    # Front wall (-Z) with door
+    door_width, door_height, door_x = F(1.2), F(2.2), F(0)
+    front_side_width = hw - door_width / F(2)
+    if front_side_width > F(0.3):
+        box((-hw / F(2) - door_width / F(4), wall_height / F(2) + foundation, -hd + wall_thickness / F(2)),
+            (front_side_width, wall_height, wall_thickness), stone)
+        box((hw / F(2) + door_width / F(4), wall_height / F(2) + foundation, -hd + wall_thickness / F(2)),
+            (front_side_width, wall_height, wall_thickness), stone)
+    above_door = wall_height - door_height
+    if above_door > F(0.1):
+        box((door_x, door_height + above_door / F(2) + foundation, -hd + wall_thickness / F(2)),
+            (door_width + F(0.1), above_door, wall_thickness), stone)
+
+    frame = F(0.1)
+    box((door_x - door_width / F(2) - frame / F(2), door_height / F(2) + foundation, -hd),
+        (frame, door_height, wall_thickness + F(0.05)), wood)
+    box((door_x + door_width / F(2) + frame / F(2), door_height / F(2) + foundation, -hd),
+        (frame, door_height, wall_thickness + F(0.05)), wood)
+    box((door_x, door_height + frame / F(2) + foundation, -hd),
+        (door_width + frame * F(2), frame, wall_thickness + F(0.05)), wood)
+    box((door_x, door_height / F(2) + foundation, -hd + wall_thickness / F(2) + F(0.05)),
+        (door_width - F(0.05), door_height - F(0.05), F(0.08)), wood)
+    box((door_x, foundation / F(2), -hd - F(0.4)), (door_width + F(0.4), foundation, F(0.5)), rock)
+
+    # Back wall (+Z)
+    box((0, wall_height / F(2) + foundation, hd - wall_thickness / F(2)), (size[0], wall_height, wall_thickness), stone)
+
+    # Side walls with windows: left (-X) first, then right (+X)
+    window_width, window_height = F(1.0), F(1.0)
+    window_y = wall_height * F(0.5) + foundation
+    window_z = F(0)
+    side_length = hd - window_width / F(2) - F(0.3)
+    below_window = window_y - window_height / F(2) - foundation
+    above_window = wall_height - (window_y - foundation + window_height / F(2))
+    win_frame = F(0.08)
+
+    for side in (-1, 1):
+        wall_x = -hw + wall_thickness / F(2) if side < 0 else hw - wall_thickness / F(2)
+        edge_x = -hw if side < 0 else hw
+        if side_length > F(0.2):
+            box((wall_x, wall_height / F(2) + foundation, -hd / F(2) - window_width / F(4)),
+                (wall_thickness, wall_height, side_length), stone)
+        if side_length > F(0.2):
+            box((wall_x, wall_height / F(2) + foundation, hd / F(2) + window_width / F(4)),
+                (wall_thickness, wall_height, side_length), stone)
+        if below_window > F(0.1):
+            box((wall_x, below_window / F(2) + foundation, window_z),
+                (wall_thickness, below_window, window_width + F(0.2)), stone)
+        if above_window > F(0.1):
+            box((wall_x, window_y + window_height / F(2) + above_window / F(2), window_z),
+                (wall_thickness, above_window, window_width + F(0.2)), stone)
+
+        box((edge_x, window_y, window_z), (F(0.06), window_height + win_frame * F(2), win_frame), wood)
+        box((edge_x, window_y, window_z - window_width / F(2) - win_frame / F(2)),
+            (F(0.06), window_height + win_frame * F(2), win_frame), wood)
+        box((edge_x, window_y, window_z + window_width / F(2) + win_frame / F(2)),
+            (F(0.06), window_height + win_frame * F(2), win_frame), wood)
+        box((edge_x, window_y - window_height / F(2) - win_frame / F(2), window_z),
+            (F(0.06), win_frame, window_width), wood)
+        box((edge_x, window_y + window_height / F(2) + win_frame / F(2), window_z),
+            (F(0.06), win_frame, window_width), wood)
+
+        sill_x = -hw - F(0.15) if side < 0 else hw + F(0.15)
+        box((sill_x, window_y - window_height / F(2) - F(0.05), window_z),
+            (F(0.25), F(0.1), window_width + F(0.3)), rock)
+
+    # Roof
+    overhang = F(0.4)
+    roof_base = base[1] + wall_height + foundation
+    roof_peak = roof_base + roof_height
+    eave = wall_height + foundation
+    front_left = base + vec(-hw - overhang, eave, -hd - overhang)
+    front_right = base + vec(hw + overhang, eave, -hd - overhang)
+    front_peak = base + vec(0, roof_peak, -hd - overhang)
+    back_left = base + vec(-hw - overhang, eave, hd + overhang)
+    back_right = base + vec(hw + overhang, eave, hd + overhang)
+    back_peak = base + vec(0, roof_peak, hd + overhang)
+
+    add_triangle(mesh, front_left, front_right, front_peak, wood)
+    add_triangle(mesh, back_right, back_left, back_peak, wood)
+
+    normal_left = normalize(cross(front_peak - front_left, back_left - front_left))
+    normal_right = normalize(cross(back_right - front_right, front_peak - front_right))
+    slope_uv = [texcoords(0, 1, 1), texcoords(0.5, 0, 1), texcoords(0.5, 0, 1),
+                texcoords(0, 1, 1), texcoords(0.5, 0, 1), texcoords(0, 1, 1)]
+    mesh.add([front_left, front_peak, back_peak, front_left, back_peak, back_left], [normal_left] * 6,
+             slope_uv, MATERIAL_ROOF)
+    slope_uv = [texcoords(1, 1, 1), texcoords(1, 1, 1), texcoords(0.5, 0, 1),
+                texcoords(1, 1, 1), texcoords(0.5, 0, 1), texcoords(0.5, 0, 1)]
+    mesh.add([front_right, back_right, back_peak, front_right, back_peak, front_peak], [normal_right] * 6,
+             slope_uv, MATERIAL_ROOF)
+
+    # Chimney (its base already includes the terrain height, as in the Swift code)
+    chimney_width, chimney_depth = F(0.6), F(0.5)
+    chimney_height = roof_height * F(0.8)
+    chimney_x = hw * F(0.4)
+    chimney_z = hd * F(0.3)
+    slope_angle = F(math.atan(float(roof_height / hw)))
+    chimney_base_y = roof_base + (hw - chimney_x) * F(math.tan(float(slope_angle))) * F(0.6)
+    box((chimney_x, chimney_base_y + chimney_height / F(2), chimney_z), (chimney_width, chimney_height, chimney_depth), rock)
+    box((chimney_x, chimney_base_y + chimney_height + F(0.05), chimney_z),
+        (chimney_width + F(0.15), F(0.1), chimney_depth + F(0.15)), rock)
+
+    # Corner posts
+    post = F(0.12)
+    post_height = wall_height + foundation
+    for x_sign, z_sign in ((-1, -1), (1, -1), (-1, 1), (1, 1)):
+        post_x = -hw + post / F(2) if x_sign < 0 else hw - post / F(2)
+        post_z = -hd + post / F(2) if z_sign < 0 else hd - post / F(2)
+        box((post_x, post_height / F(2), post_z), (post, post_height, post), wood)
+
+    mesh.collider(COLLIDER_CIRCLE, base[0], base[2], max(hw, hd) + F(0.5))
+
+
+def add_ruin(mesh, pos, size):
+    """addRuin: three broken walls with box colliders and four rubble rocks"""
+    terrain_y = terrain_height(pos[0], pos[2])
+    base = vec(pos[0], terrain_y, pos[2])
+    hw = size[0] / F(2)
+    hd = size[2] / F(2)
+    wall_thickness = F(0.4)
+    seed = int(pos[0] * F(100) + pos[2] * F(10))
+
+    back_height = size[1] * (F(0.7) + seeded_random(seed) * F(0.3))
+    back_pos = base + vec(0, back_height / F(2), hd - wall_thickness / F(2))
+    add_box(mesh, back_pos, vec(size[0], back_height, wall_thickness), MATERIAL_STONE_WALL)
+    mesh.collider(COLLIDER_BOX, back_pos[0], back_pos[2], half_extents=(size[0] / F(2), wall_thickness / F(2)))
+    seed += 1
+
+    left_height = size[1] * (F(0.3) + seeded_random(seed) * F(0.4))
+    left_length = size[2] * F(0.6)
+    left_pos = base + vec(-hw + wall_thickness / F(2), left_height / F(2), 0)
+    add_box(mesh, left_pos, vec(wall_thickness, left_height, left_length), MATERIAL_STONE_WALL)
+    mesh.collider(COLLIDER_BOX, left_pos[0], left_pos[2], half_extents=(wall_thickness / F(2), left_length / F(2)))
+    seed += 1
+
+    right_height = size[1] * (F(0.5) + seeded_random(seed) * F(0.3))
+    right_length = size[2] * F(0.5)
+    right_pos = base + vec(hw - wall_thickness / F(2), right_height / F(2), hd * F(0.3))
+    add_box(mesh, right_pos, vec(wall_thickness, right_height, right_length), MATERIAL_STONE_WALL)
+    mesh.collider(COLLIDER_BOX, right_pos[0], right_pos[2], half_extents=(wall_thickness / F(2), right_length / F(2)))
+
+    for i in range(4):
+        rx = base[0] + (seeded_random(seed + i * 2) - F(0.5)) * size[0] * F(0.8)
+        rz = base[2] + (seeded_random(seed + i * 2 + 1) - F(0.5)) * size[2] * F(0.8)
+        add_rock(mesh, vec(rx, terrain_y, rz), F(0.3) + seeded_random(seed + i) * F(0.3))
+
+
+def add_bridge(mesh, start, end, width):
+    """addBridge: deck quad, two support posts and four railing posts (no collider)"""
+    start_y = terrain_height(start[0], start[2]) + F(0.5)
+    end_y = terrain_height(end[0], end[2]) + F(0.5)
+    bridge_y = max(start_y, end_y) + F(1.0)
+
+    flat = vec(end[0] - start[0], 0, end[2] - start[2])
+    direction = normalize(flat)
+    perpendicular = vec(-direction[2], 0, direction[0])
+    span = length(flat)
+    center = (start + end) / F(2)
+    center_pos = vec(center[0], bridge_y, center[2])
+
+    hw = width / F(2)
+    hl = span / F(2)
+    corners = [
+        center_pos + (perpendicular * hw + direction * hl),
+        center_pos - perpendicular * hw + direction * hl,
+        center_pos - perpendicular * hw - direction * hl,
+        center_pos + (perpendicular * hw - direction * hl),
+    ]
+    up = vec(0, 1, 0)
+    mesh.add([corners[0], corners[1], corners[2], corners[0], corners[2], corners[3]], [up] * 6,
+             [texcoords(0, 0, 1), texcoords(1, 0, 1), texcoords(1, 1, 1),
+              texcoords(0, 0, 1), texcoords(1, 1, 1), texcoords(0, 1, 1)],
+             MATERIAL_WOOD_PLANK)
+
+    post_height = bridge_y - min(start_y, end_y) + F(1)
+    add_cylinder(mesh, vec(start[0], start_y - F(1), start[2]), F(0.2), post_height, 6, MATERIAL_POLE)
+    add_cylinder(mesh, vec(end[0], end_y - F(1), end[2]), F(0.2), post_height, 6, MATERIAL_POLE)
+
+    for side in (-1, 1):
+        add_cylinder(mesh, corners[0 if side > 0 else 1], F(0.08), F(1.0), 4, MATERIAL_POLE)
+        add_cylinder(mesh, corners[3 if side > 0 else 2], F(0.08), F(1.0), 4, MATERIAL_POLE)
+
+
+def add_watchtower(mesh, pos):
+    """addWatchtower: octagonal tower, platform and roof cone"""
+    base = vec(pos[0], terrain_height(pos[0], pos[2]), pos[2])
+    tower_radius = F(2.5)
+    add_cylinder(mesh, base, tower_radius, F(8), 8, MATERIAL_STONE_WALL)
+    add_cylinder(mesh, vec(base[0], base[1] + F(6), base[2]), tower_radius + F(0.5), F(0.3), 8, MATERIAL_WOOD_PLANK)
+    add_cone(mesh, vec(base[0], base[1] + F(8), base[2]), tower_radius + F(0.3), F(2.5), 8, MATERIAL_ROOF)
+    mesh.collider(COLLIDER_CIRCLE, base[0], base[2], tower_radius + F(0.5))
+
+
+HOUSES = [
+    ((25, 0, 30), (6, 4, 5), 2.5),
+    ((-30, 0, 25), (5, 3.5, 6), 2),
+    ((40, 0, -35), (7, 4.5, 6), 3),
+]
+RUINS = [
+    ((-45, 0, -40), (8, 3, 10)),
+    ((55, 0, 50), (6, 2.5, 6)),
+]
+BRIDGES = [
+    ((-5, 0, 35), (5, 0, 35), 3),
+    ((35, 0, -5), (35, 0, 5), 2.5),
+]
+WATCHTOWER = ((-60, 0, 60), 4.0)
+
+
+def make_structures(occupancy):
+    """makeStructureMeshes: houses, ruins, bridges and the watchtower"""
+    mesh = MeshBuilder()
+    for position, size, roof_height in HOUSES:
+        pos, size = vec(*position), vec(*size)
+        occupied_radius = max(size[0], size[2]) / F(2) + F(1.0)
+        if occupancy.is_clear(pos[0], pos[2], occupied_radius):
+            occupancy.mark(pos[0], pos[2], occupied_radius)
+            add_house(mesh, pos, size, F(roof_height))
+
+    for position, size in RUINS:
+        pos, size = vec(*position), vec(*size)
+        occupied_radius = max(size[0], size[2]) / F(2) + F(1.0)
+        if occupancy.is_clear(pos[0], pos[2], occupied_radius):
+            occupancy.mark(pos[0], pos[2], occupied_radius)
+            add_ruin(mesh, pos, size)
+
+    for start, end, width in BRIDGES:
+        start, end = vec(*start), vec(*end)
+        bridge_radius = F(width) / F(2) + F(0.5)
+        occupancy.mark(start[0], start[2], bridge_radius)
+        occupancy.mark(end[0], end[2], bridge_radius)
+        add_bridge(mesh, start, end, F(width))
+
+    position, radius = WATCHTOWER
+    pos = vec(*position)
+    if occupancy.is_clear(pos[0], pos[2], F(radius)):
+        occupancy.mark(pos[0], pos[2], F(radius))
+        add_watchtower(mesh, pos)
+    return mesh
+
+# ============================================================================
+# WORLD FILE
+# ============================================================================
+#
+# Little-endian, every section 64-byte aligned so it can be mapped in place:
+#     header:  magic "MMWORLD\0", formatVersion, generatorVersion, seed (int32), sectionCount
+#     table:   sectionCount x (name (32 bytes, NUL padded), recordSize, recordCount, offset (u64), length (u64))
+#     data:    the section records, typed by name suffix (SECTION_DTYPES)
+#
+# collidergrid.* indexes the concatenated *.colliders sections (in file
+# order), blockergrid.* indexes trees.blockers (see spatial_grid.py).
+
+WORLD_MAGIC = b'MMWORLD\0'
+WORLD_FORMAT_VERSION = 2
+SECTION_ALIGNMENT = 64
+
+_WORLD_HEADER = struct.Struct('<8sIIiI')
+_WORLD_SECTION = struct.Struct('<32sIIQQ')
+
+
+def world_basename(seed, version=GENERATOR_VERSION):
+    """File name stem of the world baked for a seed and generator version"""
+    return f"world_s{seed}_v{version}"
+
+
+def generate_world(seed=0):
+    """
+    Run the world generation in GeometryGenerator's order.
+
+    Returns a dict of section name -> record array, in file order.
+    """
+    occupancy = Occupancy()
+    ground = make_ground()
+    trees = make_trees(occupancy, seed)
+    rocks = make_rocks(occupancy, seed)
+    structures = make_structures(occupancy)
+    sections = {
+        "ground.vertices": ground.vertices(),
+        "trees.vertices": trees.vertices(),
+        "trees.colliders": trees.collider_array(),
+        "trees.blockers": trees.blocker_array(),
+        "rocks.vertices": rocks.vertices(),
+        "rocks.colliders": rocks.collider_array(),
+        "structures.vertices": structures.vertices(),
+        "structures.colliders": structures.collider_array(),
+    }
+
+    extent = ((-WORLD_HALF_SIZE, -WORLD_HALF_SIZE), (WORLD_HALF_SIZE, WORLD_HALF_SIZE))
+    sections.update(SpatialGrid.build(*collider_bounds(world_colliders(sections)), extent,
+                                      GRID_CELL_SIZE).sections("collidergrid"))
+    blockers = sections["trees.blockers"]
+    sections.update(SpatialGrid.build(blockers['position'], blockers['radius'], extent,
+                                      GRID_CELL_SIZE).sections("blockergrid"))
+    return sections
+
+
+def world_colliders(sections):
+    """Every *.colliders section concatenated in file order (the collidergrid item indices)"""
+    return np.concatenate([records for name, records in sections.items() if name.endswith(".colliders")])
+
+
+def collider_bounds(colliders):
+    """Circular XZ bounds (positions, radii) of colliders; boxes use their half-diagonal"""
+    radii = np.where(colliders['type'] == COLLIDER_BOX,
+                     np.hypot(colliders['halfExtents'][:, 0], colliders['halfExtents'][:, 1]),
+                     colliders['radius'])
+    return colliders['position'], radii
+
+
+def world_grids(sections):
+    """(collider grid, camera blocker grid) of a world's sections"""
+    colliders = SpatialGrid.from_sections(sections, "collidergrid", *collider_bounds(world_colliders(sections)))
+    blockers = sections["trees.blockers"]
+    return colliders, SpatialGrid.from_sections(sections, "blockergrid", blockers['position'], blockers['radius'])
+
+
+def write_world(path, sections, seed, version=GENERATOR_VERSION):
+    """Write sections (name -> record array) to a world file"""
+    table_end = _WORLD_HEADER.size + _WORLD_SECTION.size * len(sections)
+    offset = table_end + (-table_end % SECTION_ALIGNMENT)
+    table = b''
+    layout = []
+    for name, records in sections.items():
+        data = records.tobytes()
+        table += _WORLD_SECTION.pack(name.encode('ascii'), records.dtype.itemsize, len(records), offset, len(data))
+        layout.append((offset, data))
+        offset += len(data) + (-len(data) % SECTION_ALIGNMENT)
+
+    with open(path, 'wb') as f:
+        f.write(_WORLD_HEADER.pack(WORLD_MAGIC, WORLD_FORMAT_VERSION, version, seed, len(sections)))
+        f.write(table)
+        for section_offset, data in layout:
+            f.write(b'\0' * (section_offset - f.tell()))
+            f.write(data)
+
+
+def read_world(path):
+    """
+    Memory-map a world file.
+
+    Returns a dict with seed, generatorVersion and sections (name -> record
+    array viewing the mapped file). Keep the dict alive while the arrays are in use.
+    """
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, format_version, version, seed, section_count = _WORLD_HEADER.unpack_from(mapped, 0)
+    if magic != WORLD_MAGIC or format_version != WORLD_FORMAT_VERSION:
+        raise ValueError(f"{path} is not a version {WORLD_FORMAT_VERSION} world file")
+
+    sections = {}
+    for index in range(section_count):
+        name, record_size, count, offset, _ = _WORLD_SECTION.unpack_from(
+            mapped, _WORLD_HEADER.size + _WORLD_SECTION.size * index)
+        name = name.rstrip(b'\0').decode('ascii')
+        dtype = SECTION_DTYPES[name.rsplit('.', 1)[1]]
+        if dtype.itemsize != record_size:
+            raise ValueError(f"{path}: section {name} has {record_size}-byte records, expected {dtype.itemsize}")
+        sections[name] = np.frombuffer(mapped, dtype=dtype, count=count, offset=offset)
+
+    return {"seed": seed, "generatorVersion": version, "sections": sections, "mmap": mapped}
+
+
+def quantized_hash(records):
+    """SHA-1 of a record array with every float field rounded to QUANTUM"""
+    digest = hashlib.sha1()
+    for name in records.dtype.names or (None,):
+        values = records[name] if name else records
+        if values.dtype.kind == 'f':
+            values = np.rint(values.astype(np.float64) / QUANTUM).astype(np.int64)
+        digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+def section_summary(sections):
+    """Count and hashes of every section, for the manifest and comparisons"""
+    return {
+        name: {
+            "count": len(records),
+            "sha1": hashlib.sha1(records.tobytes()).hexdigest(),
+            "quantizedSha1": quantized_hash(records),
+        }
+        for name, records in sections.items()
+    }
+
+
+def print_summary(summary):
+    for name, entry in summary.items():
+        print(f"  {name:22s} {entry['count']:8d}  {entry['quantizedSha1'][:12]}")
+
+
+def check_world(world):
+    """Compare the grids of a read world with brute-force queries; exits 1 on a mismatch"""
+    rng = np.random.default_rng(0)
+    failed = False
+    for name, grid in zip(("collidergrid", "blockergrid"), world_grids(world["sections"])):
+        mismatches, mean_candidates = check_grid(grid, CHECK_QUERIES, GRID_CELL_SIZE, rng)
+        print(f"  {name}: {grid.columns}x{grid.rows} cells, {mean_candidates:.1f} of {len(grid.radii)} "
+              f"candidates per query, {mismatches}/{CHECK_QUERIES} mismatches")
+        failed |= mismatches > 0
+    if failed:
+        print("ERROR: grid queries differ from brute force")
+        sys.exit(1)
+    print("OK: grid queries match brute force")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake the procedural world geometry to a binary world file")
+    parser.add_argument("--seed", type=int, default=0, help="world seed (0 = the GeometryGenerator world)")
+    parser.add_argument("--output", default=OUTPUT_DIR, help="directory for the world file and its manifest")
+    parser.add_argument("--summary", action="store_true",
+                        help="print the counts and hashes of an existing bake instead of baking")
+    parser.add_argument("--check", action="store_true",
+                        help="check the spatial grids of the world file against brute-force queries")
+    args = parser.parse_args()
+
+    path = os.path.join(args.output, world_basename(args.seed) + ".bin")
+    if args.summary:
+        world = read_world(path)
+        print(f"{path} (seed {world['seed']}, generator v{world['generatorVersion']})")
+        print_summary(section_summary(world["sections"]))
+        if args.check:
+            check_world(world)
+        return
+
+    started = time.time()
+    sections = generate_world(args.seed)
+    os.makedirs(args.output, exist_ok=True)
+    write_world(path, sections, args.seed)
+
+    summary = section_summary(sections)
+    manifest = {
+        "seed": args.seed,
+        "generatorVersion": GENERATOR_VERSION,
+        "formatVersion": WORLD_FORMAT_VERSION,
+        "quantum": QUANTUM,
+        "sections": summary,
+    }
+    with open(os.path.join(args.output, world_basename(args.seed) + ".json"), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"Baked world (seed {args.seed}, generator v{GENERATOR_VERSION}) in {time.time() - started:.1f}s")
+    print_summary(summary)
+    print(f"Output: {path} ({os.path.getsize(path) / 1024:.0f} KB)")
+    if args.check:
+        check_world(read_world(path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""
+Block Compression Encoder for MetalMan
+======================================
+Pure NumPy encoders (and matching decoders) for the BC1, BC3 and BC5 block
+formats, used by bake_textures.py to ship textures block-compressed.
+
+Every function works on all 4x4 blocks of an image at once, so a 2048x2048
+level is a handful of array operations instead of 262,144 Python loops.
+
+- BC1: RGB endpoints along the principal axis of each block, refined with
+  one least-squares pass; 8 bytes per block (opaque textures)
+- BC3: a BC1 color block plus a BC4 alpha block; 16 bytes per block
+- BC5: two BC4 blocks (red and green); 16 bytes per block (normal maps)
+
+Images are uint8 arrays (H, W, C). Sizes that are not a multiple of 4 (the
+small mips) are padded by repeating the edge texels, as the GPU ignores the
+texels outside the level.
+
+Usage:
+    python bc_encoder.py ../textures/grass_01_diffuse.jpg --format bc1
+    python bc_encoder.py leaves.png --format bc3
+
+Requirements:
+- Python 3.9+ with NumPy (pip install numpy); Pillow for the command line
+"""
+
+import argparse
+
+import numpy as np
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Bytes per 4x4 block
+BLOCK_BYTES = {'bc1': 8, 'bc3': 16, 'bc5': 16}
+
+# Channels each format encodes (and PSNR is measured over)
+FORMAT_CHANNELS = {'bc1': 3, 'bc3': 4, 'bc5': 2}
+
+# Least-squares refinement passes for BC1 endpoints
+REFINE_ITERATIONS = 2
+
+# Power iterations used to find the principal color axis of a block
+AXIS_ITERATIONS = 8
+
+# ============================================================================
+# BLOCK LAYOUT
+# ============================================================================
+
+def to_blocks(texels):
+    """Split an image (H, W, C) into row-major 4x4 blocks (N, 16, C) of float32"""
+    height, width, channels = texels.shape
+    padded = np.pad(texels, ((0, -height % 4), (0, -width % 4), (0, 0)), mode='edge')
+    rows, columns = padded.shape[0] // 4, padded.shape[1] // 4
+    blocks = padded.reshape(rows, 4, columns, 4, channels).transpose(0, 2, 1, 3, 4)
+    return blocks.reshape(rows * columns, 16, channels).astype(np.float32)
+
+
+def from_blocks(blocks, width, height):
+    """Reassemble blocks (N, 16, C) into an image (H, W, C), dropping the padding"""
+    rows, columns = -(-height // 4), -(-width // 4)
+    channels = blocks.shape[2]
+    image = blocks.reshape(rows, columns, 4, 4, channels).transpose(0, 2, 1, 3, 4)
+    return image.reshape(rows * 4, columns * 4, channels)[:height, :width]
+
+# ============================================================================
+# BC1 COLOR BLOCKS
+# ============================================================================
+
+def pack_565(colors):
+    """Quantize RGB colors (..., 3) in [0, 255] to RGB565 integers"""
+    scaled = np.clip(np.rint(colors * (np.array([31, 63, 31]) / 255.0)), 0, [31, 63, 31]).astype(np.uint32)
+    return (scaled[..., 0] << 11) | (scaled[..., 1] << 5) | scaled[..., 2]
+
+
+def unpack_565(values):
+    """Expand RGB565 integers to RGB colors (..., 3) in [0, 255], as the GPU does"""
+    values = values.astype(np.uint32)
+    r = (values >> 11) & 31
+    g = (values >> 5) & 63
+    b = values & 31
+    return np.stack([(r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)], axis=-1).astype(np.float32)
+
+
+def color_palette(c0, c1):
+    """Four-color BC1 palette (N, 4, 3) from RGB565 endpoints"""
+    e0 = unpack_565(c0)
+    e1 = unpack_565(c1)
+    return np.stack([e0, e1, (2 * e0 + e1) / 3.0, (e0 + 2 * e1) / 3.0], axis=1)
+
+
+def nearest_indices(values, palette):
+    """Index of the closest palette entry for every texel, and the total squared error per block"""
+    distances = ((values[:, :, None, :] - palette[:, None, :, :]) ** 2).sum(axis=3)
+    indices = distances.argmin(axis=2)
+    errors = np.take_along_axis(distances, indices[:, :, None], axis=2)[:, :, 0].sum(axis=1)
+    return indices, errors
+
+
+def principal_endpoints(colors):
+    """Endpoints at the extremes of each block's principal color axis"""
+    mean = colors.mean(axis=1)
+    centered = colors - mean[:, None, :]
+    covariance = np.einsum('nki,nkj->nij', centered, centered)
+
+    axis = np.ones((len(colors), 3), dtype=np.float32)
+    for _ in range(AXIS_ITERATIONS):
+        axis = np.einsum('nij,nj->ni', covariance, axis)
+        length = np.linalg.norm(axis, axis=1, keepdims=True)
+        # Flat blocks have no axis; any direction gives the same endpoints
+        axis = np.where(length > 1e-6, axis / np.maximum(length, 1e-6), 1.0 / np.sqrt(3.0))
+
+    projection = np.einsum('nki,ni->nk', centered, axis)
+    high = mean + axis * projection.max(axis=1, keepdims=True)
+    low = mean + axis * projection.min(axis=1, keepdims=True)
+    return np.clip(high, 0, 255), np.clip(low, 0, 255)
+
+
+def refine_endpoints(colors, indices, high, low):
+    """
+    Least-squares endpoints for fixed palette indices.
+
+    Each texel is modelled as a * c0 + b * c1 with the palette weights of
+    its index; blocks whose normal equations are singular keep their endpoints.
+    """
+    weights = np.array([1.0, 0.0, 2.0 / 3.0, 1.0 / 3.0], dtype=np.float32)
+    a = weights[indices]
+    b = 1.0 - a
+    aa = (a * a).sum(axis=1)
+    ab = (a * b).sum(axis=1)
+    bb = (b * b).sum(axis=1)
+    ax = np.einsum('nk,nkc->nc', a, colors)
+    bx = np.einsum('nk,nkc->nc', b, colors)
+
+    determinant = aa * bb - ab * ab
+    solvable = np.abs(determinant) > 1e-6
+    safe = np.where(solvable, determinant, 1.0)[:, None]
+    refined_high = (bb[:, None] * ax - ab[:, None] * bx) / safe
+    refined_low = (aa[:, None] * bx - ab[:, None] * ax) / safe
+    return (np.where(solvable[:, None], np.clip(refined_high, 0, 255), high),
+            np.where(solvable[:, None], np.clip(refined_low, 0, 255), low))
+
+
+def encode_color_blocks(colors):
+    """
+    Encode RGB blocks (N, 16, 3) as BC1 color blocks (N, 8) in four-color mode.
+
+    Endpoints are ordered so that c0 > c1; blocks whose endpoints quantize to
+    the same color use index 0 everywhere (valid in both BC1 modes).
+    """
+    high, low = principal_endpoints(colors)
+    c0, c1 = pack_565(high), pack_565(low)
+    indices, errors = nearest_indices(colors, color_palette(c0, c1))
+
+    for _ in range(REFINE_ITERATIONS):
+        high, low = refine_endpoints(colors, indices, high, low)
+        r0, r1 = pack_565(high), pack_565(low)
+        refined_indices, refined_errors = nearest_indices(colors, color_palette(r0, r1))
+        better = refined_errors < errors
+        c0 = np.where(better, r0, c0)
+        c1 = np.where(better, r1, c1)
+        indices = np.where(better[:, None], refined_indices, indices)
+        errors = np.where(better, refined_errors, errors)
+
+    # Four-color mode needs c0 > c1: swap the endpoints and their indices
+    swap = c0 < c1
+    c0, c1 = np.where(swap, c1, c0), np.where(swap, c0, c1)
+    indices = np.where(swap[:, None], indices ^ 1, indices)
+    indices = np.where((c0 == c1)[:, None], 0, indices)
+
+    bits = (indices.astype(np.uint32) << (2 * np.arange(16, dtype=np.uint32))).sum(axis=1, dtype=np.uint32)
+    block = np.empty((len(colors), 8), dtype=np.uint8)
+    block[:, 0:2] = c0.astype('<u2').view(np.uint8).reshape(-1, 2)
+    block[:, 2:4] = c1.astype('<u2').view(np.uint8).reshape(-1, 2)
+    block[:, 4:8] = bits.astype('<u4').view(np.uint8).reshape(-1, 4)
+    return block
+
+
+def decode_color_blocks(block):
+    """Decode BC1 color blocks (N, 8) in four-color mode to RGB blocks (N, 16, 3)"""
+    c0 = block[:, 0:2].copy().view('<u2')[:, 0]
+    c1 = block[:, 2:4].copy().view('<u2')[:, 0]
+    bits = block[:, 4:8].copy().view('<u4')[:, 0]
+    indices = (bits[:, None] >> (2 * np.arange(16, dtype=np.uint32))) & 3
+    palette = color_palette(c0, c1)
+    return np.rint(np.take_along_axis(palette, indices[:, :, None].astype(np.int64), axis=1))
+
+# ============================================================================
+# BC4 SINGLE-CHANNEL BLOCKS (BC3 alpha, BC5 red/green)
+# ============================================================================
+
+def channel_palette(a0, a1):
+    """Eight-value BC4 palette (N, 8) for a0 > a1"""
+    a0 = a0.astype(np.float32)
+    a1 = a1.astype(np.float32)
+    steps = np.arange(1, 7, dtype=np.float32)
+    interpolated = ((7 - steps) * a0[:, None] + steps * a1[:, None]) / 7.0
+    return np.concatenate([a0[:, None], a1[:, None], interpolated], axis=1)
+
+
+def encode_channel_blocks(values):
+    """Encode single-channel blocks (N, 16) as BC4 blocks (N, 8) in eight-value mode"""
+    a0 = np.rint(values.max(axis=1)).astype(np.uint8)
+    a1 = np.rint(values.min(axis=1)).astype(np.uint8)
+    palette = channel_palette(a0, a1)
+    indices = np.abs(values[:, :, None] - palette[:, None, :]).argmin(axis=2)
+    indices = np.where((a0 == a1)[:, None], 0, indices)
+
+    bits = (indices.astype(np.uint64) << (3 * np.arange(16, dtype=np.uint64))).sum(axis=1, dtype=np.uint64)
+    block = np.empty((len(values), 8), dtype=np.uint8)
+    block[:, 0] = a0
+    block[:, 1] = a1
+    block[:, 2:8] = bits.astype('<u8').view(np.uint8).reshape(-1, 8)[:, :6]
+    return block
+
+
+def decode_channel_blocks(block):
+    """Decode BC4 blocks (N, 8) to single-channel blocks (N, 16), both palette modes"""
+    a0 = block[:, 0].astype(np.float32)
+    a1 = block[:, 1].astype(np.float32)
+    eight = channel_palette(block[:, 0], block[:, 1])
+    steps = np.arange(1, 5, dtype=np.float32)
+    six = np.concatenate([
+        a0[:, None], a1[:, None],
+        ((5 - steps) * a0[:, None] + steps * a1[:, None]) / 5.0,
+        np.zeros((len(block), 1), dtype=np.float32), np.full((len(block), 1), 255.0, dtype=np.float32),
+    ], axis=1)
+    palette = np.where((a0 > a1)[:, None], eight, six)
+
+    raw = np.zeros((len(block), 8), dtype=np.uint8)
+    raw[:, :6] = block[:, 2:8]
+    bits = raw.view('<u8')[:, 0]
+    indices = (bits[:, None] >> (3 * np.arange(16, dtype=np.uint64))) & 7
+    return np.rint(np.take_along_axis(palette, indices.astype(np.int64), axis=1))
+
+# ============================================================================
+# FORMATS
+# ============================================================================
+
+def encode(texels, bc_format):
+    """
+    Compress one image level.
+
+    texels: uint8 (H, W, C) with at least the channels the format encodes
+    (RGB for bc1, RGBA for bc3, RG for bc5). Returns the level payload.
+    """
+    blocks = to_blocks(texels)
+    if bc_format == 'bc1':
+        encoded = encode_color_blocks(blocks[:, :, :3])
+    elif bc_format == 'bc3':
+        encoded = np.concatenate([encode_channel_blocks(blocks[:, :, 3]),
+                                  encode_color_blocks(blocks[:, :, :3])], axis=1)
+    elif bc_format == 'bc5':
+        encoded = np.concatenate([encode_channel_blocks(blocks[:, :, 0]),
+                                  encode_channel_blocks(blocks[:, :, 1])], axis=1)
+    else:
+        raise ValueError(f"Unknown block format: {bc_format}")
+    return encoded.tobytes()
+
+
+def decode(data, width, height, bc_format):
+    """Decompress one level payload to a uint8 image (H, W, FORMAT_CHANNELS[bc_format])"""
+    block = np.frombuffer(data, dtype=np.uint8).reshape(-1, BLOCK_BYTES[bc_format])
+    if bc_format == 'bc1':
+        blocks = decode_color_blocks(block)
+    elif bc_format == 'bc3':
+        blocks = np.concatenate([decode_color_blocks(block[:, 8:16]),
+                                 decode_channel_blocks(block[:, 0:8])[:, :, None]], axis=2)
+    elif bc_format == 'bc5':
+        blocks = np.stack([decode_channel_blocks(block[:, 0:8]),
+                           decode_channel_blocks(block[:, 8:16])], axis=2)
+    else:
+        raise ValueError(f"Unknown block format: {bc_format}")
+    return from_blocks(blocks, width, height).astype(np.uint8)
+
+
+def psnr(original, decoded):
+    """Peak signal-to-noise ratio in dB between two uint8 images"""
+    error = np.mean((original.astype(np.float64) - decoded.astype(np.float64)) ** 2)
+    return 10.0 * np.log10(255.0 ** 2 / max(error, 1e-10))
+
+
+def main():
+    from PIL import Image
+
+    parser = argparse.ArgumentParser(description="Compress an image with BC1/BC3/BC5 and report the PSNR")
+    parser.add_argument("image")
+    parser.add_argument("--format", choices=sorted(BLOCK_BYTES), default='bc1')
+    args = parser.parse_args()
+
+    texels = np.asarray(Image.open(args.image).convert('RGBA'))
+    channels = FORMAT_CHANNELS[args.format]
+    height, width = texels.shape[:2]
+    data = encode(texels, args.format)
+    decoded = decode(data, width, height, args.format)
+    print(f"{args.image}: {width}x{height} {args.format.upper()}, {texels.nbytes / 1024:.0f} KB -> "
+          f"{len(data) / 1024:.0f} KB, PSNR {psnr(texels[:, :, :channels], decoded):.2f} dB")
+
+
+if __name__ == "__main__":
+    main()
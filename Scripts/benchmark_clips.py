@@ -0,0 +1,397 @@
+"""
+Clip Compression Benchmark for MetalMan
+=======================================
+Compares animation clip encodings on the shipped Walking_animation.json and
+on synthetic clips of configurable size, so format changes can be judged on
+numbers and tracked across releases.
+
+Encodings:
+- json-raw: the JSON layout export_animation.py writes (indent=2)
+- json-compact: the same JSON without whitespace
+- binary-f32: bone table + float32 times and the top three rows of every matrix
+- quantized-u16: per-component min/range + 16-bit values
+- keyframe-reduced: Hermite spline tracks fitted by clip_splines.py (compact JSON)
+
+For each clip and encoding the report has the encoded size, encode and
+decode time, random-access sampling throughput (full poses per second at
+random times), and the max/mean joint position error after forward
+kinematics on the clip's skeleton, compared with the dense JSON keyframes
+blended the way the runtime does (component-wise lerp). The max error is
+also reported at the dense keyframe times alone.
+
+Usage:
+    python benchmark_clips.py
+    python benchmark_clips.py --synthetic 30x60 99x300 150x900 --output results/clip_benchmark.json
+
+Requirements:
+- Python 3.9+ with NumPy (pip install numpy)
+"""
+
+import argparse
+import json
+import os
+import platform
+import struct
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from clip_splines import COMPONENTS_PER_BONE, fit_clip, hermite
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SHIPPED_CLIPS = [os.path.join(PROJECT_DIR, "MetalMan", "Animations", "Walking_animation.json")]
+
+# Synthetic clip sizes as (bones, frames)
+SYNTHETIC_SIZES = [(30, 60), (99, 300)]
+
+OUTPUT_PATH = "clip_benchmark.json"
+
+# Poses sampled at random times for the throughput measurement
+THROUGHPUT_SAMPLES = 200
+
+# Evenly spaced times at which positional error is measured
+ERROR_SAMPLES = 240
+
+# Repetitions for the encode/decode timings (the best run is reported)
+TIMING_REPEATS = 3
+
+SEED = 1234
+
+# ============================================================================
+# CLIP HELPERS
+# ============================================================================
+
+def synthetic_clip(bone_count, frame_count, fps=30, seed=SEED):
+    """
+    Build a clip in the export_animation.py JSON format with a random bone
+    tree and smooth per-bone rotations, so sizes can be scaled freely.
+    """
+    rng = np.random.default_rng(seed + bone_count * 7919 + frame_count)
+    parents = [-1] + [int(rng.integers(0, i)) for i in range(1, bone_count)]
+    times = np.arange(frame_count) / fps
+    duration = (frame_count - 1) / fps
+
+    frequency = rng.uniform(0.5, 2.0, size=(bone_count, 3))
+    phase = rng.uniform(0, 2 * np.pi, size=(bone_count, 3))
+    amplitude = rng.uniform(0.05, 0.6, size=(bone_count, 3))
+    offsets = rng.normal(0.0, 1.0, size=(bone_count, 3)) * 5.0 + np.array([0.0, 10.0, 0.0])
+
+    # Some bones never move, as in real rigs (fingers, end bones)
+    amplitude[rng.random(bone_count) < 0.2] = 0.0
+
+    angles = amplitude[None] * np.sin(2 * np.pi * frequency[None] * times[:, None, None] + phase[None])
+    matrices = np.tile(np.eye(4), (frame_count, bone_count, 1, 1))
+    matrices[:, :, :3, :3] = euler_matrices(angles)
+    matrices[:, :, :3, 3] = offsets
+    matrices[:, 0, :3, 3] = [0.0, 100.0, 0.0]
+    matrices[:, 0, 1, 3] += 2.0 * np.sin(4 * np.pi * times / max(duration, 1e-6))
+
+    return {
+        "name": f"synthetic_{bone_count}x{frame_count}",
+        "duration": duration,
+        "fps": fps,
+        "boneCount": bone_count,
+        "keyframeCount": frame_count,
+        "bones": [{"name": f"bone_{i}", "index": i, "parentIndex": p} for i, p in enumerate(parents)],
+        "keyframes": [
+            {"time": float(t), "boneTransforms": matrices[k].transpose(0, 2, 1).reshape(bone_count, 16).tolist()}
+            for k, t in enumerate(times)
+        ],
+    }
+
+
+def euler_matrices(angles):
+    """Rotation matrices (..., 3, 3) for XYZ Euler angles (..., 3)"""
+    cx, cy, cz = np.cos(angles[..., 0]), np.cos(angles[..., 1]), np.cos(angles[..., 2])
+    sx, sy, sz = np.sin(angles[..., 0]), np.sin(angles[..., 1]), np.sin(angles[..., 2])
+    result = np.empty(angles.shape[:-1] + (3, 3))
+    result[..., 0, 0] = cy * cz
+    result[..., 0, 1] = sx * sy * cz - cx * sz
+    result[..., 0, 2] = cx * sy * cz + sx * sz
+    result[..., 1, 0] = cy * sz
+    result[..., 1, 1] = sx * sy * sz + cx * cz
+    result[..., 1, 2] = cx * sy * sz - sx * cz
+    result[..., 2, 0] = -sy
+    result[..., 2, 1] = sx * cy
+    result[..., 2, 2] = cx * cy
+    return result
+
+
+def dense_values(clip):
+    """(times (K,), values (K, B, 12)) from a JSON clip, matrix rows row-major"""
+    times = np.array([keyframe["time"] for keyframe in clip["keyframes"]], dtype=np.float64)
+    matrices = np.array([keyframe["boneTransforms"] for keyframe in clip["keyframes"]], dtype=np.float64)
+    matrices = matrices.reshape(len(times), -1, 4, 4).transpose(0, 1, 3, 2)
+    return times, matrices[:, :, :3, :].reshape(len(times), -1, COMPONENTS_PER_BONE)
+
+
+def bone_table(clip):
+    """Compact JSON header shared by the binary encodings"""
+    header = {
+        "name": clip["name"],
+        "duration": clip["duration"],
+        "fps": clip["fps"],
+        "bones": [[bone["name"], bone["parentIndex"]] for bone in clip["bones"]],
+    }
+    data = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    return struct.pack('<I', len(data)) + data
+
+
+def read_bone_table(data):
+    """Inverse of bone_table(); returns (header, offset after it)"""
+    (length,) = struct.unpack_from('<I', data, 0)
+    return json.loads(data[4:4 + length].decode('utf-8')), 4 + length
+
+# ============================================================================
+# ENCODINGS
+# ============================================================================
+# Each encoding has encode(clip) -> bytes and decode(bytes) -> sampler, where a
+# sampler maps a time in seconds to (B, 12) matrix rows.
+
+def lerp_sampler(times, values):
+    """Runtime-style sampler: component-wise lerp between surrounding keyframes"""
+    def sample(t):
+        t = min(max(t, times[0]), times[-1])
+        upper = int(np.clip(np.searchsorted(times, t, side='right'), 1, len(times) - 1))
+        lower = upper - 1
+        span = times[upper] - times[lower]
+        blend = (t - times[lower]) / span if span > 1e-6 else 0.0
+        return values[lower] * (1.0 - blend) + values[upper] * blend
+    if len(times) == 1:
+        return lambda t: values[0]
+    return sample
+
+
+def encode_json_raw(clip):
+    return json.dumps(clip, indent=2).encode('utf-8')
+
+
+def encode_json_compact(clip):
+    return json.dumps(clip, separators=(',', ':')).encode('utf-8')
+
+
+def decode_json(data):
+    return lerp_sampler(*dense_values(json.loads(data)))
+
+
+def encode_binary_f32(clip):
+    times, values = dense_values(clip)
+    return (bone_table(clip) + struct.pack('<I', len(times))
+            + times.astype('<f4').tobytes() + values.astype('<f4').tobytes())
+
+
+def decode_binary_f32(data):
+    header, offset = read_bone_table(data)
+    (count,) = struct.unpack_from('<I', data, offset)
+    offset += 4
+    times = np.frombuffer(data, '<f4', count, offset).astype(np.float64)
+    offset += count * 4
+    values = np.frombuffer(data, '<f4', offset=offset).astype(np.float64)
+    return lerp_sampler(times, values.reshape(count, len(header["bones"]), COMPONENTS_PER_BONE))
+
+
+def encode_quantized_u16(clip):
+    times, values = dense_values(clip)
+    low = values.min(axis=0)
+    scale = values.max(axis=0) - low
+    quantized = np.round((values - low) / np.where(scale > 0, scale, 1.0) * 65535.0).astype('<u2')
+    return (bone_table(clip) + struct.pack('<I', len(times)) + times.astype('<f4').tobytes()
+            + low.astype('<f4').tobytes() + scale.astype('<f4').tobytes() + quantized.tobytes())
+
+
+def decode_quantized_u16(data):
+    header, offset = read_bone_table(data)
+    (count,) = struct.unpack_from('<I', data, offset)
+    offset += 4
+    shape = (len(header["bones"]), COMPONENTS_PER_BONE)
+    components = shape[0] * shape[1]
+    times = np.frombuffer(data, '<f4', count, offset).astype(np.float64)
+    offset += count * 4
+    low = np.frombuffer(data, '<f4', components, offset).astype(np.float64).reshape(shape)
+    offset += components * 4
+    scale = np.frombuffer(data, '<f4', components, offset).astype(np.float64).reshape(shape)
+    offset += components * 4
+    quantized = np.frombuffer(data, '<u2', offset=offset).reshape((count,) + shape)
+    return lerp_sampler(times, low + quantized / 65535.0 * scale)
+
+
+def encode_keyframe_reduced(clip):
+    return json.dumps(fit_clip(clip), separators=(',', ':')).encode('utf-8')
+
+
+def decode_keyframe_reduced(data):
+    spline = json.loads(data)
+    tracks = [track for bone_tracks in spline["tracks"] for track in bone_tracks]
+    bone_count = len(spline["tracks"])
+
+    # Pad every track to the same key count so all tracks evaluate at once;
+    # single-key tracks get a flat second key one second later
+    width = max(2, max(len(track["times"]) for track in tracks))
+    times = np.full((len(tracks), width), np.inf)
+    keys = np.zeros((len(tracks), width))
+    tangents = np.zeros((len(tracks), width))
+    counts = np.empty(len(tracks), dtype=np.int64)
+    for index, track in enumerate(tracks):
+        count = len(track["times"])
+        times[index, :count] = track["times"]
+        keys[index, :count] = track["values"]
+        tangents[index, :count] = track["tangents"]
+        if count == 1:
+            times[index, 1] = times[index, 0] + 1.0
+            keys[index, 1] = keys[index, 0]
+            count = 2
+        counts[index] = count
+    rows = np.arange(len(tracks))
+
+    def sample(t):
+        upper = np.clip((times <= t).sum(axis=1), 1, counts - 1)
+        lower = upper - 1
+        span = times[rows, upper] - times[rows, lower]
+        s = np.clip((t - times[rows, lower]) / span, 0.0, 1.0)
+        values = hermite(keys[rows, lower], tangents[rows, lower],
+                         keys[rows, upper], tangents[rows, upper], span, s)
+        return values.reshape(bone_count, COMPONENTS_PER_BONE)
+    return sample
+
+
+ENCODINGS = {
+    "json-raw": (encode_json_raw, decode_json),
+    "json-compact": (encode_json_compact, decode_json),
+    "binary-f32": (encode_binary_f32, decode_binary_f32),
+    "quantized-u16": (encode_quantized_u16, decode_quantized_u16),
+    "keyframe-reduced": (encode_keyframe_reduced, decode_keyframe_reduced),
+}
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def joint_positions(rows, parents):
+    """Model-space joint positions (B, 3) from (B, 12) local matrix rows"""
+    local = np.zeros((len(parents), 4, 4))
+    local[:, :3, :] = rows.reshape(-1, 3, 4)
+    local[:, 3, 3] = 1.0
+    world = np.empty_like(local)
+    for bone, parent in enumerate(parents):
+        world[bone] = local[bone] if parent < 0 else world[parent] @ local[bone]
+    return world[:, :3, 3]
+
+
+def best_time(function, repeats=TIMING_REPEATS):
+    """Return (result, fastest wall time in seconds) over several runs"""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def benchmark_clip(clip, encodings=ENCODINGS):
+    """Run every encoding on one clip and return {encoding: metrics}"""
+    parents = [bone["parentIndex"] for bone in clip["bones"]]
+    reference = lerp_sampler(*dense_values(clip))
+    error_times = np.linspace(0.0, clip["duration"], ERROR_SAMPLES)
+    reference_positions = [joint_positions(reference(t), parents) for t in error_times]
+    key_times = [keyframe["time"] for keyframe in clip["keyframes"]]
+    key_positions = [joint_positions(reference(t), parents) for t in key_times]
+    random_times = np.random.default_rng(SEED).uniform(0.0, clip["duration"], THROUGHPUT_SAMPLES)
+
+    results = {}
+    for name, (encode, decode) in encodings.items():
+        data, encode_seconds = best_time(lambda: encode(clip))
+        sampler, decode_seconds = best_time(lambda: decode(data))
+
+        start = time.perf_counter()
+        for t in random_times:
+            sampler(t)
+        sampling_seconds = time.perf_counter() - start
+
+        def position_errors(sample_times, expected_positions):
+            return np.concatenate([
+                np.linalg.norm(joint_positions(sampler(t), parents) - expected, axis=1)
+                for t, expected in zip(sample_times, expected_positions)
+            ])
+        distances = position_errors(error_times, reference_positions)
+        key_distances = position_errors(key_times, key_positions)
+        results[name] = {
+            "bytes": len(data),
+            "encodeMs": encode_seconds * 1000.0,
+            "decodeMs": decode_seconds * 1000.0,
+            "posesPerSecond": THROUGHPUT_SAMPLES / sampling_seconds,
+            "maxPositionError": float(distances.max()),
+            "meanPositionError": float(distances.mean()),
+            # At the dense keyframe times only, where encodings that interpolate
+            # differently from lerp (splines) are not penalised for it
+            "maxKeyPositionError": float(key_distances.max()),
+        }
+        print(f"  {name:17s} {len(data) / 1024:9.1f} KB  encode {encode_seconds * 1000:8.1f} ms  "
+              f"decode {decode_seconds * 1000:8.1f} ms  {results[name]['posesPerSecond']:9.0f} poses/s  "
+              f"error max {distances.max():.2e} mean {distances.mean():.2e} "
+              f"at keys {key_distances.max():.2e}")
+    return results
+
+
+def run_benchmark(clip_paths=SHIPPED_CLIPS, synthetic_sizes=SYNTHETIC_SIZES, output_path=OUTPUT_PATH):
+    """Benchmark shipped and synthetic clips and write the results JSON"""
+    clips = []
+    for path in clip_paths:
+        with open(path) as f:
+            clips.append((os.path.basename(path), json.load(f)))
+    for bones, frames in synthetic_sizes:
+        clip = synthetic_clip(bones, frames)
+        clips.append((clip["name"], clip))
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "settings": {
+            "throughputSamples": THROUGHPUT_SAMPLES,
+            "errorSamples": ERROR_SAMPLES,
+            "timingRepeats": TIMING_REPEATS,
+        },
+        "clips": {},
+    }
+    for name, clip in clips:
+        print(f"\n{name}: {len(clip['bones'])} bones, {len(clip['keyframes'])} keyframes")
+        report["clips"][name] = {
+            "bones": len(clip["bones"]),
+            "keyframes": len(clip["keyframes"]),
+            "duration": clip["duration"],
+            "encodings": benchmark_clip(clip),
+        }
+
+    with open(output_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults: {output_path}")
+    return report
+
+
+def parse_size(text):
+    """Parse a BONESxFRAMES synthetic clip size"""
+    bones, _, frames = text.lower().partition('x')
+    return int(bones), int(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark animation clip encodings")
+    parser.add_argument("clips", nargs="*", default=SHIPPED_CLIPS, help="JSON clips to include")
+    parser.add_argument("--synthetic", nargs="*", type=parse_size,
+                        default=SYNTHETIC_SIZES, help="synthetic clip sizes as BONESxFRAMES")
+    parser.add_argument("--output", default=OUTPUT_PATH, help="results JSON path")
+    args = parser.parse_args()
+
+    run_benchmark(args.clips, args.synthetic, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+"""
+Sound Bank Builder for MetalMan
+===============================
+Converts every effect in MetalMan/Sounds/ to one engine PCM format and packs
+them into a single bank file, so AudioManager can load all effects with one
+read instead of opening each WAV separately.
+
+For each WAV:
+- decode (16/24/32-bit PCM, 32-bit float and WAVE_FORMAT_EXTENSIBLE)
+- resample to ENGINE_SAMPLE_RATE with a windowed-sinc filter
+- trim leading/trailing silence (looping sounds are left untrimmed)
+- downmix to mono when the left and right channels are effectively identical
+- convert to 16-bit PCM
+
+The bank holds an entry table with byte offset/length, channel count and
+loop points, followed by the sample data. A JSON summary is written next to it.
+
+Usage:
+    python build_sound_bank.py
+    python build_sound_bank.py --list ../MetalMan/Sounds/effects.soundbank
+
+Requirements:
+- Python 3.9+ with NumPy (pip install numpy)
+"""
+
+import argparse
+import json
+import os
+import struct
+import wave
+
+import numpy as np
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SOUNDS_DIR = os.path.join(PROJECT_DIR, "MetalMan", "Sounds")
+OUTPUT_PATH = os.path.join(PROJECT_DIR, "MetalMan", "Sounds", "effects.soundbank")
+
+# Engine PCM format (16-bit signed integer samples)
+ENGINE_SAMPLE_RATE = 44100
+
+# Sounds played with numberOfLoops = -1 in AudioManager; these keep their
+# full length and loop over the whole sound unless the WAV has a smpl loop
+LOOPING_SOUNDS = {"footsteps"}
+
+# Samples below this level (-60 dBFS) count as silence when trimming
+SILENCE_THRESHOLD = 0.001
+
+# Audio kept before the first and after the last non-silent sample
+TRIM_PADDING_SECONDS = 0.005
+
+# Side/mid RMS ratio below which a stereo file is treated as mono (-40 dB)
+MONO_THRESHOLD = 0.01
+
+# Windowed-sinc resampler half-width, in source samples
+RESAMPLE_HALF_TAPS = 16
+
+BANK_MAGIC = b'MMSB'
+BANK_VERSION = 1
+NAME_LENGTH = 32
+DATA_ALIGNMENT = 16
+FLAG_LOOPING = 1
+
+_BANK_HEADER = struct.Struct('<4sHHIHHI')
+_BANK_ENTRY = struct.Struct(f'<{NAME_LENGTH}sBBHIIIII')
+
+# ============================================================================
+# DECODING
+# ============================================================================
+
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def pcm_to_float(data, sample_width, float_format=False):
+    """Convert interleaved little-endian sample bytes to float32 in [-1, 1]"""
+    if float_format:
+        dtype = '<f4' if sample_width == 4 else '<f8'
+        return np.frombuffer(data, dtype=dtype).astype(np.float32)
+    if sample_width == 1:
+        return (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    if sample_width == 2:
+        return np.frombuffer(data, dtype='<i2').astype(np.float32) / 32768.0
+    if sample_width == 3:
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        values = np.where(values & 0x800000, values - 0x1000000, values)
+        return values.astype(np.float32) / 8388608.0
+    if sample_width == 4:
+        return np.frombuffer(data, dtype='<i4').astype(np.float32) / 2147483648.0
+    raise ValueError(f"Unsupported sample width: {sample_width}")
+
+
+def read_riff_chunks(path):
+    """Return {chunk id: bytes} for the top-level chunks of a RIFF/WAVE file"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise ValueError(f"{path} is not a RIFF/WAVE file")
+
+    chunks = {}
+    position = 12
+    while position + 8 <= len(data):
+        chunk_id, size = struct.unpack_from('<4sI', data, position)
+        chunks.setdefault(chunk_id, data[position + 8:position + 8 + size])
+        position += 8 + size + (size & 1)
+    return chunks
+
+
+def read_wav(path):
+    """
+    Decode a WAV file.
+
+    Uses the standard wave module for integer PCM and falls back to parsing
+    the RIFF chunks for float and WAVE_FORMAT_EXTENSIBLE files, which wave
+    cannot open. Returns (samples as float32 [frames, channels], sample rate,
+    loop points from a smpl chunk as (start, end) frames or None).
+    """
+    chunks = read_riff_chunks(path)
+    try:
+        with wave.open(path, 'rb') as wav:
+            channels = wav.getnchannels()
+            rate = wav.getframerate()
+            samples = pcm_to_float(wav.readframes(wav.getnframes()), wav.getsampwidth())
+    except wave.Error:
+        format_tag, channels, rate, _, _, bits = struct.unpack_from('<HHIIHH', chunks[b'fmt '])
+        if format_tag == WAVE_FORMAT_EXTENSIBLE:
+            # The sub-format GUID starts with the real format tag
+            format_tag = struct.unpack_from('<H', chunks[b'fmt '], 24)[0]
+        if format_tag not in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT):
+            raise ValueError(f"{path}: unsupported WAV format {format_tag}")
+        samples = pcm_to_float(chunks[b'data'], bits // 8, format_tag == WAVE_FORMAT_IEEE_FLOAT)
+
+    samples = samples[:len(samples) // channels * channels].reshape(-1, channels)
+
+    loop = None
+    smpl = chunks.get(b'smpl')
+    if smpl and len(smpl) >= 36 + 24 and struct.unpack_from('<I', smpl, 28)[0] > 0:
+        loop_start, loop_end = struct.unpack_from('<II', smpl, 36 + 8)
+        loop = (loop_start, loop_end + 1)
+
+    return samples, rate, loop
+
+# ============================================================================
+# PROCESSING
+# ============================================================================
+
+def resample(samples, source_rate, target_rate, half_taps=RESAMPLE_HALF_TAPS):
+    """
+    Resample [frames, channels] audio with a Blackman-windowed sinc filter.
+
+    The cutoff sits at the lower of the two Nyquist frequencies, so
+    downsampling does not alias.
+    """
+    if source_rate == target_rate or len(samples) == 0:
+        return samples
+
+    ratio = source_rate / target_rate
+    cutoff = min(1.0, 1.0 / ratio)
+    output_frames = int(round(len(samples) / ratio))
+    taps = np.arange(-half_taps + 1, half_taps + 1)
+    padded = np.pad(samples, ((half_taps, half_taps), (0, 0)))
+    output = np.empty((output_frames, samples.shape[1]), dtype=np.float32)
+
+    chunk = 16384
+    for start in range(0, output_frames, chunk):
+        positions = np.arange(start, min(start + chunk, output_frames)) * ratio
+        base = np.floor(positions).astype(np.int64)
+        indices = base[:, None] + taps[None, :]
+        distance = positions[:, None] - indices
+        window = 0.42 + 0.5 * np.cos(np.pi * distance / half_taps) + 0.08 * np.cos(2 * np.pi * distance / half_taps)
+        weights = cutoff * np.sinc(cutoff * distance) * np.where(np.abs(distance) < half_taps, window, 0.0)
+        weights /= np.maximum(weights.sum(axis=1, keepdims=True), 1e-8)
+        gathered = padded[np.clip(indices + half_taps, 0, len(padded) - 1)]
+        output[start:start + len(positions)] = np.einsum('nt,ntc->nc', weights, gathered)
+
+    return output
+
+
+def trim_silence(samples, rate):
+    """Trim leading/trailing silence, keeping TRIM_PADDING_SECONDS on each side"""
+    loud = np.flatnonzero(np.abs(samples).max(axis=1) > SILENCE_THRESHOLD)
+    if len(loud) == 0:
+        return samples[:1], 0
+    padding = int(TRIM_PADDING_SECONDS * rate)
+    start = max(0, loud[0] - padding)
+    end = min(len(samples), loud[-1] + 1 + padding)
+    return samples[start:end], int(start)
+
+
+def is_effectively_mono(samples):
+    """True if a stereo signal's side channel is negligible next to its mid channel"""
+    if samples.shape[1] != 2:
+        return samples.shape[1] == 1
+    mid = (samples[:, 0] + samples[:, 1]) * 0.5
+    side = (samples[:, 0] - samples[:, 1]) * 0.5
+    mid_rms = np.sqrt(np.mean(mid.astype(np.float64) ** 2))
+    side_rms = np.sqrt(np.mean(side.astype(np.float64) ** 2))
+    return mid_rms == 0 or side_rms / mid_rms < MONO_THRESHOLD
+
+
+def to_pcm16(samples):
+    """Quantize float samples to interleaved little-endian 16-bit PCM"""
+    return (np.clip(samples, -1.0, 1.0) * 32767.0).round().astype('<i2').tobytes()
+
+
+def process_sound(path):
+    """Convert one WAV to the engine format; returns the bank entry fields and PCM bytes"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    samples, rate, loop = read_wav(path)
+    source = {"rate": rate, "channels": samples.shape[1], "frames": len(samples),
+              "bytes": os.path.getsize(path)}
+
+    looping = name in LOOPING_SOUNDS or loop is not None
+    samples = resample(samples, rate, ENGINE_SAMPLE_RATE)
+    scale = ENGINE_SAMPLE_RATE / rate
+
+    trim_start = 0
+    if not looping:
+        samples, trim_start = trim_silence(samples, ENGINE_SAMPLE_RATE)
+
+    if samples.shape[1] > 1 and is_effectively_mono(samples):
+        samples = samples.mean(axis=1, keepdims=True)
+
+    if loop is not None:
+        loop_start = min(int(round(loop[0] * scale)), len(samples))
+        loop_end = min(int(round(loop[1] * scale)), len(samples))
+    elif looping:
+        loop_start, loop_end = 0, len(samples)
+    else:
+        loop_start = loop_end = 0
+
+    return {
+        "name": name,
+        "channels": samples.shape[1],
+        "frames": len(samples),
+        "looping": looping,
+        "loopStart": loop_start,
+        "loopEnd": loop_end,
+        "trimmedFrames": trim_start,
+        "source": source,
+    }, to_pcm16(samples)
+
+# ============================================================================
+# BANK FILE
+# ============================================================================
+
+def write_bank(path, entries, payloads):
+    """
+    Write the sound bank (little-endian):
+        header: magic 'MMSB', version u16, bits per sample u16,
+                sample rate u32, entry count u16, reserved u16, data offset u32
+        entries: name (32 bytes, NUL-padded), channels u8, flags u8 (1 = looping),
+                 reserved u16, byte offset u32, byte length u32, frame count u32,
+                 loop start u32, loop end u32 (frames)
+        sample data: interleaved 16-bit PCM, each sound aligned to 16 bytes
+    """
+    table_end = _BANK_HEADER.size + _BANK_ENTRY.size * len(entries)
+    data_offset = table_end + (-table_end % DATA_ALIGNMENT)
+
+    body = bytearray()
+    for entry, payload in zip(entries, payloads):
+        body += b'\0' * (-len(body) % DATA_ALIGNMENT)
+        entry["offset"] = data_offset + len(body)
+        entry["length"] = len(payload)
+        body += payload
+
+    with open(path, 'wb') as f:
+        f.write(_BANK_HEADER.pack(BANK_MAGIC, BANK_VERSION, 16, ENGINE_SAMPLE_RATE,
+                                  len(entries), 0, data_offset))
+        for entry in entries:
+            name = entry["name"].encode('utf-8')
+            if len(name) >= NAME_LENGTH:
+                raise ValueError(f"Sound name too long for the bank table: {entry['name']}")
+            f.write(_BANK_ENTRY.pack(
+                name, entry["channels"], FLAG_LOOPING if entry["looping"] else 0, 0,
+                entry["offset"], entry["length"], entry["frames"],
+                entry["loopStart"], entry["loopEnd"]
+            ))
+        f.write(b'\0' * (data_offset - table_end))
+        f.write(body)
+
+
+def read_bank(path):
+    """Read a bank's header and entry table; returns (header dict, [entry dicts])"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, bits, rate, count, _, data_offset = _BANK_HEADER.unpack_from(data, 0)
+    if magic != BANK_MAGIC:
+        raise ValueError(f"{path} is not a sound bank")
+
+    entries = []
+    for index in range(count):
+        (name, channels, flags, _, offset, length, frames,
+         loop_start, loop_end) = _BANK_ENTRY.unpack_from(data, _BANK_HEADER.size + index * _BANK_ENTRY.size)
+        entries.append({
+            "name": name.rstrip(b'\0').decode('utf-8'),
+            "channels": channels,
+            "looping": bool(flags & FLAG_LOOPING),
+            "offset": offset,
+            "length": length,
+            "frames": frames,
+            "loopStart": loop_start,
+            "loopEnd": loop_end,
+        })
+    header = {"version": version, "bitsPerSample": bits, "sampleRate": rate, "dataOffset": data_offset}
+    return header, entries
+
+
+def build_sound_bank(sounds_dir=SOUNDS_DIR, output_path=OUTPUT_PATH):
+    """Convert every WAV in sounds_dir and write the bank plus a JSON summary"""
+    wav_files = sorted(f for f in os.listdir(sounds_dir) if f.lower().endswith('.wav'))
+    print(f"Found {len(wav_files)} WAV files in {sounds_dir}")
+
+    entries = []
+    payloads = []
+    for filename in wav_files:
+        entry, payload = process_sound(os.path.join(sounds_dir, filename))
+        entries.append(entry)
+        payloads.append(payload)
+        source = entry["source"]
+        print(f"  {entry['name']}: {source['rate']} Hz x{source['channels']} -> "
+              f"{ENGINE_SAMPLE_RATE} Hz x{entry['channels']}, "
+              f"{entry['frames'] / ENGINE_SAMPLE_RATE:.2f}s, "
+              f"{source['bytes'] / 1024:.0f} KB -> {len(payload) / 1024:.0f} KB"
+              f"{' (looping)' if entry['looping'] else ''}")
+
+    write_bank(output_path, entries, payloads)
+
+    summary_path = os.path.splitext(output_path)[0] + ".json"
+    with open(summary_path, 'w') as f:
+        json.dump({"sampleRate": ENGINE_SAMPLE_RATE, "bitsPerSample": 16, "sounds": entries}, f, indent=2)
+
+    source_total = sum(entry["source"]["bytes"] for entry in entries)
+    print(f"\nWrote {output_path} ({os.path.getsize(output_path) / 1024:.0f} KB, "
+          f"sources {source_total / 1024:.0f} KB)")
+    print(f"Summary: {summary_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack WAV sound effects into one sound bank")
+    parser.add_argument("--sounds", default=SOUNDS_DIR, help="directory of source WAV files")
+    parser.add_argument("--output", default=OUTPUT_PATH, help="bank file to write")
+    parser.add_argument("--list", metavar="BANK", help="print the entry table of an existing bank")
+    args = parser.parse_args()
+
+    if args.list:
+        header, entries = read_bank(args.list)
+        print(f"{header['sampleRate']} Hz, {header['bitsPerSample']}-bit, {len(entries)} sounds")
+        for entry in entries:
+            print(f"  {entry['name']:<24} ch={entry['channels']} frames={entry['frames']:<8} "
+                  f"offset={entry['offset']:<9} loop={entry['loopStart']}-{entry['loopEnd']}"
+                  f"{' looping' if entry['looping'] else ''}")
+        return
+
+    build_sound_bank(args.sounds, args.output)
+
+
+if __name__ == "__main__":
+    main()
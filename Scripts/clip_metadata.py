@@ -0,0 +1,188 @@
+"""
+Clip Metadata for MetalMan
+==========================
+Samples an animation clip's frame range once and writes the sidecars the game
+loads next to an exported clip, shared by the USDZ exporters in
+MetalMan/Scripts (the skinned-mesh bounds helpers are also used by
+export_animation.py):
+
+- <name>-events.json: footstep and swing timings (see event_tracks.py)
+- <name>-bounds.json: per-frame and whole-clip armature-space AABBs of the
+  skinned meshes, for culling without CPU skinning
+- <name>-clip.json: local bone matrices per frame in the export_animation.py
+  JSON format, loaded by the game in place of runtime USDZ extraction and by
+  the bone-matrix texture baker
+
+Usage (inside Blender, with the clip's armature in the scene):
+    sys.path.insert(0, SCRIPTS_DIR)
+    from clip_metadata import export_clip_metadata
+    export_clip_metadata(armature, output_path, events=True, bounds=True, bone_clips=True)
+
+Requirements:
+- Blender 3.6+ (bpy)
+"""
+
+import json
+import os
+
+import bpy
+from mathutils import Vector
+
+from event_tracks import detect_events, find_event_bones, sample_event_points
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Padding added to the whole-clip bounds, as a fraction of its largest extent
+CLIP_BOUNDS_PADDING = 0.02
+
+# ============================================================================
+# SAMPLING
+# ============================================================================
+
+def get_skinned_meshes(armature):
+    """Mesh objects deformed by the armature"""
+    return [
+        obj for obj in bpy.context.scene.objects
+        if obj.type == 'MESH' and any(
+            modifier.type == 'ARMATURE' and modifier.object == armature
+            for modifier in obj.modifiers
+        )
+    ]
+
+
+def sample_mesh_bounds(armature, meshes):
+    """
+    Armature-space AABB of the evaluated (skinned) meshes at the current frame.
+    Returns {"min": [x, y, z], "max": [x, y, z]}, or None without meshes.
+    """
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    to_armature = armature.matrix_world.inverted()
+    points = []
+    for obj in meshes:
+        evaluated = obj.evaluated_get(depsgraph)
+        matrix = to_armature @ evaluated.matrix_world
+        points.extend(matrix @ Vector(corner) for corner in evaluated.bound_box)
+    if not points:
+        return None
+    return {
+        "min": [round(min(point[axis] for point in points), 5) for axis in range(3)],
+        "max": [round(max(point[axis] for point in points), 5) for axis in range(3)]
+    }
+
+
+def merge_bounds(boxes, padding=CLIP_BOUNDS_PADDING):
+    """
+    Conservative union of per-frame bounds, grown by padding (a fraction of
+    the largest extent) to cover motion between sampled frames.
+    """
+    boxes = [box for box in boxes if box]
+    if not boxes:
+        return None
+    low = [min(box["min"][axis] for box in boxes) for axis in range(3)]
+    high = [max(box["max"][axis] for box in boxes) for axis in range(3)]
+    margin = max(h - l for l, h in zip(low, high)) * padding
+    return {
+        "min": [round(value - margin, 5) for value in low],
+        "max": [round(value + margin, 5) for value in high]
+    }
+
+
+def get_bone_transform(pose_bone):
+    """Get the local transform matrix of a pose bone (armature space for the root)"""
+    if pose_bone.parent:
+        return pose_bone.parent.matrix.inverted() @ pose_bone.matrix
+    return pose_bone.matrix
+
+
+def matrix_to_list(matrix):
+    """Convert a Blender matrix to a flat list (column-major for Metal/simd)"""
+    return [matrix[row][col] for col in range(4) for row in range(4)]
+
+
+def build_bone_clip(armature, name, duration, fps, keyframes):
+    """Clip dictionary in the export_animation.py JSON format"""
+    bone_index = {bone.name: index for index, bone in enumerate(armature.pose.bones)}
+    bones = [
+        {
+            "name": bone.name.replace(":", "_"),
+            "index": index,
+            "parentIndex": bone_index[bone.parent.name] if bone.parent else -1
+        }
+        for index, bone in enumerate(armature.pose.bones)
+    ]
+    return {
+        "name": name,
+        "duration": duration,
+        "fps": fps,
+        "boneCount": len(bones),
+        "keyframeCount": len(keyframes),
+        "bones": bones,
+        "keyframes": keyframes
+    }
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+def export_clip_metadata(armature, output_path, events=True, bounds=True, bone_clips=True):
+    """
+    Sample the scene's frame range once and write the enabled clip sidecars
+    next to the exported clip at output_path:
+    - events: <name>-events.json
+    - bounds: <name>-bounds.json (skipped when the armature has no skinned meshes)
+    - bone_clips: <name>-clip.json
+    """
+    scene = bpy.context.scene
+    fps = scene.render.fps
+    name = os.path.splitext(os.path.basename(output_path))[0]
+    base_path = os.path.splitext(output_path)[0]
+    event_bones = find_event_bones(armature)
+    meshes = get_skinned_meshes(armature) if bounds else []
+
+    samples = []
+    frame_bounds = []
+    bone_keyframes = []
+    times = []
+    for frame in range(scene.frame_start, scene.frame_end + 1):
+        scene.frame_set(frame)
+        times.append((frame - scene.frame_start) / fps)
+        if events:
+            samples.append(sample_event_points(armature, event_bones))
+        if meshes:
+            frame_bounds.append(sample_mesh_bounds(armature, meshes))
+        if bone_clips:
+            bone_keyframes.append({
+                "time": times[-1],
+                "boneTransforms": [matrix_to_list(get_bone_transform(bone)) for bone in armature.pose.bones]
+            })
+
+    duration = (scene.frame_end - scene.frame_start) / fps
+
+    if events:
+        clip_events = detect_events(samples, times, duration, name)
+        events_path = f"{base_path}-events.json"
+        with open(events_path, 'w') as f:
+            json.dump({"name": name, "duration": duration, "events": clip_events}, f, indent=2)
+        print(f"  Wrote {len(clip_events)} events: {events_path}")
+
+    if meshes:
+        bounds_path = f"{base_path}-bounds.json"
+        with open(bounds_path, 'w') as f:
+            json.dump({
+                "name": name,
+                "duration": duration,
+                "bounds": merge_bounds(frame_bounds),
+                "keyframes": [
+                    {"time": round(time, 4), "bounds": box}
+                    for time, box in zip(times, frame_bounds)
+                ]
+            }, f)
+        print(f"  Wrote {len(frame_bounds)} frame bounds: {bounds_path}")
+
+    if bone_clips:
+        clip_path = f"{base_path}-clip.json"
+        with open(clip_path, 'w') as f:
+            json.dump(build_bone_clip(armature, name, duration, fps, bone_keyframes), f)
+        print(f"  Wrote {len(bone_keyframes)} bone keyframes: {clip_path}")
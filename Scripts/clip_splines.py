@@ -0,0 +1,268 @@
+"""
+Hermite Spline Clips for MetalMan
+=================================
+Fits per-track cubic Hermite splines to densely sampled JSON clips (the
+export_animation.py format), so a clip can keep only the keys it needs to
+stay within an error tolerance instead of one key per sampled frame.
+
+Every bone matrix component (top three rows, 12 per bone) is a track, fitted
+independently, matching the component-wise lerpMatrix blending the runtime
+uses. Keys are the sample values plus tangents estimated from the dense
+data; a segment is split at its worst sample until every sample is within
+tolerance.
+
+Also contains the reference evaluator for the spline format, and a check
+that reports the max error of the splines against the dense bake.
+
+Usage:
+    python clip_splines.py ../MetalMan/Animations/Walking_animation.json --check
+    python clip_splines.py Walking_animation.json --rotation-tolerance 0.002 --output walking_spline.json
+
+export_animation.py uses this module for its spline export mode.
+
+Requirements:
+- Python 3.9+ with NumPy (pip install numpy)
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Max error for the rotation/scale part of a bone matrix (unitless)
+ROTATION_TOLERANCE = 1e-3
+
+# Max error for the translation column (armature units, centimetres for Mixamo rigs)
+TRANSLATION_TOLERANCE = 0.01
+
+# Components kept per bone: the top three rows of the matrix, row-major
+COMPONENTS_PER_BONE = 12
+
+# Row-major component index of the translation column (m[r][3])
+TRANSLATION_COMPONENTS = (3, 7, 11)
+
+# ============================================================================
+# FITTING
+# ============================================================================
+
+def clip_tracks(clip):
+    """
+    Dense tracks of a JSON clip.
+
+    Returns (times (K,), values (K, B * 12)) with the top three rows of each
+    bone matrix, row-major.
+    """
+    times = np.array([keyframe["time"] for keyframe in clip["keyframes"]], dtype=np.float64)
+    # boneTransforms are column-major; transpose to row-major and drop the bottom row
+    matrices = np.array([keyframe["boneTransforms"] for keyframe in clip["keyframes"]], dtype=np.float64)
+    matrices = matrices.reshape(len(times), -1, 4, 4).transpose(0, 1, 3, 2)
+    return times, matrices[:, :, :3, :].reshape(len(times), -1)
+
+
+def sample_tangents(times, values):
+    """Slopes at every sample: central differences inside, one-sided at the ends"""
+    tangents = np.empty_like(values)
+    if len(times) < 2:
+        tangents[:] = 0.0
+        return tangents
+    tangents[1:-1] = (values[2:] - values[:-2]) / (times[2:] - times[:-2])[:, None]
+    tangents[0] = (values[1] - values[0]) / (times[1] - times[0])
+    tangents[-1] = (values[-1] - values[-2]) / (times[-1] - times[-2])
+    return tangents
+
+
+def hermite(p0, m0, p1, m1, span, s):
+    """Cubic Hermite interpolation at parameter s in [0, 1] over a segment of length span"""
+    s2 = s * s
+    s3 = s2 * s
+    return ((2 * s3 - 3 * s2 + 1) * p0 + (s3 - 2 * s2 + s) * span * m0
+            + (-2 * s3 + 3 * s2) * p1 + (s3 - s2) * span * m1)
+
+
+def fit_track(times, values, tangents, tolerance):
+    """
+    Choose the sample indices to keep as keys for one track.
+
+    Starts from the end samples and splits each segment at its worst sample
+    until every sample lies within tolerance. Constant tracks keep one key.
+    """
+    if np.ptp(values) <= tolerance:
+        return [0]
+
+    keys = {0, len(times) - 1}
+    pending = [(0, len(times) - 1)]
+    while pending:
+        a, b = pending.pop()
+        if b - a < 2:
+            continue
+        inner = np.arange(a + 1, b)
+        span = times[b] - times[a]
+        s = (times[inner] - times[a]) / span
+        fitted = hermite(values[a], tangents[a], values[b], tangents[b], span, s)
+        errors = np.abs(fitted - values[inner])
+        worst = int(np.argmax(errors))
+        if errors[worst] > tolerance:
+            split = int(inner[worst])
+            keys.add(split)
+            pending.extend([(a, split), (split, b)])
+    return sorted(keys)
+
+
+def fit_clip(clip, rotation_tolerance=ROTATION_TOLERANCE, translation_tolerance=TRANSLATION_TOLERANCE):
+    """
+    Fit Hermite tracks to a dense JSON clip.
+
+    Returns the spline clip: the clip's fields without keyframes, plus
+    "format": "hermite" and per bone a list of 12 tracks, each
+    {"times": [...], "values": [...], "tangents": [...]} (tangents in units per second).
+    """
+    times, values = clip_tracks(clip)
+    tangents = sample_tangents(times, values)
+
+    bone_tracks = []
+    for bone in range(values.shape[1] // COMPONENTS_PER_BONE):
+        tracks = []
+        for component in range(COMPONENTS_PER_BONE):
+            column = bone * COMPONENTS_PER_BONE + component
+            tolerance = translation_tolerance if component in TRANSLATION_COMPONENTS else rotation_tolerance
+            keys = fit_track(times, values[:, column], tangents[:, column], tolerance)
+            if len(keys) == 1:
+                track_tangents = [0.0]
+            else:
+                track_tangents = tangents[keys, column].tolist()
+            tracks.append({
+                "times": times[keys].tolist(),
+                "values": values[keys, column].tolist(),
+                "tangents": track_tangents,
+            })
+        bone_tracks.append(tracks)
+
+    spline = {key: value for key, value in clip.items() if key not in ("keyframes", "keyframeCount")}
+    spline["format"] = "hermite"
+    spline["tracks"] = bone_tracks
+    return spline
+
+# ============================================================================
+# REFERENCE EVALUATOR
+# ============================================================================
+
+def evaluate_track(track, time):
+    """Evaluate one Hermite track at a time in seconds (clamped to its key range)"""
+    times = track["times"]
+    values = track["values"]
+    if len(times) == 1 or time <= times[0]:
+        return values[0]
+    if time >= times[-1]:
+        return values[-1]
+
+    # Last key at or before time
+    low, high = 0, len(times) - 1
+    while high - low > 1:
+        middle = (low + high) // 2
+        if times[middle] <= time:
+            low = middle
+        else:
+            high = middle
+
+    span = times[high] - times[low]
+    s = (time - times[low]) / span
+    return hermite(values[low], track["tangents"][low], values[high], track["tangents"][high], span, s)
+
+
+def evaluate_clip(spline, time):
+    """
+    Evaluate every bone of a spline clip at a time in seconds.
+
+    Returns column-major 4x4 matrices as flat 16-float lists, like the
+    boneTransforms of a JSON keyframe.
+    """
+    matrices = []
+    for tracks in spline["tracks"]:
+        rows = [evaluate_track(track, time) for track in tracks]
+        matrices.append([rows[r * 4 + c] if r < 3 else (1.0 if c == 3 else 0.0)
+                         for c in range(4) for r in range(4)])
+    return matrices
+
+
+def key_count(spline):
+    """Total number of keys across all tracks"""
+    return sum(len(track["times"]) for tracks in spline["tracks"] for track in tracks)
+
+# ============================================================================
+# CHECKING
+# ============================================================================
+
+def check_spline(clip, spline):
+    """
+    Compare a spline clip with the dense bake it was fitted to.
+
+    Returns the max rotation and translation error at the dense samples
+    (bounded by the fitting tolerances), and the max deviation at segment
+    midpoints from the runtime's linear blend of the dense keys.
+    """
+    times, values = clip_tracks(clip)
+    columns = np.arange(values.shape[1]) % COMPONENTS_PER_BONE
+    translation = np.isin(columns, TRANSLATION_COMPONENTS)
+
+    def errors(sample_times, reference):
+        fitted = np.array([
+            np.array(evaluate_clip(spline, t)).reshape(-1, 4, 4).transpose(0, 2, 1)[:, :3, :].ravel()
+            for t in sample_times
+        ])
+        difference = np.abs(fitted - reference)
+        return float(difference[:, ~translation].max()), float(difference[:, translation].max())
+
+    result = {}
+    result["sampleRotationError"], result["sampleTranslationError"] = errors(times, values)
+    if len(times) > 1:
+        midpoints = (times[:-1] + times[1:]) * 0.5
+        result["midpointRotationDeviation"], result["midpointTranslationDeviation"] = \
+            errors(midpoints, (values[:-1] + values[1:]) * 0.5)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit Hermite spline tracks to a dense JSON clip")
+    parser.add_argument("clip", help="dense JSON clip from export_animation.py")
+    parser.add_argument("--output", help="spline clip path (default: <clip>_spline.json)")
+    parser.add_argument("--rotation-tolerance", type=float, default=ROTATION_TOLERANCE)
+    parser.add_argument("--translation-tolerance", type=float, default=TRANSLATION_TOLERANCE)
+    parser.add_argument("--check", action="store_true",
+                        help="report the max error against the dense bake and fail if over tolerance")
+    args = parser.parse_args()
+
+    with open(args.clip) as f:
+        clip = json.load(f)
+    spline = fit_clip(clip, args.rotation_tolerance, args.translation_tolerance)
+
+    output = args.output or os.path.splitext(args.clip)[0] + "_spline.json"
+    with open(output, 'w') as f:
+        json.dump(spline, f, separators=(',', ':'))
+
+    dense_keys = len(clip["keyframes"]) * len(clip["bones"]) * COMPONENTS_PER_BONE
+    keys = key_count(spline)
+    print(f"{os.path.basename(args.clip)}: {dense_keys} dense keys -> {keys} spline keys "
+          f"({keys / dense_keys:.1%}), {os.path.getsize(args.clip) / 1024:.0f} KB -> "
+          f"{os.path.getsize(output) / 1024:.0f} KB")
+    print(f"Output: {output}")
+
+    if args.check:
+        result = check_spline(clip, spline)
+        for name, value in result.items():
+            print(f"  {name}: {value:.2e}")
+        # Small slack for float round-off in the evaluator
+        if (result["sampleRotationError"] > args.rotation_tolerance * 1.0001
+                or result["sampleTranslationError"] > args.translation_tolerance * 1.0001):
+            print("FAILED: spline exceeds the tolerance at a dense sample")
+            sys.exit(1)
+        print("OK: every dense sample is within tolerance")
+
+
+if __name__ == "__main__":
+    main()
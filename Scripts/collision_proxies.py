@@ -0,0 +1,203 @@
+"""
+Collision Proxy Fitting for MetalMan
+====================================
+Fits the collision proxies written next to the character LOD source clips
+(<clip>-colliders.json), shared by the USDZ exporters in MetalMan/Scripts:
+
+- a body circle in the Collider conventions of GameTypes.swift, for movement
+- one hit capsule per CAPSULE_BONES bone, in rest-pose armature space
+
+Usage (inside Blender, from an exporter with the armature's clip loaded):
+    sys.path.insert(0, SCRIPTS_DIR)
+    from collision_proxies import export_collision_proxies
+    export_collision_proxies(armature, meshes, output_path, target_height)
+
+Requirements:
+- Blender 3.6+ (bpy) with NumPy
+"""
+
+import json
+import os
+
+import bpy
+import numpy as np
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Percentile of the vertices' horizontal distance used as the body circle radius,
+# so outstretched hands and weapons do not widen it
+BODY_RADIUS_PERCENTILE = 90
+
+# Bones that get a hit capsule (name suffixes). Vertices weighted to other bones
+# count towards their nearest listed ancestor (fingers to the hand, neck to Spine2)
+CAPSULE_BONES = [
+    "Hips", "Spine", "Spine2", "Head",
+    "LeftArm", "LeftForeArm", "LeftHand", "RightArm", "RightForeArm", "RightHand",
+    "LeftUpLeg", "LeftLeg", "LeftFoot", "RightUpLeg", "RightLeg", "RightFoot",
+]
+
+# Percentile of the vertices' distance from the bone axis used as the capsule radius
+CAPSULE_RADIUS_PERCENTILE = 95
+
+# Bones with fewer weighted vertices get no capsule
+MIN_CAPSULE_VERTICES = 12
+
+# ============================================================================
+# FITTING
+# ============================================================================
+
+def find_pose_bone(armature, suffix):
+    """Find a pose bone whose name ends with suffix (e.g. mixamorig:LeftFoot)"""
+    for bone in armature.pose.bones:
+        if bone.name.endswith(suffix):
+            return bone
+    return None
+
+
+def capsule_bone_map(armature):
+    """Map every bone name to the CAPSULE_BONES bone it counts towards (itself or its nearest listed ancestor)"""
+    listed = {bone.name for bone in (find_pose_bone(armature, suffix) for suffix in CAPSULE_BONES) if bone}
+    mapping = {}
+    for bone in armature.data.bones:
+        current = bone
+        while current and current.name not in listed:
+            current = current.parent
+        if current:
+            mapping[bone.name] = current.name
+    return mapping
+
+
+def skinned_rest_vertices(armature, meshes):
+    """
+    Rest-pose armature-space positions of the skinned vertices, and the
+    CAPSULE_BONES bone each vertex is weighted to most.
+    """
+    mapping = capsule_bone_map(armature)
+    to_armature = armature.matrix_world.inverted()
+    positions = []
+    owners = []
+    for obj in meshes:
+        matrix = np.array(to_armature @ obj.matrix_world)
+        group_names = [group.name for group in obj.vertex_groups]
+        coords = np.empty(len(obj.data.vertices) * 3, dtype=np.float64)
+        obj.data.vertices.foreach_get('co', coords)
+        coords = coords.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+        for vertex, co in zip(obj.data.vertices, coords):
+            weights = [(group.weight, group_names[group.group]) for group in vertex.groups
+                       if group.group < len(group_names) and group_names[group.group] in mapping]
+            if weights:
+                positions.append(co)
+                owners.append(mapping[max(weights)[1]])
+    return np.array(positions).reshape(-1, 3), np.array(owners)
+
+
+def fit_capsule(points, head, tail):
+    """
+    Capsule around points along a bone: the segment spans the points along the
+    bone axis and the radius is the CAPSULE_RADIUS_PERCENTILE of their
+    distance from the axis. Returns (start, end, radius).
+    """
+    axis = tail - head
+    length = np.linalg.norm(axis)
+    axis = axis / length if length > 1e-6 else np.array([0.0, 1.0, 0.0])
+    along = (points - head) @ axis
+    radial = np.linalg.norm(points - head - np.outer(along, axis), axis=1)
+    radius = float(np.percentile(radial, CAPSULE_RADIUS_PERCENTILE))
+    low, high = along.min() + radius, along.max() - radius
+    if low > high:
+        low = high = (along.min() + along.max()) / 2
+    return head + axis * low, head + axis * high, radius
+
+
+def fit_body_circle(meshes, target_height):
+    """
+    Circle collider around the evaluated (skinned) meshes at the current frame,
+    in the character space the Renderer draws the model in: scaled to
+    target_height, centred on XZ, feet at y = 0 and turned by pi.
+
+    Returns: (collider dict, scale from Blender units to game units)
+    """
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    points = []
+    for obj in meshes:
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = evaluated.to_mesh()
+        coords = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+        mesh.vertices.foreach_get('co', coords)
+        evaluated.to_mesh_clear()
+        matrix = np.array(evaluated.matrix_world)
+        points.append(coords.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3])
+    points = np.concatenate(points)
+
+    # Blender Z-up to game Y-up, then rotationY(.pi) like the model matrix
+    game = np.stack([-points[:, 0], points[:, 2], points[:, 1]], axis=1)
+    low, high = game.min(axis=0), game.max(axis=0)
+    scale = target_height / max(high[1] - low[1], 1e-6)
+    origin = np.array([(low[0] + high[0]) / 2, low[1], (low[2] + high[2]) / 2])
+    ground = (game - origin)[:, [0, 2]] * scale
+
+    center = np.median(ground, axis=0)
+    radius = float(np.percentile(np.linalg.norm(ground - center, axis=1), BODY_RADIUS_PERCENTILE))
+    collider = {
+        "type": "circle",
+        "position": [round(float(value), 5) for value in center],
+        "radius": round(radius, 5),
+        "halfExtents": [0.0, 0.0],
+        "rotation": 0.0,
+        "height": 0.0,
+        "baseY": 0.0
+    }
+    return collider, scale
+
+
+def export_collision_proxies(armature, meshes, output_path, target_height):
+    """
+    Write <name>-colliders.json next to the exported USDZ:
+    - "collider": body circle in the Collider conventions of GameTypes.swift
+      (position is X, Z), fitted at the clip's first frame, for movement
+    - "capsules": one hit capsule per CAPSULE_BONES bone in rest-pose armature
+      space (like -bounds.json). Transform start/end by the bone's skinning
+      matrix and multiply the radius by "scale" for game units
+
+    meshes are the armature's skinned meshes; target_height is the height the
+    Renderer scales the character to.
+    """
+    scene = bpy.context.scene
+    name = os.path.splitext(os.path.basename(output_path))[0]
+    if not meshes:
+        print("  WARNING: No skinned meshes, skipping collision proxies")
+        return
+
+    scene.frame_set(scene.frame_start)
+    collider, scale = fit_body_circle(meshes, target_height)
+    points, owners = skinned_rest_vertices(armature, meshes)
+
+    capsules = []
+    for suffix in CAPSULE_BONES:
+        pose_bone = find_pose_bone(armature, suffix)
+        if not pose_bone:
+            continue
+        bone_points = points[owners == pose_bone.name]
+        if len(bone_points) < MIN_CAPSULE_VERTICES:
+            continue
+        start, end, radius = fit_capsule(bone_points, np.array(pose_bone.bone.head_local),
+                                         np.array(pose_bone.bone.tail_local))
+        capsules.append({
+            "bone": pose_bone.name.replace(":", "_"),
+            "start": [round(float(value), 5) for value in start],
+            "end": [round(float(value), 5) for value in end],
+            "radius": round(radius, 5)
+        })
+
+    colliders_path = f"{os.path.splitext(output_path)[0]}-colliders.json"
+    with open(colliders_path, 'w') as f:
+        json.dump({
+            "name": name,
+            "height": target_height,
+            "scale": round(scale, 6),
+            "collider": collider,
+            "capsules": capsules
+        }, f, indent=2)
+    print(f"  Wrote body circle (radius {collider['radius']}) and {len(capsules)} hit capsules: {colliders_path}")
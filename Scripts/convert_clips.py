@@ -0,0 +1,471 @@
+"""
+Streaming Clip Converter for MetalMan
+=====================================
+Converts JSON animation clips (the export_animation.py format, e.g.
+MetalMan/Animations/Walking_animation.json) into a compact binary form
+without Blender and without loading the whole JSON tree.
+
+The JSON is parsed incrementally: top-level fields are decoded one at a
+time and the `keyframes` array one keyframe at a time, so memory stays
+bounded by a single keyframe regardless of clip length. Keyframe rows are
+spooled to a temporary file, and matrix components that never change are
+dropped from the keyframe data and stored once.
+
+Usage:
+    python convert_clips.py ../MetalMan/Animations
+    python convert_clips.py Walking_animation.json --output build/clips --compress --verify
+    python convert_clips.py --stats-only ../MetalMan/Animations
+
+Requirements:
+- Python 3.9+ (standard library only)
+"""
+
+import argparse
+import array
+import json
+import os
+import re
+import struct
+import sys
+import tempfile
+import time
+import zlib
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Extension of converted clips
+OUTPUT_EXTENSION = ".mmclip"
+
+# Clip files picked up from folders (exporter sidecars and export_animation.py clips)
+CLIP_SUFFIXES = ("-clip.json", "_animation.json")
+
+# Bytes read from the JSON file at a time
+CHUNK_SIZE = 1 << 16
+
+# A component whose values stay within this distance of its first value is constant
+CONSTANT_TOLERANCE = 1e-6
+
+# Largest allowed deviation of a matrix's bottom row from (0, 0, 0, 1)
+AFFINE_TOLERANCE = 1e-5
+
+BINARY_MAGIC = b'MMCL'
+BINARY_VERSION = 1
+
+FLAG_ZLIB = 1
+FLAG_BOUNDS = 2
+
+# magic, version, flags, bone count, keyframe count, fps, duration, metadata length
+_HEADER = struct.Struct('<4sHHIIffI')
+
+# Components kept per bone: the top three rows of the matrix, row-major
+COMPONENTS_PER_BONE = 12
+
+# Characters that can follow a JSON number
+_NUMBER_END = re.compile(r'[\s,\]}]')
+
+# ============================================================================
+# STREAMING JSON READER
+# ============================================================================
+
+class JSONStreamReader:
+    """
+    Pull parser for one JSON object, reading the file in chunks.
+
+    Values are decoded with json.JSONDecoder.raw_decode from a buffer that
+    only holds the unconsumed tail of the file, so a large array can be
+    walked element by element.
+    """
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.file = f
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        """Drop the consumed part of the buffer and read another chunk"""
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+
+    def peek(self):
+        """Next non-whitespace character (without consuming it), or '' at the end"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos:self.pos + 1]
+            self._fill()
+
+    def expect(self, character):
+        """Consume the next non-whitespace character, which must be character"""
+        found = self.peek()
+        if found != character:
+            raise ValueError(f"Expected {character!r}, found {found!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                result, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self._fill()
+                continue
+            # A bare number is only complete once its delimiter is in the buffer
+            if (isinstance(result, (int, float)) and not self.eof
+                    and _NUMBER_END.search(self.buffer, self.pos) is None):
+                self._fill()
+                continue
+            self.pos = end
+            return result
+
+    def object_items(self):
+        """
+        Iterate over the keys of the current object, yielding each key.
+
+        The caller must consume the value (with value() or array_items())
+        before advancing the iterator.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect('}')
+            return
+
+    def array_items(self):
+        """Iterate over the elements of the current array, decoding one at a time"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect(']')
+            return
+
+
+def stream_clip(path):
+    """
+    Stream a JSON clip.
+
+    Yields ('field', key, value) for every top-level field except keyframes,
+    and ('keyframe', index, keyframe) for each keyframe in order.
+    """
+    with open(path, encoding='utf-8') as f:
+        reader = JSONStreamReader(f)
+        for key in reader.object_items():
+            if key == 'keyframes':
+                for index, keyframe in enumerate(reader.array_items()):
+                    yield 'keyframe', index, keyframe
+            else:
+                yield 'field', key, reader.value()
+
+# ============================================================================
+# CONVERSION
+# ============================================================================
+
+def keyframe_row(keyframe, index, with_bounds):
+    """
+    Flatten a keyframe into float components: the top three rows of every
+    bone matrix (row-major), then min/max bounds if present.
+    """
+    row = []
+    for matrix in keyframe["boneTransforms"]:
+        # Column-major: element (r, c) is at c * 4 + r
+        if (abs(matrix[3]) > AFFINE_TOLERANCE or abs(matrix[7]) > AFFINE_TOLERANCE
+                or abs(matrix[11]) > AFFINE_TOLERANCE or abs(matrix[15] - 1.0) > AFFINE_TOLERANCE):
+            raise ValueError(f"Keyframe {index} has a non-affine bone matrix")
+        for r in range(3):
+            row.extend(matrix[c * 4 + r] for c in range(4))
+    if with_bounds:
+        bounds = keyframe.get("bounds") or {"min": [0.0] * 3, "max": [0.0] * 3}
+        row.extend(bounds["min"])
+        row.extend(bounds["max"])
+    return row
+
+
+def convert_clip(source_path, output_path=None, compress=False):
+    """
+    Convert one JSON clip, writing it to output_path unless that is None.
+
+    Binary layout (little-endian):
+        header: magic 'MMCL', version u16, flags u16 (1 = zlib payload,
+                2 = per-keyframe bounds), bone count u32, keyframe count u32,
+                fps f32, duration f32, metadata length u32
+        metadata: UTF-8 JSON of the remaining top-level fields (name, events, bounds, ...)
+        payload (zlib-compressed when flagged):
+            bones: parent index i16, name length u8, UTF-8 name
+            times: f32 per keyframe
+            animated mask: 1 bit per component (12 per bone, row-major 3x4), LSB first
+            constant values: f32 per component whose mask bit is 0
+            keyframes: f32 per animated component, then 6 f32 bounds if flagged
+
+    Returns a stats dict.
+    """
+    start_time = time.perf_counter()
+    metadata = {}
+    bones = []
+    times = array.array('f')
+    first_row = None
+    lows = highs = None
+    with_bounds = False
+
+    with tempfile.TemporaryFile() as spool:
+        for kind, key, value in stream_clip(source_path):
+            if kind == 'field':
+                if key == 'bones':
+                    bones = value
+                elif key not in ('boneCount', 'keyframeCount'):
+                    metadata[key] = value
+                continue
+
+            if first_row is None:
+                with_bounds = "bounds" in value
+            row = keyframe_row(value, key, with_bounds)
+            times.append(value["time"])
+            if first_row is None:
+                first_row = row
+                lows, highs = list(row), list(row)
+            else:
+                if len(row) != len(first_row):
+                    raise ValueError(f"Keyframe {key} has a different bone count")
+                lows = [min(a, b) for a, b in zip(lows, row)]
+                highs = [max(a, b) for a, b in zip(highs, row)]
+            spool.write(array.array('f', row).tobytes())
+
+        if first_row is None:
+            raise ValueError(f"{source_path} has no keyframes")
+
+        bone_count = len(first_row) // COMPONENTS_PER_BONE
+        component_count = bone_count * COMPONENTS_PER_BONE
+        animated = [highs[i] - lows[i] > CONSTANT_TOLERANCE for i in range(component_count)]
+        kept = [i for i in range(component_count) if animated[i]]
+        if with_bounds:
+            kept.extend(range(component_count, len(first_row)))
+
+        stats = {
+            "source": source_path,
+            "sourceBytes": os.path.getsize(source_path),
+            "bones": bone_count,
+            "keyframes": len(times),
+            "components": component_count,
+            "constantComponents": component_count - sum(animated),
+            "constantBones": sum(
+                not any(animated[b * COMPONENTS_PER_BONE:(b + 1) * COMPONENTS_PER_BONE])
+                for b in range(bone_count)
+            ),
+        }
+
+        if output_path:
+            flags = (FLAG_ZLIB if compress else 0) | (FLAG_BOUNDS if with_bounds else 0)
+            metadata_bytes = json.dumps(metadata, separators=(',', ':')).encode('utf-8')
+            compressor = zlib.compressobj(9) if compress else None
+
+            with open(output_path, 'wb') as out:
+                out.write(_HEADER.pack(
+                    BINARY_MAGIC, BINARY_VERSION, flags, bone_count, len(times),
+                    float(metadata.get("fps", 0)), float(metadata.get("duration", 0.0)),
+                    len(metadata_bytes)
+                ))
+                out.write(metadata_bytes)
+
+                def write_payload(data):
+                    out.write(compressor.compress(data) if compressor else data)
+
+                bone_table = bytearray()
+                for bone in bones:
+                    name = bone["name"].encode('utf-8')
+                    bone_table += struct.pack('<hB', bone["parentIndex"], len(name)) + name
+                write_payload(bytes(bone_table))
+                write_payload(times.tobytes())
+
+                mask = bytearray((component_count + 7) // 8)
+                for i in range(component_count):
+                    if animated[i]:
+                        mask[i // 8] |= 1 << (i % 8)
+                write_payload(bytes(mask))
+                write_payload(array.array('f', (first_row[i] for i in range(component_count)
+                                                if not animated[i])).tobytes())
+
+                spool.seek(0)
+                row_bytes = len(first_row) * 4
+                for _ in range(len(times)):
+                    row = array.array('f')
+                    row.frombytes(spool.read(row_bytes))
+                    write_payload(array.array('f', (row[i] for i in kept)).tobytes())
+
+                if compressor:
+                    out.write(compressor.flush())
+
+            stats["output"] = output_path
+            stats["outputBytes"] = os.path.getsize(output_path)
+
+    stats["seconds"] = time.perf_counter() - start_time
+    return stats
+
+
+def read_clip(path):
+    """
+    Read a converted clip back into the JSON clip structure
+    (bone matrices as column-major 16-float lists).
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    magic, version, flags, bone_count, keyframe_count, fps, duration, metadata_length = \
+        _HEADER.unpack_from(data, 0)
+    if magic != BINARY_MAGIC or version != BINARY_VERSION:
+        raise ValueError(f"{path} is not a version {BINARY_VERSION} clip file")
+    position = _HEADER.size
+    clip = json.loads(data[position:position + metadata_length].decode('utf-8'))
+    payload = data[position + metadata_length:]
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+
+    position = 0
+    bones = []
+    for index in range(bone_count):
+        parent, length = struct.unpack_from('<hB', payload, position)
+        position += 3
+        name = payload[position:position + length].decode('utf-8')
+        position += length
+        bones.append({"name": name, "index": index, "parentIndex": parent})
+
+    def floats(count):
+        nonlocal position
+        values = array.array('f')
+        values.frombytes(payload[position:position + count * 4])
+        position += count * 4
+        return values
+
+    times = floats(keyframe_count)
+    component_count = bone_count * COMPONENTS_PER_BONE
+    mask = payload[position:position + (component_count + 7) // 8]
+    position += len(mask)
+    animated = [bool(mask[i // 8] & (1 << (i % 8))) for i in range(component_count)]
+    constants = iter(floats(animated.count(False)))
+    template = [0.0 if animated[i] else next(constants) for i in range(component_count)]
+    animated_indices = [i for i in range(component_count) if animated[i]]
+
+    keyframes = []
+    for index in range(keyframe_count):
+        values = floats(len(animated_indices))
+        row = list(template)
+        for i, value in zip(animated_indices, values):
+            row[i] = value
+        matrices = []
+        for bone in range(bone_count):
+            m = row[bone * COMPONENTS_PER_BONE:(bone + 1) * COMPONENTS_PER_BONE]
+            matrices.append([m[r * 4 + c] if r < 3 else (1.0 if c == 3 else 0.0)
+                             for c in range(4) for r in range(4)])
+        keyframe = {"time": times[index], "boneTransforms": matrices}
+        if flags & FLAG_BOUNDS:
+            bounds = floats(6)
+            keyframe["bounds"] = {"min": list(bounds[:3]), "max": list(bounds[3:])}
+        keyframes.append(keyframe)
+
+    clip.update({
+        "fps": clip.get("fps", fps),
+        "duration": clip.get("duration", duration),
+        "boneCount": bone_count,
+        "keyframeCount": keyframe_count,
+        "bones": bones,
+        "keyframes": keyframes,
+    })
+    return clip
+
+
+def verify_clip(source_path, converted_path):
+    """Largest absolute difference between the JSON keyframes and the converted clip"""
+    converted = read_clip(converted_path)["keyframes"]
+    error = 0.0
+    for kind, index, keyframe in stream_clip(source_path):
+        if kind != 'keyframe':
+            continue
+        for source, result in zip(keyframe["boneTransforms"], converted[index]["boneTransforms"]):
+            error = max(error, max(abs(a - b) for a, b in zip(source, result)))
+    return error
+
+
+def find_clips(paths):
+    """
+    Expand files and folders into a sorted list of JSON clip paths.
+
+    Folders only contribute files ending in CLIP_SUFFIXES, so the exporters'
+    other sidecars (-events.json, -bounds.json, ...) are not read as clips.
+    """
+    clips = []
+    for path in paths:
+        if os.path.isdir(path):
+            clips.extend(os.path.join(path, f) for f in os.listdir(path) if f.endswith(CLIP_SUFFIXES))
+        else:
+            clips.append(path)
+    return sorted(clips)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert JSON animation clips to compact binary clips")
+    parser.add_argument("clips", nargs="+", help="JSON clip files or folders")
+    parser.add_argument("--output", help="output folder (default: next to each source)")
+    parser.add_argument("--compress", action="store_true", help="zlib-compress the payload")
+    parser.add_argument("--verify", action="store_true", help="read back and report the max error")
+    parser.add_argument("--stats-only", action="store_true", help="print stats without writing files")
+    args = parser.parse_args()
+
+    total_source = total_output = 0
+    failures = 0
+    for source in find_clips(args.clips):
+        output = None
+        if not args.stats_only:
+            folder = args.output or os.path.dirname(source)
+            os.makedirs(folder, exist_ok=True)
+            output = os.path.join(folder, os.path.splitext(os.path.basename(source))[0] + OUTPUT_EXTENSION)
+        try:
+            stats = convert_clip(source, output, args.compress)
+        except (ValueError, KeyError, json.JSONDecodeError) as e:
+            print(f"ERROR: {source}: {e}")
+            failures += 1
+            continue
+
+        line = (f"{os.path.basename(source)}: {stats['bones']} bones, {stats['keyframes']} keys, "
+                f"{stats['constantBones']} constant bones, "
+                f"{stats['constantComponents']}/{stats['components']} constant components, "
+                f"{stats['sourceBytes'] / 1024:.0f} KB")
+        total_source += stats['sourceBytes']
+        if output:
+            total_output += stats['outputBytes']
+            line += (f" -> {stats['outputBytes'] / 1024:.0f} KB "
+                     f"({stats['sourceBytes'] / stats['outputBytes']:.1f}x)")
+            if args.verify:
+                line += f", max error {verify_clip(source, output):.2e}"
+        print(f"{line} in {stats['seconds']:.2f}s")
+
+    if total_output:
+        print(f"\nTotal: {total_source / 1024:.0f} KB -> {total_output / 1024:.0f} KB")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Event Track Detection for MetalMan
+==================================
+Derives the gameplay event track of an animation clip (footfalls and the
+weapon swing apex) from per-frame bone samples. Shared by
+Scripts/export_animation.py and the USDZ exporters in MetalMan/Scripts,
+which write the result as <name>-events.json or the clip's "events".
+
+Events:
+    leftFootDown / rightFootDown   a foot becomes planted
+    swingApex                      peak weapon-hand speed of an attack clip
+
+Usage (inside Blender, stepping the clip's frames):
+    sys.path.insert(0, SCRIPTS_DIR)
+    from event_tracks import detect_events, find_event_bones, sample_event_points
+    event_bones = find_event_bones(armature)
+    samples = [sample_event_points(armature, event_bones) for each frame]
+    events = detect_events(samples, times, duration, clip_name)
+
+Requirements:
+- Blender 3.6+ (only for the bone lookup and sampling; detect_events is plain Python)
+"""
+
+import re
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Bone name suffixes used for event detection (Mixamo rigs)
+FOOT_BONES = {
+    "left": ("LeftFoot", "LeftToeBase"),
+    "right": ("RightFoot", "RightToeBase"),
+}
+SWING_BONE = "RightHand"
+
+# A foot is planted when it is within FOOT_CONTACT_HEIGHT (m) of its lowest point
+# in the clip and moving vertically slower than FOOT_CONTACT_SPEED (m/s)
+FOOT_CONTACT_HEIGHT = 0.03
+FOOT_CONTACT_SPEED = 0.25
+
+# Peak weapon-hand speed (m/s) a clip needs to get a swing apex event
+SWING_APEX_SPEED = 3.0
+
+# Clips that can get a swing apex event (regular expressions searched in the
+# lower-case clip name), so fast arm swings in runs and jumps are not swings
+SWING_CLIP_PATTERNS = [r'attack', r'slash', r'swiping', r'kick', r'(?<!taking-)punch']
+
+# ============================================================================
+# DETECTION
+# ============================================================================
+
+def find_pose_bone(armature, suffix):
+    """Find a pose bone whose name ends with suffix (e.g. mixamorig:LeftFoot)"""
+    for bone in armature.pose.bones:
+        if bone.name.endswith(suffix):
+            return bone
+    return None
+
+
+def find_event_bones(armature):
+    """Look up the foot/toe bones per side and the weapon hand used for events"""
+    feet = {}
+    for side, suffixes in FOOT_BONES.items():
+        bones = [find_pose_bone(armature, suffix) for suffix in suffixes]
+        feet[side] = [bone for bone in bones if bone]
+    return feet, find_pose_bone(armature, SWING_BONE)
+
+
+def sample_event_points(armature, event_bones):
+    """
+    Sample world-space event data at the current frame:
+    the lowest point of each foot (heads/tails of foot and toe bones) and
+    the weapon hand position.
+    """
+    feet, swing_bone = event_bones
+    world = armature.matrix_world
+    sample = {}
+    for side, bones in feet.items():
+        heights = [(world @ point).z for bone in bones for point in (bone.head, bone.tail)]
+        sample[side] = min(heights) if heights else None
+    sample["swing"] = tuple(world @ swing_bone.head) if swing_bone else None
+    return sample
+
+
+def detect_events(samples, times, duration, clip_name=""):
+    """
+    Derive an event track from per-frame samples.
+
+    - leftFootDown/rightFootDown when a foot becomes planted (clips are
+      treated as looping, so a contact at the first frame counts if the foot
+      was in the air at the last frame)
+    - swingApex at the peak weapon-hand speed, if fast enough to be a swing
+      and clip_name matches SWING_CLIP_PATTERNS (attacks only)
+
+    Returns events sorted by time, each with time and normalizedTime.
+    """
+    events = []
+    count = len(samples)
+
+    def add_event(event_type, index):
+        events.append({
+            "type": event_type,
+            "time": round(times[index], 4),
+            "normalizedTime": round(times[index] / duration, 4) if duration > 0 else 0.0
+        })
+
+    for side in FOOT_BONES:
+        heights = [sample[side] for sample in samples]
+        if count < 3 or None in heights:
+            continue
+        ground = min(heights)
+        
+        contact = []
+        for i in range(count):
+            prev_i, next_i = max(i - 1, 0), min(i + 1, count - 1)
+            dt = times[next_i] - times[prev_i]
+            vertical_speed = abs(heights[next_i] - heights[prev_i]) / dt if dt > 0 else 0.0
+            contact.append(heights[i] - ground < FOOT_CONTACT_HEIGHT and vertical_speed < FOOT_CONTACT_SPEED)
+        
+        # A foot planted for the whole clip (idles) has no footfalls
+        if all(contact):
+            continue
+        for i in range(count):
+            if contact[i] and not contact[i - 1]:
+                add_event(f"{side}FootDown", i)
+
+    hand = [sample["swing"] for sample in samples]
+    is_attack = any(re.search(pattern, clip_name.lower()) for pattern in SWING_CLIP_PATTERNS)
+    if is_attack and count >= 2 and None not in hand:
+        speeds = []
+        for i in range(1, count):
+            dt = times[i] - times[i - 1]
+            distance = sum((a - b) ** 2 for a, b in zip(hand[i], hand[i - 1])) ** 0.5
+            speeds.append(distance / dt if dt > 0 else 0.0)
+        peak = max(range(len(speeds)), key=lambda i: speeds[i])
+        if speeds[peak] >= SWING_APEX_SPEED:
+            add_event("swingApex", peak + 1)
+
+    events.sort(key=lambda event: event["time"])
+    return events
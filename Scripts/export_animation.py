@@ -16,33 +16,273 @@ Or run from command line:
 
 import bpy
 import json
-import mathutils
+import numpy as np
 import os
+import re
+import sys
 from math import degrees
 
-def get_bone_transform(pose_bone):
-    """Get the local transform matrix of a pose bone."""
-    if pose_bone.parent:
-        # Get transform relative to parent
-        parent_matrix = pose_bone.parent.matrix
-        local_matrix = parent_matrix.inverted() @ pose_bone.matrix
-    else:
-        # Root bone - use armature-space matrix
-        local_matrix = pose_bone.matrix
-    
-    return local_matrix
-
-def matrix_to_list(matrix):
-    """Convert a Blender matrix to a flat list (column-major for Metal/simd)."""
-    # Metal uses column-major matrices
-    result = []
-    for col in range(4):
-        for row in range(4):
-            result.append(matrix[row][col])
+# event_tracks.py and clip_metadata.py (shared with the USDZ exporters) live next to this script
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from clip_metadata import get_bone_transform, get_skinned_meshes, matrix_to_list, merge_bounds, sample_mesh_bounds
+from event_tracks import detect_events, find_event_bones, sample_event_points
+
+# Sample bones by evaluating the action's F-curves and running forward kinematics in
+# NumPy instead of evaluating the whole scene with frame_set for every frame. Rigs the
+# sampler cannot reproduce (constraints, drivers, NLA, extra mesh modifiers) still use frame_set
+USE_FCURVE_SAMPLER = True
+
+# Bone transform channels the F-curve sampler evaluates
+BONE_CHANNEL = re.compile(r'^pose\.bones\["(.+)"\]\.(location|rotation_quaternion|rotation_euler|scale)$')
+
+def action_fcurves(armature, action):
+    """
+    F-curves of the action: action.fcurves on legacy actions, or the channel
+    bag of the armature's action slot on layered actions (Blender 4.4+, the
+    only kind in 5.0). Returns None when they cannot be resolved.
+    """
+    if hasattr(action, 'fcurves'):
+        return list(action.fcurves)
+    if not hasattr(action, 'layers'):
+        return None
+    slot = getattr(armature.animation_data, 'action_slot', None)
+    fcurves = []
+    for layer in action.layers:
+        for strip in layer.strips:
+            if slot is not None and hasattr(strip, 'channelbag'):
+                channelbag = strip.channelbag(slot)
+                channelbags = [channelbag] if channelbag else []
+            else:
+                channelbags = getattr(strip, 'channelbags', [])
+            for channelbag in channelbags:
+                fcurves.extend(channelbag.fcurves)
+    return fcurves or None
+
+def fcurve_sampler_blockers(armature, action, meshes):
+    """
+    Reasons the F-curve sampler would not match frame_set for this clip
+    (empty if it can be used): anything that changes bones or skinned meshes
+    other than the action's bone transform channels.
+    """
+    blockers = []
+    anim = armature.animation_data
+    if anim.drivers or (armature.data.animation_data and armature.data.animation_data.drivers):
+        blockers.append("drivers")
+    if anim.use_tweak_mode or anim.action_influence < 1.0 or any(not track.mute for track in anim.nla_tracks):
+        blockers.append("NLA")
+    
+    animated = set()
+    fcurves = action_fcurves(armature, action)
+    if fcurves is None:
+        blockers.append("unresolved F-curves")
+        fcurves = []
+    for fcurve in fcurves:
+        if fcurve.mute:
+            continue
+        match = BONE_CHANNEL.match(fcurve.data_path)
+        if not match:
+            blockers.append(f"animated {fcurve.data_path}")
+            break
+        animated.add(match.groups())
+    
+    for pose_bone in armature.pose.bones:
+        bone = pose_bone.bone
+        if any(not constraint.mute for constraint in pose_bone.constraints):
+            blockers.append(f"constraints on {pose_bone.name}")
+        if pose_bone.rotation_mode == 'AXIS_ANGLE':
+            blockers.append(f"axis-angle rotation on {pose_bone.name}")
+        if (not bone.use_inherit_rotation or bone.inherit_scale != 'FULL'
+                or not bone.use_local_location or bone.use_relative_parent):
+            blockers.append(f"inheritance settings on {pose_bone.name}")
+        if bone.use_connect and (pose_bone.name, "location") in animated:
+            blockers.append(f"animated location on connected {pose_bone.name}")
+    
+    for obj in meshes:
+        modifiers = [modifier for modifier in obj.modifiers if modifier.show_viewport]
+        if (len(modifiers) != 1 or modifiers[0].type != 'ARMATURE' or modifiers[0].object != armature
+                or not modifiers[0].use_vertex_groups or modifiers[0].use_bone_envelopes
+                or modifiers[0].use_deform_preserve_volume or modifiers[0].use_multi_modifier
+                or modifiers[0].vertex_group):
+            blockers.append(f"modifiers on {obj.name}")
+        if obj.data.shape_keys or obj.animation_data or obj.parent_type == 'BONE':
+            blockers.append(f"shape keys or animation on {obj.name}")
+    return blockers
+
+def evaluate_bone_channels(armature, action, frames):
+    """
+    Evaluate the action's bone transform F-curves at the given frames.
+    Channels without an F-curve keep the pose bone's current value.
+    Returns {bone name: {channel: (F, n) array}}.
+    """
+    values = {}
+    for pose_bone in armature.pose.bones:
+        values[pose_bone.name] = {
+            channel: np.tile(np.array(getattr(pose_bone, channel), dtype=np.float64), (len(frames), 1))
+            for channel in ("location", "rotation_quaternion", "rotation_euler", "scale")
+        }
+    for fcurve in action_fcurves(armature, action) or []:
+        match = BONE_CHANNEL.match(fcurve.data_path)
+        if fcurve.mute or not match or match.group(1) not in values:
+            continue
+        bone_name, channel = match.groups()
+        values[bone_name][channel][:, fcurve.array_index] = [fcurve.evaluate(frame) for frame in frames]
+    return values
+
+def quaternion_matrices(quaternions):
+    """Rotation matrices (F, 3, 3) of (F, 4) w, x, y, z quaternions (normalised first, as Blender does)"""
+    w, x, y, z = (quaternions / np.linalg.norm(quaternions, axis=1, keepdims=True)).T
+    return np.stack([
+        np.stack([1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)], axis=-1),
+        np.stack([2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)], axis=-1),
+        np.stack([2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)], axis=-1),
+    ], axis=1)
+
+def euler_matrices(angles, order):
+    """Rotation matrices (F, 3, 3) of (F, 3) Euler angles, applying the axes in order (e.g. 'XYZ')"""
+    result = np.tile(np.eye(3), (len(angles), 1, 1))
+    for axis_name in order:
+        axis = "XYZ".index(axis_name)
+        cos, sin = np.cos(angles[:, axis]), np.sin(angles[:, axis])
+        a, b = [i for i in range(3) if i != axis]
+        rotation = np.tile(np.eye(3), (len(angles), 1, 1))
+        rotation[:, a, a] = cos
+        rotation[:, b, b] = cos
+        # Right-handed rotation about axis: a -> b
+        rotation[:, b, a] = sin if axis != 1 else -sin
+        rotation[:, a, b] = -sin if axis != 1 else sin
+        result = rotation @ result
     return result
 
-def export_animation(armature_name=None, output_path=None):
-    """Export animation data from the specified armature."""
+def channel_matrices(pose_bone, channels):
+    """Pose channel matrices (F, 4, 4) from location, rotation and scale, like pose_bone.matrix_basis"""
+    if pose_bone.rotation_mode == 'QUATERNION':
+        rotation = quaternion_matrices(channels["rotation_quaternion"])
+    else:
+        rotation = euler_matrices(channels["rotation_euler"], pose_bone.rotation_mode)
+    matrices = np.zeros((len(rotation), 4, 4))
+    matrices[:, :3, :3] = rotation * channels["scale"][:, None, :]
+    matrices[:, :3, 3] = channels["location"]
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+def sample_fcurve_pose(armature, action, frames):
+    """
+    Bone matrices at the given frames from the action's F-curves and
+    forward kinematics over the rest pose, without evaluating the scene.
+    
+    Returns (local, pose), each (B, F, 4, 4) in armature.pose.bones order:
+    local matches get_bone_transform and pose matches pose_bone.matrix.
+    """
+    channels = evaluate_bone_channels(armature, action, frames)
+    pose_bones = list(armature.pose.bones)
+    index = {pose_bone.name: i for i, pose_bone in enumerate(pose_bones)}
+    local = np.empty((len(pose_bones), len(frames), 4, 4))
+    pose = np.empty_like(local)
+    
+    # Parents before children
+    for pose_bone in sorted(pose_bones, key=lambda pose_bone: len(pose_bone.parent_recursive)):
+        i = index[pose_bone.name]
+        rest = np.array(pose_bone.bone.matrix_local)
+        if pose_bone.parent:
+            rest = np.linalg.inv(np.array(pose_bone.parent.bone.matrix_local)) @ rest
+        local[i] = rest @ channel_matrices(pose_bone, channels[pose_bone.name])
+        pose[i] = pose[index[pose_bone.parent.name]] @ local[i] if pose_bone.parent else local[i]
+    return local, pose
+
+def fcurve_event_samples(armature, event_bones, pose):
+    """sample_event_points for every frame of a pose from sample_fcurve_pose"""
+    feet, swing_bone = event_bones
+    index = {pose_bone.name: i for i, pose_bone in enumerate(armature.pose.bones)}
+    world = np.array(armature.matrix_world) @ pose
+    
+    def heads(bone):
+        return world[index[bone.name], :, :3, 3]
+    
+    def tails(bone):
+        return (world[index[bone.name]] @ np.array([0.0, bone.length, 0.0, 1.0]))[:, :3]
+    
+    heights = {}
+    for side, bones in feet.items():
+        side_heights = [sample(bone)[:, 2] for bone in bones for sample in (heads, tails)]
+        heights[side] = np.min(side_heights, axis=0) if side_heights else None
+    hand = heads(swing_bone) if swing_bone else None
+    
+    samples = []
+    for frame in range(pose.shape[1]):
+        sample = {side: float(values[frame]) if values is not None else None for side, values in heights.items()}
+        sample["swing"] = tuple(hand[frame].tolist()) if hand is not None else None
+        samples.append(sample)
+    return samples
+
+def skinned_mesh_bounds(armature, meshes, pose):
+    """
+    sample_mesh_bounds for every frame of a pose from sample_fcurve_pose,
+    skinning the meshes in NumPy like the armature modifier (linear blend
+    of deforming vertex groups, normalised per vertex).
+    """
+    if not meshes:
+        return [None] * pose.shape[1]
+    index = {pose_bone.name: i for i, pose_bone in enumerate(armature.pose.bones)}
+    # Rest (armature space) to posed (armature space), per bone and frame
+    skin = pose @ np.linalg.inv(np.array([bone.matrix_local for bone in armature.data.bones]))[:, None]
+    to_armature = np.array(armature.matrix_world.inverted())
+    
+    corners = []
+    for obj in meshes:
+        mesh = obj.data
+        coords = np.empty(len(mesh.vertices) * 3)
+        mesh.vertices.foreach_get("co", coords)
+        mesh_to_armature = to_armature @ np.array(obj.matrix_world)
+        rest = np.c_[coords.reshape(-1, 3), np.ones(len(mesh.vertices))] @ mesh_to_armature.T
+        
+        deforming = {
+            group.index: index[group.name] for group in obj.vertex_groups
+            if group.name in armature.data.bones and armature.data.bones[group.name].use_deform
+        }
+        vertices, bones, weights = [], [], []
+        for vertex in mesh.vertices:
+            for element in vertex.groups:
+                if element.group in deforming and element.weight > 0.0:
+                    vertices.append(vertex.index)
+                    bones.append(deforming[element.group])
+                    weights.append(element.weight)
+        vertices = np.array(vertices, dtype=np.int64)
+        bones = np.array(bones, dtype=np.int64)
+        totals = np.bincount(vertices, weights=weights, minlength=len(mesh.vertices))
+        weights = np.array(weights) / totals[vertices]
+        
+        armature_to_mesh = np.linalg.inv(mesh_to_armature)
+        mesh_corners = []
+        for frame in range(pose.shape[1]):
+            # Unweighted vertices keep their rest position
+            deformed = np.where((totals > 0)[:, None], 0.0, rest)
+            moved = np.einsum('eij,ej->ei', skin[bones, frame], rest[vertices]) * weights[:, None]
+            np.add.at(deformed, vertices, moved)
+            local_points = deformed @ armature_to_mesh.T
+            # Corners of the mesh-space box in armature space, as bound_box gives them
+            low, high = local_points[:, :3].min(axis=0), local_points[:, :3].max(axis=0)
+            box = np.array([
+                [x, y, z, 1.0] for x in (low[0], high[0]) for y in (low[1], high[1]) for z in (low[2], high[2])
+            ])
+            mesh_corners.append((box @ mesh_to_armature.T)[:, :3])
+        corners.append(mesh_corners)
+    
+    frame_bounds = []
+    for frame in range(pose.shape[1]):
+        points = np.concatenate([mesh_corners[frame] for mesh_corners in corners])
+        frame_bounds.append({
+            "min": [round(float(value), 5) for value in points.min(axis=0)],
+            "max": [round(float(value), 5) for value in points.max(axis=0)]
+        })
+    return frame_bounds
+
+def export_animation(armature_name=None, output_path=None, spline=False):
+    """
+    Export animation data from the specified armature.
+    
+    With spline=True the sampled keyframes are replaced by per-track cubic
+    Hermite splines fitted within the tolerances in clip_splines.py.
+    """
     
     # Find the armature
     armature = None
@@ -113,22 +353,61 @@ def export_animation(armature_name=None, output_path=None):
     
     print(f"Sampling {len(sampled_frames)} frames...")
     
-    for frame in sampled_frames:
-        bpy.context.scene.frame_set(frame)
-        
-        time = (frame - frame_start) / fps
-        
-        bone_transforms = []
-        for bone in armature.pose.bones:
-            local_matrix = get_bone_transform(bone)
-            bone_transforms.append(matrix_to_list(local_matrix))
-        
-        keyframes.append({
-            "time": time,
-            "boneTransforms": bone_transforms
-        })
+    # Foot/hand positions for the event track
+    event_bones = find_event_bones(armature)
+    event_samples = []
+    
+    # Skinned meshes for the animated bounds (clips exported without a mesh have none)
+    skinned_meshes = get_skinned_meshes(armature)
+    
+    use_fcurves = False
+    if USE_FCURVE_SAMPLER:
+        blockers = fcurve_sampler_blockers(armature, action, skinned_meshes)
+        if blockers:
+            print(f"Sampling with frame_set ({', '.join(blockers[:3])})")
+        else:
+            use_fcurves = True
+            print("Sampling F-curves")
+    
+    if use_fcurves:
+        local, pose = sample_fcurve_pose(armature, action, sampled_frames)
+        event_samples = fcurve_event_samples(armature, event_bones, pose)
+        frame_bounds = skinned_mesh_bounds(armature, skinned_meshes, pose)
+        # Column-major flat lists, as matrix_to_list gives
+        frame_transforms = local.transpose(1, 0, 3, 2).reshape(len(sampled_frames), len(bones_info), 16).tolist()
+        for frame, bone_transforms, bounds in zip(sampled_frames, frame_transforms, frame_bounds):
+            keyframe = {
+                "time": (frame - frame_start) / fps,
+                "boneTransforms": bone_transforms
+            }
+            if bounds:
+                keyframe["bounds"] = bounds
+            keyframes.append(keyframe)
+    else:
+        for frame in sampled_frames:
+            bpy.context.scene.frame_set(frame)
+            
+            time = (frame - frame_start) / fps
+            
+            bone_transforms = []
+            for bone in armature.pose.bones:
+                local_matrix = get_bone_transform(bone)
+                bone_transforms.append(matrix_to_list(local_matrix))
+            
+            event_samples.append(sample_event_points(armature, event_bones))
+            
+            keyframe = {
+                "time": time,
+                "boneTransforms": bone_transforms
+            }
+            bounds = sample_mesh_bounds(armature, skinned_meshes)
+            if bounds:
+                keyframe["bounds"] = bounds
+            keyframes.append(keyframe)
     
     duration = (frame_end - frame_start) / fps
+    clip_name = os.path.splitext(os.path.basename(output_path))[0] if output_path else action.name
+    events = detect_events(event_samples, [k["time"] for k in keyframes], duration, clip_name)
     
     # Build the output data
     animation_data = {
@@ -138,8 +417,20 @@ def export_animation(armature_name=None, output_path=None):
         "boneCount": len(bones_info),
         "keyframeCount": len(keyframes),
         "bones": bones_info,
-        "keyframes": keyframes
+        "keyframes": keyframes,
+        "events": events
     }
+    clip_bounds = merge_bounds([keyframe.get("bounds") for keyframe in keyframes])
+    if clip_bounds:
+        animation_data["bounds"] = clip_bounds
+    
+    if spline:
+        # clip_splines.py lives next to this script
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from clip_splines import fit_clip, key_count
+        dense_keys = len(keyframes) * len(bones_info) * 12
+        animation_data = fit_clip(animation_data)
+        print(f"Fitted splines: {dense_keys} dense keys -> {key_count(animation_data)} spline keys")
     
     # Determine output path
     if not output_path:
@@ -157,6 +448,7 @@ def export_animation(armature_name=None, output_path=None):
     print(f"   Duration: {duration:.2f}s")
     print(f"   Bones: {len(bones_info)}")
     print(f"   Keyframes: {len(keyframes)}")
+    print(f"   Events: {len(events)}")
     
     return output_path
 
@@ -212,6 +504,9 @@ if __name__ == "__main__":
     # Export the current animation
     export_animation()
     
+    # Or export it as Hermite spline tracks:
+    # export_animation(spline=True)
+    
     # Or export all actions:
     # export_all_actions()
 
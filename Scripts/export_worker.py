@@ -0,0 +1,99 @@
+"""
+Export Worker Protocol for MetalMan
+===================================
+The line protocol between export_supervisor.py and the USDZ exporters it runs
+in child Blender processes (all in MetalMan/Scripts). Defined once here so
+both sides agree on it.
+
+The supervisor starts Blender with the exporter and WORKER_FLAG after '--'.
+It writes one JSON command per line to the worker's stdin:
+- {"command": "list"}: reply {"files": [...], "dependencies": [...]}, the
+  files a batch run would export and the files every export depends on
+- {"command": "export", "file": path, "force": bool}: export one file (even
+  if its output exists when "force" is set), reply {"file": path, "status":
+  "exported" | "skipped" | "failed"}
+
+Replies are printed as single lines starting with WORKER_REPLY_PREFIX; every
+other output line is the exporter's own log. The worker exits when stdin
+closes.
+
+Usage (exporter, inside Blender):
+    sys.path.insert(0, SCRIPTS_DIR)
+    from export_worker import is_worker, serve_worker
+    if is_worker():
+        serve_worker(list_files, export_file)
+
+Usage (supervisor, plain Python):
+    from export_worker import WORKER_FLAG, parse_reply
+
+Requirements:
+- Python 3.8+ (no Blender modules, so the supervisor can import it)
+"""
+
+import json
+import sys
+
+# ============================================================================
+# PROTOCOL
+# ============================================================================
+
+# Argument after '--' on the Blender command line that starts an exporter in worker mode
+WORKER_FLAG = "--worker"
+
+# Prefix of the reply lines printed by a worker
+WORKER_REPLY_PREFIX = "@@worker "
+
+# Reply status for each result of an exporter's export function
+EXPORT_STATUSES = {True: "exported", None: "skipped", False: "failed"}
+
+# ============================================================================
+# SUPERVISOR SIDE
+# ============================================================================
+
+def parse_reply(line):
+    """The reply carried by a worker output line, or None for a log line"""
+    if not line.startswith(WORKER_REPLY_PREFIX):
+        return None
+    return json.loads(line[len(WORKER_REPLY_PREFIX):])
+
+# ============================================================================
+# WORKER SIDE
+# ============================================================================
+
+def worker_reply(reply):
+    """Send a reply line to export_supervisor.py"""
+    print(WORKER_REPLY_PREFIX + json.dumps(reply), flush=True)
+
+
+def script_args():
+    """Arguments after '--' on the Blender command line"""
+    return sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+
+def is_worker():
+    """Whether the exporter was started in worker mode by export_supervisor.py"""
+    return WORKER_FLAG in script_args()
+
+
+def serve_worker(list_files, export_file):
+    """
+    Answer the supervisor's commands from stdin until it closes.
+
+    list_files: returns (files, dependencies) for the "list" command
+    export_file: called with (path, force), returns True (exported), None
+        (skipped) or False (failed); an exception counts as failed
+    """
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        if request["command"] == "list":
+            files, dependencies = list_files()
+            worker_reply({"files": files, "dependencies": dependencies})
+        elif request["command"] == "export":
+            try:
+                result = export_file(request["file"], request.get("force", False))
+            except Exception as e:
+                print(f"ERROR processing {request['file']}: {e}")
+                result = False
+            worker_reply({"file": request["file"], "status": EXPORT_STATUSES[result]})
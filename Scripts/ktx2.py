@@ -0,0 +1,246 @@
+"""
+KTX2 Container Reader/Writer for MetalMan
+=========================================
+Minimal reader and writer for KTX 2.0 texture containers, shared by the
+offline texture bakers in this folder.
+
+Files are written without supercompression, with a basic data format
+descriptor and the mip levels (plain texels or BC blocks) laid out exactly
+as the GPU expects,
+so the game can memory-map a container and copy each level straight into
+a MTLTexture.
+
+Layout (all values little-endian):
+    identifier (12 bytes)
+    header: vkFormat, typeSize, width, height, depth, layerCount,
+            faceCount, levelCount, supercompressionScheme (9 x uint32)
+    index:  dfdOffset, dfdLength, kvdOffset, kvdLength (4 x uint32),
+            sgdOffset, sgdLength (2 x uint64)
+    level index: byteOffset, byteLength, uncompressedByteLength
+            (3 x uint64 per level, level 0 = full size)
+    data format descriptor, key/value data
+    mip data, smallest level first
+"""
+
+import math
+import mmap
+import struct
+
+KTX2_IDENTIFIER = b'\xabKTX 20\xbb\r\n\x1a\n'
+
+# Vulkan format numbers used by the bakers
+VK_FORMAT_R8_UNORM = 9
+VK_FORMAT_R8G8_UNORM = 16
+VK_FORMAT_R8G8B8A8_UNORM = 37
+VK_FORMAT_R8G8B8A8_SRGB = 43
+VK_FORMAT_R16G16B16A16_SFLOAT = 97
+VK_FORMAT_BC1_RGBA_UNORM_BLOCK = 133
+VK_FORMAT_BC1_RGBA_SRGB_BLOCK = 134
+VK_FORMAT_BC3_UNORM_BLOCK = 137
+VK_FORMAT_BC3_SRGB_BLOCK = 138
+VK_FORMAT_BC5_UNORM_BLOCK = 141
+
+# Channel count for each supported uncompressed format
+FORMAT_CHANNELS = {
+    VK_FORMAT_R8_UNORM: 1,
+    VK_FORMAT_R8G8_UNORM: 2,
+    VK_FORMAT_R8G8B8A8_UNORM: 4,
+    VK_FORMAT_R8G8B8A8_SRGB: 4,
+    VK_FORMAT_R16G16B16A16_SFLOAT: 4,
+}
+
+# Size in bytes of the data type of 16-bit formats (header typeSize); 8-bit and
+# block-compressed formats use 1
+FORMAT_TYPE_SIZES = {
+    VK_FORMAT_R16G16B16A16_SFLOAT: 2,
+}
+
+# Data format descriptor constants (Khronos Data Format Specification)
+KHR_DF_MODEL_RGBSDA = 1
+KHR_DF_PRIMARIES_BT709 = 1
+KHR_DF_TRANSFER_LINEAR = 1
+KHR_DF_TRANSFER_SRGB = 2
+KHR_DF_SAMPLE_DATATYPE_LINEAR = 0x10
+KHR_DF_SAMPLE_DATATYPE_SIGNED = 0x40
+KHR_DF_SAMPLE_DATATYPE_FLOAT = 0x80
+KHR_DF_CHANNEL_IDS = [0, 1, 2, 15]  # R, G, B, A
+
+# Color model and (channel id, bit offset) of the 64-bit samples of each block format
+KHR_DF_BLOCK_MODELS = {
+    'bc1': (128, [(1, 0)]),               # BC1A: alpha-present color block
+    'bc3': (130, [(15, 0), (0, 64)]),     # BC3: alpha block, then color block
+    'bc5': (132, [(0, 0), (1, 64)]),      # BC5: red block, then green block
+}
+
+_HEADER = struct.Struct('<12s9I4I2Q')
+_LEVEL = struct.Struct('<3Q')
+
+
+def uncompressed_dfd(channels, srgb=False, half_float=False):
+    """
+    Build the basic data format descriptor for an 8-bit unorm or 16-bit
+    float per channel format.
+
+    Alpha is always marked linear, as required for sRGB formats.
+    """
+    bits = 16 if half_float else 8
+    samples = b''
+    for index in range(channels):
+        channel_type = KHR_DF_CHANNEL_IDS[index]
+        if srgb and channel_type == 15:
+            channel_type |= KHR_DF_SAMPLE_DATATYPE_LINEAR
+        if half_float:
+            # Float samples use -1.0/1.0 (as float bits) for sampleLower/sampleUpper
+            channel_type |= KHR_DF_SAMPLE_DATATYPE_SIGNED | KHR_DF_SAMPLE_DATATYPE_FLOAT
+            lower, upper = 0xBF800000, 0x3F800000
+        else:
+            lower, upper = 0, 255
+        word0 = (index * bits) | ((bits - 1) << 16) | (channel_type << 24)
+        samples += struct.pack('<4I', word0, 0, lower, upper)
+
+    block_size = 24 + len(samples)
+    transfer = KHR_DF_TRANSFER_SRGB if srgb else KHR_DF_TRANSFER_LINEAR
+    block = struct.pack(
+        '<4I8B',
+        0,                                    # vendorId / descriptorType
+        2 | (block_size << 16),               # versionNumber / blockSize
+        KHR_DF_MODEL_RGBSDA | (KHR_DF_PRIMARIES_BT709 << 8) | (transfer << 16),
+        0,                                    # texel block dimensions (1x1x1x1)
+        channels * bits // 8, 0, 0, 0, 0, 0, 0, 0  # bytesPlane0..7
+    ) + samples
+    return struct.pack('<I', 4 + len(block)) + block
+
+
+def block_compressed_dfd(bc_format, srgb=False):
+    """
+    Build the basic data format descriptor for a 4x4 block-compressed
+    format ('bc1', 'bc3' or 'bc5').
+    """
+    model, channels = KHR_DF_BLOCK_MODELS[bc_format]
+    samples = b''
+    for channel_type, offset in channels:
+        if srgb and channel_type == 15:
+            channel_type |= KHR_DF_SAMPLE_DATATYPE_LINEAR
+        word0 = offset | (63 << 16) | (channel_type << 24)
+        samples += struct.pack('<4I', word0, 0, 0, 0xFFFFFFFF)
+
+    block_size = 24 + len(samples)
+    transfer = KHR_DF_TRANSFER_SRGB if srgb else KHR_DF_TRANSFER_LINEAR
+    block = struct.pack(
+        '<4I8B',
+        0,                                    # vendorId / descriptorType
+        2 | (block_size << 16),               # versionNumber / blockSize
+        model | (KHR_DF_PRIMARIES_BT709 << 8) | (transfer << 16),
+        3 | (3 << 8),                         # texel block dimensions (4x4x1x1)
+        len(channels) * 8, 0, 0, 0, 0, 0, 0, 0  # bytesPlane0..7
+    ) + samples
+    return struct.pack('<I', 4 + len(block)) + block
+
+
+def _key_value_data(key_values):
+    """Encode the key/value section (keys sorted, entries padded to 4 bytes)."""
+    data = b''
+    for key in sorted(key_values):
+        value = key_values[key]
+        if isinstance(value, str):
+            value = value.encode('utf-8') + b'\0'
+        entry = key.encode('utf-8') + b'\0' + value
+        data += struct.pack('<I', len(entry)) + entry
+        data += b'\0' * (-len(data) % 4)
+    return data
+
+
+def write_ktx2(path, vk_format, width, height, levels, dfd, block_bytes,
+               layer_count=0, key_values=None):
+    """
+    Write a KTX2 file.
+
+    levels: list of bytes-like mip level payloads, level 0 (largest) first.
+            For array textures each payload holds every layer of that level.
+    block_bytes: bytes per texel (or per block for compressed formats);
+            level data is aligned to lcm(block_bytes, 4) as the spec requires.
+    """
+    key_values = dict(key_values or {})
+    key_values.setdefault('KTXorientation', 'rd')
+    kvd = _key_value_data(key_values)
+
+    level_count = len(levels)
+    dfd_offset = _HEADER.size + _LEVEL.size * level_count
+    kvd_offset = dfd_offset + len(dfd)
+    data_offset = kvd_offset + len(kvd)
+    alignment = math.lcm(block_bytes, 4)
+
+    # Mip data is stored smallest level first
+    offsets = [0] * level_count
+    body = bytearray()
+    for level in reversed(range(level_count)):
+        padding = -(data_offset + len(body)) % alignment
+        body += b'\0' * padding
+        offsets[level] = data_offset + len(body)
+        body += levels[level]
+
+    header = _HEADER.pack(
+        KTX2_IDENTIFIER,
+        vk_format, FORMAT_TYPE_SIZES.get(vk_format, 1), width, height, 0, layer_count, 1, level_count, 0,
+        dfd_offset, len(dfd), kvd_offset if kvd else 0, len(kvd),
+        0, 0
+    )
+    level_index = b''.join(
+        _LEVEL.pack(offsets[level], len(levels[level]), len(levels[level]))
+        for level in range(level_count)
+    )
+
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(level_index)
+        f.write(dfd)
+        f.write(kvd)
+        f.write(body)
+
+
+def read_ktx2(path):
+    """
+    Memory-map a KTX2 file and return its header fields and mip levels.
+
+    Returns a dict with vkFormat, width, height, layerCount, levelCount,
+    keyValues and levels (list of memoryviews into the mapped file, level 0
+    first). Keep the returned dict alive while the views are in use.
+    """
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    fields = _HEADER.unpack_from(mapped, 0)
+    if fields[0] != KTX2_IDENTIFIER:
+        raise ValueError(f"{path} is not a KTX2 file")
+
+    (vk_format, _type_size, width, height, _depth, layer_count,
+     _face_count, level_count, supercompression) = fields[1:10]
+    kvd_offset, kvd_length = fields[12:14]
+    if supercompression != 0:
+        raise ValueError(f"{path} uses supercompression, which is not supported")
+
+    view = memoryview(mapped)
+    levels = []
+    for level in range(max(level_count, 1)):
+        offset, length, _ = _LEVEL.unpack_from(mapped, _HEADER.size + _LEVEL.size * level)
+        levels.append(view[offset:offset + length])
+
+    key_values = {}
+    position = kvd_offset
+    while position < kvd_offset + kvd_length:
+        (length,) = struct.unpack_from('<I', mapped, position)
+        entry = bytes(mapped[position + 4:position + 4 + length])
+        key, _, value = entry.partition(b'\0')
+        key_values[key.decode('utf-8')] = value.rstrip(b'\0')
+        position += 4 + length + (-length % 4)
+
+    return {
+        "vkFormat": vk_format,
+        "width": width,
+        "height": height,
+        "layerCount": layer_count,
+        "levelCount": level_count,
+        "keyValues": key_values,
+        "levels": levels,
+        "mmap": mapped,
+    }
@@ -0,0 +1,133 @@
+"""
+LOD Generation for MetalMan
+===========================
+Exports decimated LOD variants of the current Blender scene next to a base
+model and writes the <name>-lods.json manifest the renderer switches levels
+with. Shared by the character exporters and export_landscape_lods.py in
+MetalMan/Scripts.
+
+Each level is written as <name>-lod<N> with the base model's extension. The
+manifest records every level's file, decimation ratio, triangle count and
+screen size (the fraction of viewport height below which it is used).
+
+Usage (inside Blender, with the model in the scene):
+    sys.path.insert(0, SCRIPTS_DIR)
+    from lod_generation import export_lods
+    export_lods(output_path, LOD_LEVELS, export_usdz)
+
+Requirements:
+- Blender 3.6+ (bpy)
+"""
+
+import json
+import os
+
+import bpy
+
+# ============================================================================
+# DECIMATION
+# ============================================================================
+
+def count_triangles(meshes):
+    """Count triangles across mesh objects (an n-gon counts as n-2 triangles)"""
+    return sum(len(poly.vertices) - 2 for obj in meshes for poly in obj.data.polygons)
+
+
+def apply_decimation(meshes, ratio):
+    """
+    Replace each mesh's data with a decimated copy.
+
+    The decimate modifier is moved to the top of the stack and applied, so an
+    armature modifier stays live and the result is still exported as a skinned
+    mesh. Collapse decimation interpolates vertex group weights, which keeps
+    the skin weights on the surviving vertices.
+
+    Returns: dict of object name -> original mesh data (see restore_meshes)
+    """
+    originals = {}
+    for obj in meshes:
+        if obj.data.shape_keys:
+            print(f"    WARNING: {obj.name} has shape keys, leaving it at full detail")
+            continue
+
+        originals[obj.name] = obj.data
+        obj.data = obj.data.copy()
+
+        modifier = obj.modifiers.new(name="LOD_Decimate", type='DECIMATE')
+        modifier.decimate_type = 'COLLAPSE'
+        modifier.ratio = ratio
+        modifier.use_collapse_triangulate = True
+
+        with bpy.context.temp_override(object=obj, active_object=obj):
+            bpy.ops.object.modifier_move_to_index(modifier=modifier.name, index=0)
+            bpy.ops.object.modifier_apply(modifier=modifier.name)
+
+    return originals
+
+
+def restore_meshes(originals):
+    """Put back the full-detail mesh data saved by apply_decimation()"""
+    for obj_name, mesh in originals.items():
+        obj = bpy.data.objects.get(obj_name)
+        decimated = obj.data
+        obj.data = mesh
+        bpy.data.meshes.remove(decimated)
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+def lod_paths(output_path, lod_levels):
+    """Manifest path and LOD file paths of a base model"""
+    base_path, extension = os.path.splitext(output_path)
+    levels = [f"{base_path}-lod{index}{extension}" for index in range(1, len(lod_levels) + 1)]
+    return f"{base_path}-lods.json", levels
+
+
+def lods_missing(output_path, lod_levels):
+    """Whether the LOD manifest or any LOD file of an exported model is missing"""
+    manifest_path, paths = lod_paths(output_path, lod_levels)
+    return not all(os.path.exists(path) for path in [manifest_path] + paths)
+
+
+def export_lods(output_path, lod_levels, export_scene):
+    """
+    Export decimated LOD variants of the current scene next to a base model.
+
+    lod_levels: (decimation ratio, screen size) per reduced level
+    export_scene: the caller's exporter, called with each LOD path
+    """
+    manifest_path, paths = lod_paths(output_path, lod_levels)
+    meshes = [obj for obj in bpy.context.scene.objects if obj.type == 'MESH']
+
+    levels = [{
+        "level": 0,
+        "file": os.path.basename(output_path),
+        "ratio": 1.0,
+        "triangles": count_triangles(meshes),
+        "screenSize": 1.0
+    }]
+
+    for index, ((ratio, screen_size), lod_path) in enumerate(zip(lod_levels, paths), start=1):
+        print(f"  Exporting LOD{index} (ratio {ratio}) to: {lod_path}")
+
+        originals = apply_decimation(meshes, ratio)
+        try:
+            triangles = count_triangles(meshes)
+            export_scene(lod_path)
+        finally:
+            restore_meshes(originals)
+
+        levels.append({
+            "level": index,
+            "file": os.path.basename(lod_path),
+            "ratio": ratio,
+            "triangles": triangles,
+            "screenSize": screen_size
+        })
+        print(f"    Triangles: {levels[0]['triangles']} -> {triangles}")
+
+    base_name = os.path.basename(os.path.splitext(output_path)[0])
+    with open(manifest_path, 'w') as f:
+        json.dump({"name": base_name, "levels": levels}, f, indent=2)
+    print(f"  Wrote LOD manifest: {manifest_path}")
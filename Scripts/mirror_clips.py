@@ -0,0 +1,265 @@
+"""
+Mirrored Clip Detection for MetalMan
+====================================
+Builds the left/right bone mirror table of a rig from its bone names
+(mixamorig_LeftArm <-> mixamorig_RightArm, ...) and finds clips that are
+mirror images of another clip, so a symmetric clip set only needs to ship
+one side and the runtime derives the other with a swap-and-flip.
+
+Mirroring swaps every bone with its mirror bone and reflects across the
+rig's sagittal plane (the axis along which the paired joints lie apart). With
+a symmetric bind pose the mirrored skinning matrix of bone i is
+
+    skin'[i] = S * skin[mirror[i]] * S,    S = scale(-1) along the axis
+
+(skin = model-space bone matrix * inverse bind matrix), which moves every
+joint to the reflection of its mirror joint. Clips are compared on
+model-space joint positions: clip B is a mirror of clip A when every joint
+of B is within MIRROR_TOLERANCE (a fraction of the rig height) of the
+reflected mirror joint of A at every keyframe.
+
+The results go to mirrors.json next to the first clip (or --output):
+    "axis"      mirror axis (0 = X, 1 = Y, 2 = Z)
+    "bones"     bone names; "mirror" the index of each bone's mirror bone
+                (its own index for centre bones, -1 for one-sided bones
+                such as props, which keep their unmirrored pose)
+    "clips"     {clip name: {"mirrorOf": other clip, "maxError": ...}}
+
+Usage:
+    python mirror_clips.py ../MetalMan/Animations            # write mirrors.json
+    python mirror_clips.py clips/*-clip.json --tolerance 0.01
+    python mirror_clips.py ../MetalMan/Animations --drop     # also delete the mirrored clips
+
+Requirements:
+- Python 3.9+ with NumPy (pip install numpy)
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+import numpy as np
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Clip files picked up from folders (exporter sidecars and export_animation.py clips)
+CLIP_SUFFIXES = ("-clip.json", "_animation.json")
+
+# Largest joint distance from the mirrored clip, as a fraction of the rig height
+MIRROR_TOLERANCE = 0.005
+
+# Left/right name pairs, tried in order on each bone name
+SIDE_PATTERNS = [("Left", "Right"), ("left", "right"), ("_L", "_R"), (".L", ".R")]
+
+# Output file name of the mirror table
+OUTPUT_NAME = "mirrors.json"
+
+# ============================================================================
+# MIRROR TABLE
+# ============================================================================
+
+def mirror_name(name):
+    """Name of a bone's mirror bone (the name itself for centre bones)"""
+    for left, right in SIDE_PATTERNS:
+        if left in name:
+            return name.replace(left, right, 1)
+        if right in name:
+            return name.replace(right, left, 1)
+    return name
+
+
+def mirror_table(bones):
+    """
+    Index of each bone's mirror bone for a clip's "bones" list.
+
+    Bones whose mirror name is not in the rig mirror onto themselves. A bone
+    that cannot be mirrored because its parent chain does not mirror onto
+    its mirror's (a prop hanging from one side only) gets -1, as do its
+    children. Returns (mirror indices, number of left/right pairs).
+    """
+    index = {bone["name"]: bone["index"] for bone in bones}
+    mirror = [index.get(mirror_name(bone["name"]), bone["index"]) for bone in bones]
+    parents = [bone["parentIndex"] for bone in bones]
+    # Bones are ordered parents first, so a parent is resolved before its children
+    for bone, parent in enumerate(parents):
+        other = mirror[bone]
+        if parent >= 0 and (mirror[parent] < 0 or parents[other] != mirror[parent]):
+            mirror[bone] = -1
+    for bone, other in enumerate(mirror):
+        if other >= 0 and mirror[other] < 0:
+            mirror[bone] = -1
+    pairs = sum(1 for bone, other in enumerate(mirror) if other >= 0 and other != bone) // 2
+    return mirror, pairs
+
+
+def joint_tracks(clip):
+    """Model-space joint positions (K, B, 3) at every keyframe"""
+    parents = [bone["parentIndex"] for bone in clip["bones"]]
+    # boneTransforms are column-major; transpose to row-major
+    local = np.array([keyframe["boneTransforms"] for keyframe in clip["keyframes"]], dtype=np.float64)
+    local = local.reshape(len(clip["keyframes"]), -1, 4, 4).transpose(0, 1, 3, 2)
+    world = np.empty_like(local)
+    for bone, parent in enumerate(parents):
+        world[:, bone] = local[:, bone] if parent < 0 else world[:, parent] @ local[:, bone]
+    return world[:, :, :3, 3]
+
+
+def mirror_axis(positions, mirror):
+    """Axis along which paired joints lie apart (the one the rig is mirrored across)"""
+    bones = [bone for bone, other in enumerate(mirror) if other >= 0]
+    offsets = np.abs(positions[:, bones] - positions[:, [mirror[bone] for bone in bones]]).reshape(-1, 3)
+    return int(np.argmax(offsets.mean(axis=0)))
+
+
+def mirrored(positions, mirror, axis):
+    """
+    Joint positions of the mirrored clip: swap bones with their mirror and
+    reflect. Bones without a mirror (-1) are left out.
+    """
+    result = positions[:, [target for target in mirror if target >= 0]].copy()
+    result[..., axis] = -result[..., axis]
+    return result
+
+
+def resample(times, positions, new_times):
+    """Joint positions linearly interpolated at new_times"""
+    flat = positions.reshape(len(times), -1)
+    columns = [np.interp(new_times, times, flat[:, column]) for column in range(flat.shape[1])]
+    return np.stack(columns, axis=1).reshape((len(new_times),) + positions.shape[1:])
+
+# ============================================================================
+# DETECTION
+# ============================================================================
+
+def load_clip(path):
+    """Clip name, times, joint positions and bone names of a JSON clip"""
+    with open(path) as f:
+        clip = json.load(f)
+    name = clip.get("name") or re.sub(r'(-clip|_animation)?\.json$', '', os.path.basename(path))
+    times = np.array([keyframe["time"] for keyframe in clip["keyframes"]], dtype=np.float64)
+    return {
+        "name": name,
+        "path": path,
+        "duration": float(clip["duration"]),
+        "fps": float(clip.get("fps") or 30),
+        "bones": clip["bones"],
+        "times": times,
+        "positions": joint_tracks(clip),
+    }
+
+
+def mirror_error(clip, other, mirror, axis, height):
+    """
+    Largest joint distance between clip and the mirror of other, relative to
+    the rig height, or None when the clips cannot be compared (different rig
+    or a duration more than a frame apart).
+    """
+    if [bone["name"] for bone in clip["bones"]] != [bone["name"] for bone in other["bones"]]:
+        return None
+    if abs(clip["duration"] - other["duration"]) > 1.0 / clip["fps"]:
+        return None
+    # Compare on normalized time, so clips sampled at different rates still line up
+    times = clip["times"] / max(clip["duration"], 1e-6)
+    other_times = other["times"] / max(other["duration"], 1e-6)
+    reflected = mirrored(resample(other_times, other["positions"], times), mirror, axis)
+    positions = clip["positions"][:, [bone for bone, target in enumerate(mirror) if target >= 0]]
+    return float(np.linalg.norm(positions - reflected, axis=-1).max()) / height
+
+
+def find_mirrors(clips, tolerance=MIRROR_TOLERANCE):
+    """
+    Match clips against the mirrors of earlier clips (in the given order).
+
+    A clip that is a mirror of a kept clip is recorded and not matched
+    against itself again, so of each mirrored pair the first one is kept.
+    Clips that are symmetric on their own are never dropped.
+    Returns (mirror table, axis, {clip name: {"mirrorOf", "maxError"}}).
+    """
+    mirror, pairs = mirror_table(clips[0]["bones"])
+    if pairs == 0:
+        return mirror, 0, {}
+    first = clips[0]["positions"]
+    axis = mirror_axis(first, mirror)
+    up = [i for i in range(3) if i != axis]
+    height = max(float(np.ptp(first[0][:, i])) for i in up)
+
+    mirrors = {}
+    kept = []
+    for clip in clips:
+        best = None
+        for other in kept:
+            error = mirror_error(clip, other, mirror, axis, height)
+            if error is not None and error <= tolerance and (best is None or error < best[1]):
+                best = (other["name"], error)
+        if best:
+            mirrors[clip["name"]] = {"mirrorOf": best[0], "maxError": round(best[1], 6)}
+        else:
+            kept.append(clip)
+    return mirror, axis, mirrors
+
+
+def find_clips(paths):
+    """Expand files and folders into a sorted list of JSON clip paths"""
+    clips = []
+    for path in paths:
+        if os.path.isdir(path):
+            clips.extend(os.path.join(path, f) for f in os.listdir(path) if f.endswith(CLIP_SUFFIXES))
+        else:
+            clips.append(path)
+    return sorted(clips)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find clips that are left/right mirrors of another clip")
+    parser.add_argument("clips", nargs="+", help="JSON clip files or folders")
+    parser.add_argument("--output", help=f"mirror table path (default: {OUTPUT_NAME} next to the first clip)")
+    parser.add_argument("--tolerance", type=float, default=MIRROR_TOLERANCE,
+                        help="largest joint error as a fraction of the rig height")
+    parser.add_argument("--drop", action="store_true", help="delete the clips that are mirrors of another")
+    args = parser.parse_args()
+
+    paths = find_clips(args.clips)
+    if not paths:
+        print("ERROR: no clips found")
+        sys.exit(1)
+
+    clips = []
+    for path in paths:
+        try:
+            clips.append(load_clip(path))
+        except (ValueError, KeyError, json.JSONDecodeError) as e:
+            print(f"ERROR: {path}: {e}")
+            sys.exit(1)
+
+    mirror, axis, mirrors = find_mirrors(clips, args.tolerance)
+    pairs = sum(1 for index, other in enumerate(mirror) if other >= 0 and other != index) // 2
+    unmirrored = [bone["name"] for bone in clips[0]["bones"] if mirror[bone["index"]] < 0]
+    print(f"{len(clips)} clips, {len(mirror)} bones, {pairs} left/right pairs, mirror axis {'XYZ'[axis]}")
+    if unmirrored:
+        print(f"  Not mirrored (one-sided): {', '.join(unmirrored)}")
+    for name, match in mirrors.items():
+        print(f"  {name}: mirror of {match['mirrorOf']} (max error {match['maxError']:.2%} of rig height)")
+
+    output = args.output or os.path.join(os.path.dirname(paths[0]), OUTPUT_NAME)
+    with open(output, 'w') as f:
+        json.dump({
+            "axis": axis,
+            "tolerance": args.tolerance,
+            "bones": [{"name": bone["name"], "mirror": mirror[bone["index"]]} for bone in clips[0]["bones"]],
+            "clips": mirrors
+        }, f, indent=2)
+    print(f"Output: {output}")
+
+    if args.drop:
+        for clip in clips:
+            if clip["name"] in mirrors:
+                os.remove(clip["path"])
+                print(f"  Dropped {os.path.basename(clip['path'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Icon Atlas Packer for MetalMan
+==============================
+Packs the item icons in Icons/ (weapons, shields, armor, gems, potions) into
+a few atlas pages, so an inventory screen can draw every icon from one
+texture decoded once at startup instead of loading a PNG per item.
+
+Each icon is trimmed to its visible (non-transparent) bounds, scaled down to
+ICON_SIZE, and shelf-packed with an extruded border so mip levels do not
+bleed neighbouring icons into each other.
+
+Outputs (in Icons/atlas/ by default):
+- icon_atlas_<page>.png - atlas pages
+- icon_atlas.json - UV rects keyed by category and icon variant
+- icon_atlas.bin - the same index as a compact binary table
+
+Usage:
+    python pack_icons.py
+    python pack_icons.py --icon-size 96 --page-size 1024 --ktx2
+
+Requirements:
+- Python 3.9+ with NumPy and Pillow (pip install numpy pillow)
+"""
+
+import argparse
+import json
+import os
+import re
+import struct
+
+import numpy as np
+from PIL import Image
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ICONS_DIR = os.path.join(PROJECT_DIR, "Icons")
+OUTPUT_DIR = os.path.join(PROJECT_DIR, "Icons", "atlas")
+
+# Icon subdirectories, in the order used for category ids in the binary index
+# (filenames are <prefix>_<variant>.png, matching iconVariant in RPGTypes.swift)
+CATEGORIES = ["weapons", "shields", "armor", "gems", "potions"]
+
+# Largest edge of a packed icon, in texels (HUD icons are drawn at up to 36pt)
+ICON_SIZE = 128
+
+# Atlas page size in texels
+PAGE_SIZE = 2048
+
+# Extruded border around each icon; with rects aligned to ALIGNMENT this keeps
+# the first log2(ALIGNMENT) mip levels free of bleeding between icons
+PADDING = 4
+ALIGNMENT = 4
+
+# Alpha at or below this value counts as empty when trimming
+TRIM_THRESHOLD = 0
+
+BINARY_MAGIC = b'MMIA'
+BINARY_VERSION = 1
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def find_icons(icons_dir, categories):
+    """Return [(category, variant, path)] for every <prefix>_<n>.png icon"""
+    icons = []
+    for category in categories:
+        category_dir = os.path.join(icons_dir, category)
+        if not os.path.isdir(category_dir):
+            print(f"WARNING: Missing icon folder: {category_dir}")
+            continue
+        for filename in os.listdir(category_dir):
+            match = re.match(r'^[a-z]+_(\d+)\.png$', filename)
+            if match:
+                icons.append((category, int(match.group(1)), os.path.join(category_dir, filename)))
+    icons.sort()
+    return icons
+
+
+def trim_and_scale(path, icon_size):
+    """
+    Load an icon, crop it to its visible bounds and fit it within icon_size.
+
+    Returns (pixels, info) where info records the trim relative to the
+    original image so the icon can be drawn at its original placement.
+    """
+    image = Image.open(path).convert('RGBA')
+    width, height = image.size
+    alpha = np.asarray(image)[:, :, 3]
+    rows = np.flatnonzero((alpha > TRIM_THRESHOLD).any(axis=1))
+    cols = np.flatnonzero((alpha > TRIM_THRESHOLD).any(axis=0))
+
+    if len(rows) == 0:
+        box = (0, 0, 1, 1)
+    else:
+        box = (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
+    trimmed = image.crop(box)
+
+    scale = min(1.0, icon_size / max(width, height))
+    target = (max(1, round(trimmed.width * scale)), max(1, round(trimmed.height * scale)))
+    if target != trimmed.size:
+        trimmed = trimmed.resize(target, Image.LANCZOS)
+
+    info = {
+        "sourceSize": [width, height],
+        # Visible area as fractions of the original image (x, y, w, h)
+        "trim": [box[0] / width, box[1] / height,
+                 (box[2] - box[0]) / width, (box[3] - box[1]) / height],
+    }
+    return np.asarray(trimmed), info
+
+
+def align_up(value, alignment):
+    return (value + alignment - 1) // alignment * alignment
+
+
+def shelf_pack(sizes, page_size):
+    """
+    Pack (width, height) boxes onto pages using decreasing-height shelves.
+
+    Returns a list of (page, x, y) in the same order as sizes.
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    placements = [None] * len(sizes)
+    page, x, y, shelf_height = 0, 0, 0, 0
+
+    for index in order:
+        width, height = sizes[index]
+        if width > page_size or height > page_size:
+            raise ValueError(f"Icon of {width}x{height} does not fit a {page_size} page")
+        if x + width > page_size:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        if y + height > page_size:
+            page, x, y, shelf_height = page + 1, 0, 0, 0
+        placements[index] = (page, x, y)
+        x += width
+        shelf_height = max(shelf_height, height)
+
+    return placements
+
+
+def write_binary_index(path, entries, page_count, page_size, categories):
+    """
+    Write the icon index as a little-endian binary table:
+        magic 'MMIA', version u16, category count u16, page count u16,
+        page size u16, entry count u32
+        category names: u8 length + UTF-8 bytes each
+        entries: category u8, page u8, variant u16, u0 v0 u1 v1 (4 x f32)
+    Entries are sorted by (category, variant).
+    """
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<4sHHHHI', BINARY_MAGIC, BINARY_VERSION, len(categories),
+                            page_count, page_size, len(entries)))
+        for category in categories:
+            name = category.encode('utf-8')
+            f.write(struct.pack('<B', len(name)) + name)
+        for entry in entries:
+            f.write(struct.pack('<BBH4f', categories.index(entry["category"]), entry["page"],
+                                entry["variant"], *entry["uv"]))
+
+# ============================================================================
+# PACKING
+# ============================================================================
+
+def pack_icons(icons_dir=ICONS_DIR, output_dir=OUTPUT_DIR, icon_size=ICON_SIZE,
+               page_size=PAGE_SIZE, write_ktx2=False):
+    """Trim, pack and write the atlas pages plus JSON and binary indexes"""
+    icons = find_icons(icons_dir, CATEGORIES)
+    print(f"Found {len(icons)} icons in {icons_dir}")
+
+    sprites = []
+    for category, variant, path in icons:
+        pixels, info = trim_and_scale(path, icon_size)
+        sprites.append((category, variant, pixels, info))
+
+    # Padded, aligned cell size for each sprite
+    sizes = [
+        (align_up(p.shape[1] + 2 * PADDING, ALIGNMENT), align_up(p.shape[0] + 2 * PADDING, ALIGNMENT))
+        for _, _, p, _ in sprites
+    ]
+    placements = shelf_pack(sizes, page_size)
+    page_count = max(page for page, _, _ in placements) + 1
+
+    pages = [np.zeros((page_size, page_size, 4), dtype=np.uint8) for _ in range(page_count)]
+    entries = []
+    for (category, variant, pixels, info), (page, x, y) in zip(sprites, placements):
+        height, width = pixels.shape[:2]
+        # Extrude edge texels into the padding so filtering samples the icon's own border
+        padded = np.pad(pixels, ((PADDING, PADDING), (PADDING, PADDING), (0, 0)), mode='edge')
+        pages[page][y:y + padded.shape[0], x:x + padded.shape[1]] = padded
+
+        left, top = x + PADDING, y + PADDING
+        entries.append({
+            "category": category,
+            "variant": variant,
+            "page": page,
+            "rect": [left, top, width, height],
+            "uv": [left / page_size, top / page_size,
+                   (left + width) / page_size, (top + height) / page_size],
+            **info,
+        })
+
+    os.makedirs(output_dir, exist_ok=True)
+    page_files = []
+    for index, page in enumerate(pages):
+        filename = f"icon_atlas_{index}.png"
+        Image.fromarray(page).save(os.path.join(output_dir, filename), optimize=True)
+        page_files.append(filename)
+        if write_ktx2:
+            write_page_ktx2(page, os.path.join(output_dir, f"icon_atlas_{index}.ktx2"))
+
+    index = {
+        "pageSize": page_size,
+        "iconSize": icon_size,
+        "padding": PADDING,
+        "pages": page_files,
+        "icons": {category: {} for category in CATEGORIES},
+    }
+    for entry in entries:
+        index["icons"][entry["category"]][str(entry["variant"])] = {
+            key: value for key, value in entry.items() if key not in ("category", "variant")
+        }
+    with open(os.path.join(output_dir, "icon_atlas.json"), 'w') as f:
+        json.dump(index, f, indent=2)
+
+    write_binary_index(os.path.join(output_dir, "icon_atlas.bin"), entries,
+                       page_count, page_size, CATEGORIES)
+
+    used = sum(w * h for w, h in sizes)
+    print(f"Packed {len(entries)} icons into {page_count} page(s) of {page_size}x{page_size} "
+          f"({used / (page_count * page_size * page_size):.0%} used)")
+    print(f"Output: {output_dir}")
+    return index
+
+
+def write_page_ktx2(page, path):
+    """Write an atlas page as a mipmapped KTX2 container (see bake_textures.py)"""
+    from bake_textures import build_mip_chain, srgb_to_linear
+    from ktx2 import VK_FORMAT_R8G8B8A8_SRGB, uncompressed_dfd, write_ktx2
+
+    pixels = page.astype(np.float32) / 255.0
+    pixels[:, :, :3] = srgb_to_linear(pixels[:, :, :3])
+    levels = build_mip_chain(pixels, 'diffuse')
+    write_ktx2(path, VK_FORMAT_R8G8B8A8_SRGB, page.shape[1], page.shape[0], levels,
+               uncompressed_dfd(4, srgb=True), 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack item icons into texture atlas pages")
+    parser.add_argument("--icons", default=ICONS_DIR, help="Icons folder with category subfolders")
+    parser.add_argument("--output", default=OUTPUT_DIR, help="output folder for pages and indexes")
+    parser.add_argument("--icon-size", type=int, default=ICON_SIZE, help="largest packed icon edge")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="atlas page size")
+    parser.add_argument("--ktx2", action="store_true", help="also write mipmapped KTX2 pages")
+    args = parser.parse_args()
+
+    pack_icons(args.icons, args.output, args.icon_size, args.page_size, args.ktx2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Rig Cache for MetalMan
+======================
+Imports a character FBX once and appends it from a cached .blend library on
+later imports, shared by export_animations_to_usdz.py and
+export_enemy_animations.py in MetalMan/Scripts, which import the same
+character for every clip.
+
+Caches are named <character>-b<blender version>-<hash>.blend, where the hash
+covers the FBX contents and the importer settings. Every Blender version keeps
+its own cache, and a rebuild only deletes the older caches of the same
+character and Blender version.
+
+Usage (inside Blender):
+    sys.path.insert(0, SCRIPTS_DIR)
+    from rig_cache import import_character
+    import_character(character_path, FBX_IMPORT_SETTINGS, RIG_CACHE_DIR)
+
+Requirements:
+- Blender 3.6+ (bpy)
+"""
+
+import hashlib
+import json
+import os
+import re
+
+import bpy
+
+# ============================================================================
+# CACHE FILES
+# ============================================================================
+
+_cache_paths = {}
+
+
+def blender_version():
+    """Blender version as it appears in cache names, e.g. 4.2.1"""
+    return ".".join(str(part) for part in bpy.app.version)
+
+
+def cache_file_pattern(stem):
+    """
+    Names of this Blender version's caches of a character. Caches written
+    before the version was part of the name (<stem>-<hash>.blend) match too.
+    """
+    return re.compile(rf"{re.escape(stem)}(-b{re.escape(blender_version())})?-[0-9a-f]{{16}}\.blend")
+
+
+def rig_cache_path(filepath, import_settings, cache_dir):
+    """
+    Cache file for a character FBX, named after the FBX, the Blender version
+    and a hash of its contents and the importer settings (computed once per run)
+    """
+    key = (filepath, json.dumps(import_settings, sort_keys=True), cache_dir)
+    if key not in _cache_paths:
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        digest.update(key[1].encode())
+        stem = os.path.splitext(os.path.basename(filepath))[0]
+        _cache_paths[key] = os.path.join(
+            cache_dir, f"{stem}-b{blender_version()}-{digest.hexdigest()[:16]}.blend"
+        )
+    return _cache_paths[key]
+
+# ============================================================================
+# IMPORT
+# ============================================================================
+
+def import_character(filepath, import_settings, cache_dir=None):
+    """
+    Import a character FBX with the given importer settings, through the rig
+    cache in cache_dir (None imports the FBX every time).
+
+    On a cache hit the character's objects (with their meshes, armature,
+    materials and actions) are appended from the cached .blend. On a miss
+    the FBX is imported and the new objects are written to the cache,
+    replacing this Blender version's caches of older versions of the file.
+    """
+    if cache_dir is None:
+        bpy.ops.import_scene.fbx(filepath=filepath, **import_settings)
+        return
+
+    cache_path = rig_cache_path(filepath, import_settings, cache_dir)
+    if os.path.exists(cache_path):
+        with bpy.data.libraries.load(cache_path, link=False) as (data_from, data_to):
+            data_to.objects = data_from.objects
+        for obj in data_to.objects:
+            if obj is not None:
+                obj.use_fake_user = False
+                bpy.context.scene.collection.objects.link(obj)
+        print(f"  Appended cached rig: {os.path.basename(cache_path)}")
+        return
+
+    objects_before = set(bpy.context.scene.objects)
+    bpy.ops.import_scene.fbx(filepath=filepath, **import_settings)
+    objects = set(bpy.context.scene.objects) - objects_before
+
+    os.makedirs(cache_dir, exist_ok=True)
+    stale = cache_file_pattern(os.path.splitext(os.path.basename(filepath))[0])
+    for filename in os.listdir(cache_dir):
+        if stale.fullmatch(filename):
+            os.remove(os.path.join(cache_dir, filename))
+
+    # Write to a temporary name first so an interrupted run never leaves a partial cache
+    temp_path = f"{cache_path}.tmp"
+    bpy.data.libraries.write(temp_path, objects, fake_user=True, path_remap='ABSOLUTE')
+    os.replace(temp_path, cache_path)
+    print(f"  Cached rig: {cache_path}")
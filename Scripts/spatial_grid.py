@@ -0,0 +1,162 @@
+"""
+Uniform Grid Spatial Index for MetalMan
+=======================================
+Buckets circular bounds on the XZ plane into a uniform grid, so a movement
+or camera query only visits the colliders in the cells it overlaps instead
+of every collider in the world.
+
+The grid is stored compactly (CSR style):
+    cells  uint32[columns * rows + 1]  start of each cell's run in items
+                                       (cell = row * columns + column)
+    items  uint32[...]                 indices of the bounds overlapping the cell
+
+Bounds outside the grid are clamped into the border cells and queries are
+clamped the same way, so nothing outside the grid is ever missed.
+
+Used by bake_world.py, which writes the grids of the world colliders and
+camera blockers next to them.
+
+Requirements:
+- Python 3.9+ with NumPy (pip install numpy)
+"""
+
+import numpy as np
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Cell edge length in world units (a few tree spacings per cell)
+DEFAULT_CELL_SIZE = 8.0
+
+# Grid parameters as stored next to the cell and item arrays
+GRID_DTYPE = np.dtype([
+    ('origin', '<f4', 2),
+    ('cellSize', '<f4'),
+    ('columns', '<u4'),
+    ('rows', '<u4'),
+])
+
+# ============================================================================
+# GRID
+# ============================================================================
+
+class SpatialGrid:
+    """Uniform grid over circular XZ bounds (positions (N, 2), radii (N,))"""
+
+    def __init__(self, params, cells, items, positions, radii):
+        self.origin = np.asarray(params['origin'], dtype=np.float64)
+        self.cell_size = float(params['cellSize'])
+        self.columns = int(params['columns'])
+        self.rows = int(params['rows'])
+        self.cells = np.asarray(cells, dtype=np.uint32)
+        self.items = np.asarray(items, dtype=np.uint32)
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        self.radii = np.asarray(radii, dtype=np.float64)
+
+    @classmethod
+    def build(cls, positions, radii, extent, cell_size=DEFAULT_CELL_SIZE):
+        """
+        Build a grid covering extent ((min_x, min_z), (max_x, max_z)).
+
+        Each bound is added to every cell its bounding square overlaps.
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        radii = np.asarray(radii, dtype=np.float64)
+        (min_x, min_z), (max_x, max_z) = extent
+        params = np.zeros((), dtype=GRID_DTYPE)
+        params['origin'] = (min_x, min_z)
+        params['cellSize'] = cell_size
+        params['columns'] = max(1, int(np.ceil((max_x - min_x) / cell_size)))
+        params['rows'] = max(1, int(np.ceil((max_z - min_z) / cell_size)))
+
+        grid = cls(params, np.zeros(1, dtype=np.uint32), np.zeros(0, dtype=np.uint32), positions, radii)
+        col0, row0 = grid.cell_coords(positions - radii[:, None])
+        col1, row1 = grid.cell_coords(positions + radii[:, None])
+
+        # One (cell, item) pair per covered cell, then sort the pairs by cell
+        spans = (col1 - col0 + 1) * (row1 - row0 + 1)
+        owners = np.repeat(np.arange(len(radii)), spans)
+        local = np.arange(spans.sum()) - np.repeat(np.cumsum(spans) - spans, spans)
+        widths = (col1 - col0 + 1)[owners]
+        cols = col0[owners] + local % widths
+        rows = row0[owners] + local // widths
+        cell_ids = rows * grid.columns + cols
+
+        order = np.argsort(cell_ids, kind='stable')
+        counts = np.bincount(cell_ids, minlength=grid.columns * grid.rows)
+        grid.cells = np.concatenate([[0], np.cumsum(counts)]).astype(np.uint32)
+        grid.items = owners[order].astype(np.uint32)
+        return grid
+
+    @property
+    def params(self):
+        params = np.zeros(1, dtype=GRID_DTYPE)
+        params['origin'] = self.origin
+        params['cellSize'] = self.cell_size
+        params['columns'] = self.columns
+        params['rows'] = self.rows
+        return params
+
+    def cell_coords(self, points):
+        """(column, row) of the cells containing points (N, 2), clamped to the grid"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        cells = np.floor((points - self.origin) / self.cell_size).astype(np.int64)
+        return np.clip(cells[:, 0], 0, self.columns - 1), np.clip(cells[:, 1], 0, self.rows - 1)
+
+    def candidates(self, x, z, radius):
+        """Indices stored in the cells overlapped by a query circle's bounding square"""
+        (col0,), (row0,) = self.cell_coords((x - radius, z - radius))
+        (col1,), (row1,) = self.cell_coords((x + radius, z + radius))
+        runs = [self.items[self.cells[row * self.columns + col0]:self.cells[row * self.columns + col1 + 1]]
+                for row in range(row0, row1 + 1)]
+        return np.unique(np.concatenate(runs)) if runs else np.zeros(0, dtype=np.uint32)
+
+    def query(self, x, z, radius):
+        """Sorted indices of the bounds overlapping a circle"""
+        candidates = self.candidates(x, z, radius)
+        offset = self.positions[candidates] - (x, z)
+        hit = np.hypot(offset[:, 0], offset[:, 1]) <= self.radii[candidates] + radius
+        return candidates[hit]
+
+    def sections(self, prefix):
+        """World file sections for this grid: <prefix>.params, .cells and .items"""
+        return {
+            f"{prefix}.params": self.params,
+            f"{prefix}.cells": self.cells,
+            f"{prefix}.items": self.items,
+        }
+
+    @classmethod
+    def from_sections(cls, sections, prefix, positions, radii):
+        """Grid read back from world file sections (positions and radii of the indexed bounds)"""
+        return cls(sections[f"{prefix}.params"][0], sections[f"{prefix}.cells"], sections[f"{prefix}.items"],
+                   positions, radii)
+
+
+def brute_force_query(positions, radii, x, z, radius):
+    """Reference for SpatialGrid.query: test every bound"""
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+    offset = positions - (x, z)
+    hit = np.hypot(offset[:, 0], offset[:, 1]) <= np.asarray(radii, dtype=np.float64) + radius
+    return np.nonzero(hit)[0]
+
+
+def check_grid(grid, query_count, max_radius, rng):
+    """
+    Compare random grid queries with brute-force queries.
+
+    Queries are spread over the grid plus a margin (to cover the clamped
+    border cells). Returns (mismatches, mean candidates per query).
+    """
+    low = grid.origin - max_radius * 2
+    high = grid.origin + (grid.columns * grid.cell_size + max_radius * 2, grid.rows * grid.cell_size + max_radius * 2)
+    mismatches = 0
+    candidate_total = 0
+    for _ in range(query_count):
+        x, z = rng.uniform(low, high)
+        radius = rng.uniform(0, max_radius)
+        if not np.array_equal(grid.query(x, z, radius), brute_force_query(grid.positions, grid.radii, x, z, radius)):
+            mismatches += 1
+        candidate_total += len(grid.candidates(x, z, radius))
+    return mismatches, candidate_total / max(query_count, 1)
@@ -0,0 +1,162 @@
+"""
+Font Awesome Subsetter for MetalMan
+===================================
+Builds subsetted copies of the bundled Font Awesome faces that keep only
+the glyphs the game references, so registering the font at launch parses
+a few kilobytes instead of thousands of glyphs.
+
+The code points are the "\\u{....}" literals in Views/FontAwesome.swift
+(the FAIcon cases). Each face in FONT_FACES is written next to its source
+as <name>-subset.<ext> with the referenced glyphs it contains;
+FontAwesomeLoader registers the subset face when it is bundled.
+
+The "Subset Fonts" Run Script phase of MetalMan.xcodeproj runs this with
+--face and --output-dir to write the subset of the bundled .otf face straight
+into the app's resources folder. MetalMan/ is a synchronized group, so a file
+written into the source tree during a build would only be bundled by the
+next build.
+
+The build fails (exit code 1) when a referenced code point is in none of
+the faces. Cases whose line is marked "Pro only" are only reported, since
+the Free faces do not have them and the game falls back for those icons.
+
+Usage:
+    python subset_fonts.py              # write the subset faces
+    python subset_fonts.py --check      # only verify every glyph is present
+    python subset_fonts.py --face "Font Awesome 7 Free-Solid-900.otf" \
+        --output-dir "$TARGET_BUILD_DIR/$UNLOCALIZED_RESOURCES_FOLDER_PATH"
+
+Requirements:
+- Python 3.9+ with fontTools and Brotli (pip install fonttools brotli)
+"""
+
+import argparse
+import os
+import re
+import sys
+
+from fontTools import subset
+from fontTools.ttLib import TTFont
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FONTS_DIR = os.path.join(PROJECT_DIR, "MetalMan", "Fonts")
+
+# Swift file whose "\u{....}" literals are the referenced glyphs
+ICON_SOURCE = os.path.join(PROJECT_DIR, "MetalMan", "Views", "FontAwesome.swift")
+
+# Faces to subset (relative to FONTS_DIR)
+FONT_FACES = [
+    "Font Awesome 7 Free-Solid-900.otf",
+    "webfonts/fa-solid-900.woff2",
+    "webfonts/fa-regular-400.woff2",
+    "webfonts/fa-brands-400.woff2",
+    "webfonts/fa-v4compatibility.woff2",
+]
+
+# Suffix added to the file name of a subset face
+SUBSET_SUFFIX = "-subset"
+
+# Lines with this marker reference glyphs that may be missing from the Free faces
+OPTIONAL_MARKER = "Pro only"
+
+UNICODE_LITERAL = re.compile(r'\\u\{([0-9A-Fa-f]+)\}')
+
+# ============================================================================
+# SUBSETTING
+# ============================================================================
+
+def referenced_code_points(path):
+    """
+    Code points of the "\\u{....}" literals in a Swift file.
+
+    Returns (required, optional): optional code points are those only
+    referenced on lines with OPTIONAL_MARKER.
+    """
+    required = set()
+    optional = set()
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            for match in UNICODE_LITERAL.finditer(line):
+                code_point = int(match.group(1), 16)
+                (optional if OPTIONAL_MARKER in line else required).add(code_point)
+    return required, optional - required
+
+
+def subset_path(path, output_dir=None):
+    """<name>-subset.<ext> next to a face, or in output_dir when given"""
+    stem, ext = os.path.splitext(path)
+    if output_dir:
+        stem = os.path.join(output_dir, os.path.basename(stem))
+    return stem + SUBSET_SUFFIX + ext
+
+
+def subset_face(path, code_points, output_dir=None):
+    """Write the subset of one face with the given code points; returns the output path"""
+    font = TTFont(path)
+    options = subset.Options()
+    options.flavor = font.flavor
+    options.layout_features = ['*']
+    options.name_IDs = ['*']
+    options.name_languages = ['*']
+    options.notdef_outline = True
+    options.glyph_names = True
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=code_points)
+    subsetter.subset(font)
+
+    output_path = subset_path(path, output_dir)
+    font.flavor = options.flavor
+    font.save(output_path)
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Subset the Font Awesome faces to the glyphs the game uses")
+    parser.add_argument("--check", action="store_true", help="only check that every referenced glyph exists")
+    parser.add_argument("--face", action="append", dest="faces",
+                        help="face to subset, relative to the Fonts folder (repeatable; default: FONT_FACES)")
+    parser.add_argument("--output-dir", help="folder for the subset faces (default: next to each face)")
+    args = parser.parse_args()
+
+    required, optional = referenced_code_points(ICON_SOURCE)
+    print(f"{len(required)} glyphs referenced in {os.path.basename(ICON_SOURCE)} "
+          f"({len(optional)} optional)")
+
+    faces = {}
+    for face in args.faces or FONT_FACES:
+        path = os.path.join(FONTS_DIR, face)
+        if not os.path.exists(path):
+            print(f"  {face}: not found, skipped")
+            continue
+        faces[path] = set(TTFont(path).getBestCmap())
+
+    available = set().union(*faces.values()) if faces else set()
+    missing = sorted(required - available)
+    for code_point in sorted(optional - available):
+        print(f"  warning: optional glyph U+{code_point:04X} is not in any face")
+    if missing:
+        print("error: referenced glyphs missing from every face: "
+              + ", ".join(f"U+{code_point:04X}" for code_point in missing))
+        sys.exit(1)
+
+    if args.check:
+        print("OK: every referenced glyph is present")
+        return
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    for path, cmap in faces.items():
+        code_points = (required | optional) & cmap
+        if not code_points:
+            continue
+        output_path = subset_face(path, code_points, args.output_dir)
+        print(f"  {os.path.relpath(path, FONTS_DIR)}: {len(code_points)} glyphs, "
+              f"{os.path.getsize(path) / 1024:.0f} KB -> {os.path.getsize(output_path) / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()